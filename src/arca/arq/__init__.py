@@ -17,16 +17,34 @@
 __all__ = [
     "ARQ",
     "Domain",
+    "Domain2D",
     "RangeQuery",
+    "RangeQuery2D",
     "Table",
+    "Table2D",
+    "ColumnarTable",
     "RangeAggregateScheme",
+    "RangeAggregateScheme2D",
+    "AppendableRangeAggregateScheme",
+    "UpdatableRangeAggregateScheme",
     "ResolveDone",
     "ResolveContinue",
+    "Moments",
 ]
 
 from .arq import ARQ
 from .domain import Domain
+from .domain_2d import Domain2D
 from .range_query import RangeQuery
-from .range_aggregate_scheme import RangeAggregateScheme
+from .range_query_2d import RangeQuery2D
+from .range_aggregate_scheme import (
+    AppendableRangeAggregateScheme,
+    RangeAggregateScheme,
+    UpdatableRangeAggregateScheme,
+)
+from .range_aggregate_scheme_2d import RangeAggregateScheme2D
 from .range_aggregate_querier import ResolveDone, ResolveContinue
 from .table import Table
+from .table_2d import Table2D
+from .columnar_table import ColumnarTable
+from .moments import Moments
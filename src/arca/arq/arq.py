@@ -17,17 +17,41 @@
 from __future__ import annotations
 
 from .table import Table
+from .table_2d import Table2D
 from .domain import Domain
+from .domain_2d import Domain2D
 from .range_query import RangeQuery
-from .range_aggregate_scheme import RangeAggregateScheme
-from .range_aggregate_querier import RangeAggregateQuerier, ResolveDone, ResolveContinue
-
-from ..ste.eds import EDS
-
-from typing import Generic, List, TypeVar, Union
+from .range_query_2d import RangeQuery2D
+from .range_aggregate_scheme import (
+    AppendableRangeAggregateScheme,
+    RangeAggregateScheme,
+    UpdatableRangeAggregateScheme,
+)
+from .range_aggregate_scheme_2d import RangeAggregateScheme2D
+from .range_aggregate_querier import (
+    Aggregate,
+    RangeAggregateQuerier,
+    ResolveDone,
+    ResolveContinue,
+)
+
+from ..ste.eds import EDS, UpdatableEDS
+
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 from dataclasses import dataclass
-from fractions import Fraction
-from decimal import Decimal
 
 
 @dataclass(frozen=True)
@@ -46,6 +70,7 @@ AggregateSchemeOutputType = TypeVar("AggregateSchemeOutputType")
 EdsType = TypeVar("EdsType")
 TokenInputType = TypeVar("TokenInputType")
 ResolveOutputType = TypeVar("ResolveOutputType")
+T = TypeVar("T")
 
 
 @dataclass(frozen=True)
@@ -54,14 +79,24 @@ class ARQ(
 ):
     """
     An implementation of the ARQ framework from [EMT22].
+
+    The aggregate scheme may also be a two-dimensional
+    :class:`RangeAggregateScheme2D`, in which case tables, domains and
+    queries are given as :class:`Table2D`, :class:`Domain2D` and
+    :class:`RangeQuery2D` objects.
     """
 
     __slots__ = ["eds_scheme", "aggregate_scheme"]
     eds_scheme: EDS[
         bytes, AggregateSchemeOutputType, EdsType, TokenInputType, ResolveOutputType
     ]
-    aggregate_scheme: RangeAggregateScheme[
-        AggregateSchemeOutputType, TokenInputType, ResolveOutputType
+    aggregate_scheme: Union[
+        RangeAggregateScheme[
+            AggregateSchemeOutputType, TokenInputType, ResolveOutputType
+        ],
+        RangeAggregateScheme2D[
+            AggregateSchemeOutputType, TokenInputType, ResolveOutputType
+        ],
     ]
 
     def generate_key(self) -> bytes:
@@ -72,7 +107,7 @@ class ARQ(
         """
         return self.eds_scheme.generate_key()
 
-    def setup(self, key: bytes, table: Table) -> bytes:
+    def setup(self, key: bytes, table: Union[Table, Table2D]) -> bytes:
         """
         Creates a new encrypted range aggregate index over the given
         :class:`Table` with the given :paramref:`key`.
@@ -81,10 +116,32 @@ class ARQ(
         :param table: the :class:`Table` to compute the encrypted index over
         :return: the serialized encrypted index
         """
-        ds = self.aggregate_scheme.setup(table)
+        ds = self.aggregate_scheme_setup(table)
         eds_serialized = self.eds_scheme.encrypt(key, ds)
         return eds_serialized
 
+    def setup_stream(
+        self, key: bytes, table: Union[Table, Table2D], sink: BinaryIO
+    ) -> None:
+        """
+        Creates a new encrypted range aggregate index over the given
+        :class:`Table` with the given :paramref:`key`, like :func:`setup`,
+        but writes the serialized index to :paramref:`sink`.
+
+        The entries of the plaintext index are encrypted and written as
+        they are produced by :func:`RangeAggregateScheme.setup_stream`, so
+        neither the plaintext nor the encrypted index is held in memory in
+        full (unless the encrypted data structure scheme is serialized as
+        a container, which is built in memory before it is written).
+
+        :param key: the key to encrypt with
+        :param table: the :class:`Table` to compute the encrypted index over
+        :param sink: the binary file-like object to write the serialized
+            index to
+        """
+        entries = self.aggregate_scheme_setup_stream(table)
+        self.eds_scheme.encrypt_to(key, entries, sink)
+
     def load_eds(self, eds_serialized: bytes) -> EdsType:
         """
         Deserializes the given encrypted data structure that was previously
@@ -108,37 +165,202 @@ class ARQ(
         return cts
 
     def query(
-        self, key: bytes, domain: Domain, initial_query: RangeQuery, eds: EdsType
-    ) -> Union[int, float, Fraction, Decimal]:
+        self,
+        key: bytes,
+        domain: Union[Domain, Domain2D],
+        initial_query: Union[RangeQuery, RangeQuery2D],
+        eds: EdsType,
+    ) -> Aggregate:
         """
         Queries the given encrypted data structure with the given query.
         """
-        querier = self.aggregate_scheme.generate_querier(
-            domain=domain, query=initial_query
-        )
-        ds_subqueries = querier.query()
-        while len(ds_subqueries) > 0:
-            stks: List[bytes] = [
-                self.eds_scheme.token(key, ds_subquery) for ds_subquery in ds_subqueries
-            ]
+        return self.query_many(key, domain, [initial_query], eds)[0]
 
-            # TODO(zespirit): Move out to server
-            cts = self.query_server(stks, eds)
+    def query_many(
+        self,
+        key: bytes,
+        domain: Union[Domain, Domain2D],
+        queries: Sequence[Union[RangeQuery, RangeQuery2D]],
+        eds: EdsType,
+    ) -> List[Aggregate]:
+        """
+        Queries the given encrypted data structure with each of the given
+        queries in a single batch. See :func:`resolve_queriers` for details
+        on how the work is shared between the queries.
+
+        :param key: the key that the encrypted data structure was built with
+        :param domain: the :class:`Domain` of the underlying :class:`Table`
+        :param queries: the queries to answer
+        :param eds: the encrypted data structure from :func:`load_eds`
+        :return: the aggregates, in the same order as :paramref:`queries`
+        """
+        queriers = [self.generate_aggregate_querier(domain, query) for query in queries]
+        return self.resolve_queriers(key, queriers, eds)
+
+    def update(
+        self, key: bytes, domain: Domain, domain_value: int, delta: int, eds: EdsType
+    ) -> None:
+        """
+        Updates the given encrypted data structure in place to reflect a
+        record of value :paramref:`delta` being added at the given domain
+        value (or, if :paramref:`delta` is negative, the record of value
+        :code:`-delta` being removed).
+
+        Only the entries returned by
+        :func:`UpdatableRangeAggregateScheme.update_subqueries` are fetched,
+        decrypted and re-encrypted, so the aggregate scheme must be an
+        :class:`UpdatableRangeAggregateScheme` and the encrypted data
+        structure scheme must be an :class:`UpdatableEDS`.
+
+        :param key: the key that the encrypted data structure was built with
+        :param domain: the :class:`Domain` of the underlying :class:`Table`
+        :param domain_value: the domain value of the record
+        :param delta: the value of the record being added
+        :param eds: the encrypted data structure from :func:`load_eds`
+        """
+        if not isinstance(self.aggregate_scheme, UpdatableRangeAggregateScheme):
+            raise TypeError(
+                f"{type(self.aggregate_scheme).__name__} does not support updates"
+            )
+        eds_scheme = self.eds_scheme
+        if not isinstance(eds_scheme, UpdatableEDS):
+            raise TypeError(f"{type(eds_scheme).__name__} does not support updates")
+
+        subqueries = self.aggregate_scheme.update_subqueries(domain, domain_value)
+        stks = [self.eds_scheme.token(key, subquery) for subquery in subqueries]
+        responses: List[ResolveOutputType] = []
+        for ct in self.query_server_batch(stks, eds):
+            if ct is None:
+                raise ValueError("encrypted data structure is missing an entry")
+            responses.append(self.eds_scheme.resolve(key, ct))
+
+        updated_responses = self.aggregate_scheme.update_responses(responses, delta)
+        update = eds_scheme.encrypt_update(key, zip(subqueries, updated_responses))
+        # The portion of the update that occurs on the server:
+        eds_scheme.apply_update(eds, update)
+
+    def append(
+        self, key: bytes, table: Table, extended_table: Table, eds: EdsType
+    ) -> None:
+        """
+        Updates the given encrypted data structure in place to reflect the
+        records appended to :paramref:`table` to get
+        :paramref:`extended_table` (see :func:`Table.extend`).
+
+        Only the entries returned by
+        :func:`AppendableRangeAggregateScheme.append_subqueries` are
+        fetched and decrypted, and only the new and changed entries are
+        encrypted, so the aggregate scheme must be an
+        :class:`AppendableRangeAggregateScheme` and the encrypted data
+        structure scheme must be an :class:`UpdatableEDS`.
+
+        :param key: the key that the encrypted data structure was built with
+        :param table: the :class:`Table` the encrypted data structure was
+            built from
+        :param extended_table: the extended :class:`Table`
+        :param eds: the encrypted data structure from :func:`load_eds`
+        """
+        if not isinstance(self.aggregate_scheme, AppendableRangeAggregateScheme):
+            raise TypeError(
+                f"{type(self.aggregate_scheme).__name__} does not support appends"
+            )
+        eds_scheme = self.eds_scheme
+        if not isinstance(eds_scheme, UpdatableEDS):
+            raise TypeError(f"{type(eds_scheme).__name__} does not support updates")
+
+        subqueries = self.aggregate_scheme.append_subqueries(
+            table.domain, extended_table.domain
+        )
+        stks = [self.eds_scheme.token(key, subquery) for subquery in subqueries]
+        responses: Dict[TokenInputType, ResolveOutputType] = {}
+        for subquery, ct in zip(subqueries, self.query_server_batch(stks, eds)):
+            if ct is None:
+                raise ValueError("encrypted data structure is missing an entry")
+            responses[subquery] = self.eds_scheme.resolve(key, ct)
+
+        entries = self.aggregate_scheme.append(table.domain, extended_table, responses)
+        update = eds_scheme.encrypt_update(key, entries)
+        # The portion of the update that occurs on the server:
+        eds_scheme.apply_update(eds, update)
+
+    def resolve_queriers(
+        self,
+        key: bytes,
+        queriers: List[RangeAggregateQuerier[TokenInputType, ResolveOutputType]],
+        eds: EdsType,
+    ) -> List[Aggregate]:
+        """
+        Runs the query protocol for all of the given queriers at once.
 
-            responses: List[ResolveOutputType] = [
-                self.eds_scheme.resolve(key, ct) for ct in cts
-            ]
+        In each round, the subqueries of every querier that has not yet
+        finished are collected together so that each distinct subquery is
+        tokenized once, the server is queried once, and each distinct
+        ciphertext returned by the server is resolved once.
 
-            result = querier.resolve(responses)
-            if isinstance(result, ResolveDone):
-                return result.aggregate
-            elif isinstance(result, ResolveContinue):
-                ds_subqueries = result.subqueries
+        :param key: the key that the encrypted data structure was built with
+        :param queriers: the queriers to run, e.g. from :func:`generate_querier`
+        :param eds: the encrypted data structure from :func:`load_eds`
+        :return: the aggregates, in the same order as :paramref:`queriers`
+        """
+        aggregates: Dict[int, Aggregate] = {}
+        pending: Dict[int, List[TokenInputType]] = {
+            index: querier.query() for index, querier in enumerate(queriers)
+        }
+        while len(pending) > 0:
+            for index, ds_subqueries in pending.items():
+                if len(ds_subqueries) <= 0:
+                    raise ValueError(
+                        f"querier {index} ({type(queriers[index]).__name__}) "
+                        "returned no subqueries before resolving"
+                    )
+
+            stks: Dict[TokenInputType, bytes] = {}
+            for ds_subqueries in pending.values():
+                for ds_subquery in ds_subqueries:
+                    if ds_subquery not in stks:
+                        stks[ds_subquery] = self.eds_scheme.token(key, ds_subquery)
 
-        raise BaseException("something bad")
+            # TODO(zespirit): Move out to server
+            unique_stks = list(dict.fromkeys(stks.values()))
+            cts = dict(zip(unique_stks, self.query_server_batch(unique_stks, eds)))
+
+            responses: Dict[bytes, ResolveOutputType] = {}
+            for ct in cts.values():
+                if ct is not None and ct not in responses:
+                    responses[ct] = self.eds_scheme.resolve(key, ct)
+
+            for index in list(pending.keys()):
+                querier_responses: List[ResolveOutputType] = []
+                for ds_subquery in pending[index]:
+                    ct = cts[stks[ds_subquery]]
+                    if ct is not None:
+                        querier_responses.append(responses[ct])
+
+                result = queriers[index].resolve(querier_responses)
+                if isinstance(result, ResolveDone):
+                    aggregates[index] = result.aggregate
+                    del pending[index]
+                elif isinstance(result, ResolveContinue):
+                    pending[index] = result.subqueries
+
+        return [aggregates[index] for index in range(len(queriers))]
+
+    def query_server_batch(
+        self, search_tokens: List[bytes], eds: EdsType
+    ) -> List[Optional[bytes]]:
+        """
+        The portion of the query protocol that occurs on the server, for
+        a batch of search tokens. Unlike :func:`query_server`, the output
+        is aligned with :paramref:`search_tokens`: tokens that do not match
+        anything in the encrypted data structure produce :py:const:`None`.
+        """
+        return [self.eds_scheme.query(stk, eds) for stk in search_tokens]
 
     def generate_querier(
-        self, key: bytes, domain: Domain, query: RangeQuery
+        self,
+        key: bytes,
+        domain: Union[Domain, Domain2D],
+        query: Union[RangeQuery, RangeQuery2D],
     ) -> ARQQuerier[
         AggregateSchemeOutputType,
         EdsType,
@@ -147,13 +369,67 @@ class ARQ(
     ]:
         aggregate_scheme_querier: RangeAggregateQuerier[
             TokenInputType, ResolveOutputType
-        ] = self.aggregate_scheme.generate_querier(domain=domain, query=query)
+        ] = self.generate_aggregate_querier(domain, query)
         return ARQQuerier(
             key=key,
             eds_scheme=self.eds_scheme,
             aggregate_scheme_querier=aggregate_scheme_querier,
         )
 
+    def aggregate_scheme_setup(
+        self, table: Union[Table, Table2D]
+    ) -> AggregateSchemeOutputType:
+        """
+        Runs the setup of the aggregate scheme, checking that the table has
+        as many dimensions as the scheme.
+        """
+        if isinstance(self.aggregate_scheme, RangeAggregateScheme2D):
+            return self.aggregate_scheme.setup(self.__check_dimensions(table, Table2D))
+        return self.aggregate_scheme.setup(self.__check_dimensions(table, Table))
+
+    def aggregate_scheme_setup_stream(
+        self, table: Union[Table, Table2D]
+    ) -> Iterator[Tuple[Any, Any]]:
+        """
+        Runs the streaming setup of the aggregate scheme, checking that the
+        table has as many dimensions as the scheme.
+        """
+        if isinstance(self.aggregate_scheme, RangeAggregateScheme2D):
+            return self.aggregate_scheme.setup_stream(
+                self.__check_dimensions(table, Table2D)
+            )
+        return self.aggregate_scheme.setup_stream(self.__check_dimensions(table, Table))
+
+    def generate_aggregate_querier(
+        self,
+        domain: Union[Domain, Domain2D],
+        query: Union[RangeQuery, RangeQuery2D],
+    ) -> RangeAggregateQuerier[TokenInputType, ResolveOutputType]:
+        """
+        Generates a querier of the aggregate scheme, checking that the domain
+        and the query have as many dimensions as the scheme.
+        """
+        if isinstance(self.aggregate_scheme, RangeAggregateScheme2D):
+            return self.aggregate_scheme.generate_querier(
+                domain=self.__check_dimensions(domain, Domain2D),
+                query=self.__check_dimensions(query, RangeQuery2D),
+            )
+        return self.aggregate_scheme.generate_querier(
+            domain=self.__check_dimensions(domain, Domain),
+            query=self.__check_dimensions(query, RangeQuery),
+        )
+
+    def __check_dimensions(self, value: object, expected_type: Type[T]) -> T:
+        if not isinstance(value, expected_type):
+            dimensions = "one"
+            if isinstance(self.aggregate_scheme, RangeAggregateScheme2D):
+                dimensions = "two"
+            raise TypeError(
+                f"{type(self.aggregate_scheme).__name__} is {dimensions}-dimensional "
+                f"and takes a {expected_type.__name__}, not a {type(value).__name__}"
+            )
+        return value
+
 
 QuerierAggregateSchemeOutputType = TypeVar("QuerierAggregateSchemeOutputType")
 QuerierEdsType = TypeVar("QuerierEdsType")
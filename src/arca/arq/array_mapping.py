@@ -0,0 +1,280 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from typing import Any, ItemsView, Iterator, Mapping, Tuple, TypeVar, Union
+
+import itertools
+
+import numpy as np
+import numpy.typing as npt
+
+
+ValueType = TypeVar("ValueType", bound=Union[int, Tuple[int, ...]])
+TupleType = TypeVar("TupleType", bound=Tuple[int, ...])
+
+
+class ArrayMapping(Mapping[int, int]):
+    """
+    A read-only mapping from the integers :code:`start, start + 1, ...` to
+    the elements of a one-dimensional array.
+
+    Plaintext schemes use :class:`ArrayMapping` to return dense structures
+    without creating a Python object per entry. Keys and values are always
+    produced as native Python integers, so encrypted dictionary schemes
+    (which serialize both) can consume the mapping directly.
+    """
+
+    __slots__ = ["start", "array"]
+
+    def __init__(self, start: int, array: npt.NDArray[Any]):
+        #: The key corresponding to the first element of :attr:`array`.
+        self.start = start
+        #: The values of the mapping.
+        self.array = array
+
+    def __getitem__(self, key: int) -> int:
+        index = key - self.start
+        if not 0 <= index < len(self.array):
+            raise KeyError(key)
+        return int(self.array[index])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.start, self.start + len(self.array)))
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, int) and 0 <= key - self.start < len(self.array)
+
+    def items(self) -> ItemsView[int, int]:
+        return ArrayMappingItemsView(self)
+
+
+class ArrayMappingItemsView(ItemsView[int, int]):
+    """
+    Items view of an :class:`ArrayMapping` that converts the whole array at
+    once rather than looking up each key individually.
+    """
+
+    _mapping: ArrayMapping
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        mapping = self._mapping
+        return zip(
+            range(mapping.start, mapping.start + len(mapping.array)),
+            mapping.array.tolist(),
+        )
+
+
+class TupleArrayMapping(Mapping[int, TupleType]):
+    """
+    A read-only mapping from the integers :code:`start, start + 1, ...` to
+    the rows of a two-dimensional array, as tuples.
+
+    Like :class:`ArrayMapping`, keys and values are always produced as
+    native Python integers (or tuples of them).
+    """
+
+    __slots__ = ["start", "array"]
+
+    def __init__(self, start: int, array: npt.NDArray[Any]):
+        #: The key corresponding to the first row of :attr:`array`.
+        self.start = start
+        #: Array of shape :code:`(size, k)` holding the values of the mapping.
+        self.array = array
+
+    def __getitem__(self, key: int) -> TupleType:
+        index = key - self.start
+        if not 0 <= index < len(self.array):
+            raise KeyError(key)
+        return tuple(self.array[index].tolist())  # type: ignore
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.start, self.start + len(self.array)))
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, int) and 0 <= key - self.start < len(self.array)
+
+    def items(self) -> ItemsView[int, TupleType]:
+        return TupleArrayMappingItemsView(self)
+
+
+class TupleArrayMappingItemsView(ItemsView[int, TupleType]):
+    """
+    Items view of a :class:`TupleArrayMapping` that converts the whole array
+    at once rather than looking up each key individually.
+    """
+
+    _mapping: TupleArrayMapping[TupleType]
+
+    def __iter__(self) -> Iterator[Tuple[int, TupleType]]:
+        mapping = self._mapping
+        columns = [column.tolist() for column in mapping.array.T]
+        return zip(
+            range(mapping.start, mapping.start + len(mapping.array)),
+            zip(*columns),  # type: ignore
+        )
+
+
+class LevelArrayMapping(Mapping[Tuple[int, int], ValueType]):
+    """
+    A read-only mapping from :code:`(level, index)` pairs to the elements of
+    an array whose first axis is the level and whose second axis is the
+    index. If the array has a third axis, each value is the tuple of
+    elements along it.
+
+    Like :class:`ArrayMapping`, keys and values are always produced as
+    native Python integers (or tuples of them).
+    """
+
+    __slots__ = ["array"]
+
+    def __init__(self, array: npt.NDArray[Any]):
+        #: Array of shape :code:`(levels, size)` or :code:`(levels, size, k)`.
+        self.array = array
+
+    def __getitem__(self, key: Tuple[int, int]) -> ValueType:
+        if key not in self:
+            raise KeyError(key)
+        level, index = key
+        value = self.array[level, index : index + 1].tolist()[0]
+        return tuple(value) if isinstance(value, list) else value  # type: ignore
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        levels, size = self.array.shape[:2]
+        for level in range(levels):
+            for index in range(size):
+                yield (level, index)
+
+    def __len__(self) -> int:
+        levels, size = self.array.shape[:2]
+        return int(levels * size)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple) or len(key) != 2:
+            return False
+        level, index = key
+        levels, size = self.array.shape[:2]
+        return (
+            isinstance(level, int)
+            and isinstance(index, int)
+            and 0 <= level < levels
+            and 0 <= index < size
+        )
+
+    def items(self) -> ItemsView[Tuple[int, int], ValueType]:
+        return LevelArrayMappingItemsView(self)
+
+
+class LevelArrayMappingItemsView(ItemsView[Tuple[int, int], ValueType]):
+    """
+    Items view of a :class:`LevelArrayMapping` that converts one level of
+    the array at a time.
+    """
+
+    _mapping: LevelArrayMapping[ValueType]
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[int, int], ValueType]]:
+        array = self._mapping.array
+        levels, size = array.shape[:2]
+        for level in range(levels):
+            values = array[level].tolist()
+            if array.ndim > 2:
+                values = map(tuple, values)
+            keys = ((level, index) for index in range(size))
+            yield from zip(keys, values)
+
+
+class NDArrayMapping(Mapping[Tuple[int, ...], int]):
+    """
+    A read-only mapping from tuples of indices to the elements of a
+    multi-dimensional array, e.g. :code:`(i, j)` pairs for a
+    two-dimensional array.
+
+    Like :class:`ArrayMapping`, keys and values are always produced as
+    native Python integers.
+    """
+
+    __slots__ = ["array"]
+
+    def __init__(self, array: npt.NDArray[Any]):
+        #: The values of the mapping.
+        self.array = array
+
+    def __getitem__(self, key: Tuple[int, ...]) -> int:
+        if key not in self:
+            raise KeyError(key)
+        return int(self.array[key])
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        return itertools.product(*map(range, self.array.shape))
+
+    def __len__(self) -> int:
+        return int(self.array.size)
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            isinstance(key, tuple)
+            and len(key) == self.array.ndim
+            and all(
+                isinstance(index, int) and 0 <= index < size
+                for index, size in zip(key, self.array.shape)
+            )
+        )
+
+    def items(self) -> ItemsView[Tuple[int, ...], int]:
+        return NDArrayMappingItemsView(self)
+
+
+class NDArrayMappingItemsView(ItemsView[Tuple[int, ...], int]):
+    """
+    Items view of an :class:`NDArrayMapping` that converts the array one
+    row (along the first axis) at a time.
+    """
+
+    _mapping: NDArrayMapping
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[int, ...], int]]:
+        array = self._mapping.array
+        for index, row in enumerate(array):
+            keys = itertools.product([index], *map(range, row.shape))
+            yield from zip(keys, row.reshape(-1).tolist())
+
+
+def is_safe_to_accumulate(array: npt.NDArray[Any], power: int = 1) -> bool:
+    """
+    Returns whether every partial sum of the elements of the given integer
+    array, each raised to :paramref:`power`, is guaranteed to fit in the
+    array's dtype. Arrays with an :code:`object` dtype hold arbitrary Python
+    integers and are always safe.
+
+    :param array: a one-dimensional integer array
+    :param power: the power the elements are raised to before summing, e.g.
+        2 for sums of squares
+    :return: :py:const:`True` if :code:`np.cumsum(array**power)` cannot
+        overflow
+    """
+    if array.dtype == object or len(array) <= 0:
+        return True
+    largest_magnitude = max(abs(int(array.max())), abs(int(array.min())))
+    largest_power: int = largest_magnitude**power
+    return largest_power * len(array) <= int(np.iinfo(array.dtype).max)
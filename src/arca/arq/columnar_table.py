@@ -0,0 +1,217 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, List, Mapping, Sequence, Tuple
+from dataclasses import dataclass
+
+from .table import Table
+from .range_query import RangeQuery
+from .domain import Domain
+
+import numpy as np
+import numpy.typing as npt
+
+
+def as_integer_array(values: Sequence[int]) -> npt.NDArray[Any]:
+    """
+    Converts the given integers into a NumPy array. The array uses a
+    fixed-width :code:`int64` dtype whenever every value fits; otherwise, it
+    falls back to an :code:`object` dtype so that arbitrarily large Python
+    integers are preserved exactly.
+
+    :param values: the integers to convert
+    :return: a one-dimensional array containing :paramref:`values`
+    """
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+
+class ColumnarEntries(Mapping[int, List[int]]):
+    """
+    A read-only view over the arrays of a :class:`ColumnarTable` with the
+    same interface as the :code:`entries` dictionary of a :class:`Table`.
+    Only domain values with at least one record are considered keys.
+    """
+
+    __slots__ = ["domain", "records", "offsets"]
+
+    def __init__(
+        self,
+        domain: Domain,
+        records: npt.NDArray[Any],
+        offsets: npt.NDArray[np.int64],
+    ):
+        self.domain = domain
+        self.records = records
+        self.offsets = offsets
+
+    def __getitem__(self, domain_value: int) -> List[int]:
+        if not self.domain.start <= domain_value < self.domain.end:
+            raise KeyError(domain_value)
+        index = domain_value - self.domain.start
+        records: List[int] = self.records[
+            self.offsets[index] : self.offsets[index + 1]
+        ].tolist()
+        if len(records) <= 0:
+            raise KeyError(domain_value)
+        return records
+
+    def __iter__(self) -> Iterator[int]:
+        for index in np.flatnonzero(np.diff(self.offsets)).tolist():
+            yield self.domain.start + index
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(np.diff(self.offsets)))
+
+
+@dataclass(frozen=True, eq=False)
+class ColumnarTable(Table):
+    """
+    Represents a collection of records stored in columnar form.
+
+    The records are stored in a single array sorted by domain value,
+    together with a CSR-style array of offsets such that the records
+    located at domain value :code:`domain.start + i` are exactly
+    :code:`values[offsets[i]:offsets[i + 1]]`. Consequently, the records
+    contained in any range are a contiguous slice of :code:`values`, which
+    :func:`filter_range_view` returns without copying.
+
+    Two :class:`ColumnarTable` objects compare equal if they contain the same
+    records over the same :class:`Domain`.
+    """
+
+    __slots__ = ["values", "offsets"]
+
+    #: The records, sorted by domain value (stable with respect to the
+    #: order in which records were given to :func:`make`).
+    values: npt.NDArray[Any]
+    #: Array of length :code:`domain.size() + 1` delimiting the records at
+    #: each domain value.
+    offsets: npt.NDArray[np.int64]
+
+    def number_of_filled_domain_points(self) -> int:
+        return len(self.entries)
+
+    def number_of_records(self) -> int:
+        return len(self.values)
+
+    def filter(self, domain_value: int) -> List[int]:
+        records: List[int] = self.filter_view(domain_value).tolist()
+        return records
+
+    def filter_range(self, range_query: RangeQuery) -> List[int]:
+        records: List[int] = self.filter_range_view(range_query).tolist()
+        return records
+
+    def filter_view(self, domain_value: int) -> npt.NDArray[Any]:
+        """
+        Returns all of the records with matching domain_value as a
+        read-only view into :attr:`values`.
+
+        :param domain_value: the domain value to filter for
+        :return: an array of all records located at the particular domain_value
+        """
+        return self.filter_range_view(
+            RangeQuery(start=domain_value, end=domain_value + 1)
+        )
+
+    def filter_range_view(self, range_query: RangeQuery) -> npt.NDArray[Any]:
+        """
+        Returns all of the records contained in the given range_query as a
+        read-only view into :attr:`values`. No records are copied.
+
+        :param range_query: the range to filter over
+        :return: an array of all records matching the filter
+        """
+        start = min(max(range_query.start, self.domain.start), self.domain.end)
+        end = min(max(range_query.end, start), self.domain.end)
+        return self.values[
+            self.offsets[start - self.domain.start] : self.offsets[
+                end - self.domain.start
+            ]
+        ]
+
+    @staticmethod
+    def make(records: Iterable[Tuple[int, int]]) -> ColumnarTable:
+        """
+        Makes a columnar table from the records in the given iterator.
+
+        :param records: the records to generate the :class:`ColumnarTable` from
+        :return: a new :class:`ColumnarTable`
+        """
+        records = list(records)
+        domain_values = np.array([record[0] for record in records], dtype=np.int64)
+        domain = Domain(
+            start=int(domain_values.min()), end=int(domain_values.max()) + 1
+        )
+        return ColumnarTable.__make_sorted(
+            domain,
+            domain_values - domain.start,
+            as_integer_array([record[1] for record in records]),
+        )
+
+    @staticmethod
+    def make_from_list(records: List[int]) -> ColumnarTable:
+        return ColumnarTable.make(list(enumerate(records)))
+
+    @staticmethod
+    def from_table(table: Table) -> ColumnarTable:
+        """
+        Converts the given :class:`Table` into a :class:`ColumnarTable` over
+        the same :class:`Domain`. Does nothing if :paramref:`table` is
+        already a :class:`ColumnarTable`.
+
+        :param table: the table to convert
+        :return: a :class:`ColumnarTable` with the same records
+        """
+        if isinstance(table, ColumnarTable):
+            return table
+
+        positions: List[int] = []
+        values: List[int] = []
+        for domain_value, records in table.entries.items():
+            if table.domain.start <= domain_value < table.domain.end:
+                positions.extend([domain_value - table.domain.start] * len(records))
+                values.extend(records)
+        return ColumnarTable.__make_sorted(
+            table.domain,
+            np.array(positions, dtype=np.int64),
+            as_integer_array(values),
+        )
+
+    @staticmethod
+    def __make_sorted(
+        domain: Domain, positions: npt.NDArray[np.int64], values: npt.NDArray[Any]
+    ) -> ColumnarTable:
+        order = np.argsort(positions, kind="stable")
+        counts = np.bincount(positions, minlength=domain.size())
+        offsets = np.zeros(domain.size() + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        sorted_values = values[order]
+        sorted_values.flags.writeable = False
+        offsets.flags.writeable = False
+
+        return ColumnarTable(
+            entries=ColumnarEntries(domain, sorted_values, offsets),
+            domain=domain,
+            values=sorted_values,
+            offsets=offsets,
+        )
@@ -0,0 +1,54 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from .domain import Domain
+
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Domain2D:
+    """
+    Represents the grid of queryable points in a :class:`Table2D`: the
+    product of a :class:`Domain` along each axis.
+    """
+
+    __slots__ = ["x", "y"]
+
+    #: Domain along the first axis.
+    x: Domain
+    #: Domain along the second axis.
+    y: Domain
+
+    def size(self) -> int:
+        """
+        Returns the number of possible points.
+
+        :return: the size of the :class:`Domain2D`
+        """
+        return self.x.size() * self.y.size()
+
+    def shape(self) -> Tuple[int, int]:
+        """
+        Returns the number of possible domain values along each axis.
+
+        :return: the shape of the :class:`Domain2D`
+        """
+        return self.x.size(), self.y.size()
@@ -0,0 +1,66 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fractions import Fraction
+
+
+@dataclass(frozen=True)
+class Moments:
+    """
+    Represents the count, sum and sum of squares of the records in a range,
+    from which the range's mean and variance follow.
+    """
+
+    __slots__ = ["count", "total", "sum_of_squares"]
+
+    #: Number of records.
+    count: int
+    #: Sum of the records.
+    total: int
+    #: Sum of the squares of the records.
+    sum_of_squares: int
+
+    def __sub__(self, other: Moments) -> Moments:
+        return Moments(
+            count=self.count - other.count,
+            total=self.total - other.total,
+            sum_of_squares=self.sum_of_squares - other.sum_of_squares,
+        )
+
+    @property
+    def mean(self) -> Fraction:
+        """
+        Returns the mean of the records.
+
+        :return: the mean, as an exact fraction
+        """
+        if self.count <= 0:
+            raise ValueError("mean of an empty range is undefined")
+        return Fraction(self.total, self.count)
+
+    @property
+    def variance(self) -> Fraction:
+        """
+        Returns the (population) variance of the records.
+
+        :return: the variance, as an exact fraction
+        """
+        mean = self.mean
+        return Fraction(self.sum_of_squares, self.count) - mean * mean
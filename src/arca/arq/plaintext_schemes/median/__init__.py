@@ -14,6 +14,7 @@
 ## limitations under the License.
 ##
 
-__all__ = ["MedianAlphaApprox"]
+__all__ = ["MedianAlphaApprox", "MedianWaveletMatrix"]
 
 from .median_alpha_approx import MedianAlphaApprox
+from .median_wavelet_matrix import MedianWaveletMatrix
@@ -22,16 +22,26 @@ from ...range_aggregate_querier import (
     ResolveDone,
 )
 from ...table import Table
+from ...columnar_table import ColumnarEntries, ColumnarTable
 from ...domain import Domain
 from ...range_query import RangeQuery
 from ....util.math import log2_ceil, log2_floor
+from ....util.processes import get_multiprocessing_context
 
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from decimal import Decimal
-from tqdm import trange
+from tqdm import tqdm
 
 import math
 
+import numpy as np
+import numpy.typing as npt
+
+
+#: Number of blocks of a level whose medians are computed in each task
+#: when the setup runs on several processes.
+BLOCKS_PER_TASK = 1024
+
 
 class MedianAlphaApprox(
     RangeAggregateScheme[Dict[Tuple[int, int], List[int]], Tuple[int, int], List[int]]
@@ -50,36 +60,64 @@ class MedianAlphaApprox(
     approximation. [BKMT05] and [EMT22] explain this parameter in more
     detail. Generally, the accuracy of the approximation increases as
     :math:`\alpha` tends to 1.
+
+    The setup computes the medians of the windows of :code:`1, 2, ...,
+    max_p` blocks starting at each block incrementally, by merging the
+    sorted records of each new block into the sorted records of the
+    previous window. The blocks can be spread over
+    :paramref:`num_processes` processes.
     """
 
-    __slots__ = ["alpha"]
+    __slots__ = ["alpha", "num_processes"]
 
-    def __init__(self, alpha: float):
+    def __init__(self, alpha: float, num_processes: int = 1):
         if not 0 < alpha < 1:
             raise ValueError("alpha must be 0 < alpha < 1")
         #: The approximation factor for the scheme.
         self.alpha = alpha
+        #: Number of processes to compute the medians with during setup.
+        self.num_processes = num_processes
 
     def setup(self, table: Table) -> Dict[Tuple[int, int], List[int]]:
-        median_ds = {}
+        return dict(self.setup_stream(table))
+
+    def setup_stream(self, table: Table) -> Iterator[Tuple[Tuple[int, int], List[int]]]:
+        columnar_table = ColumnarTable.from_table(table)
         domain_size = table.domain.size()
         k = log2_ceil(domain_size)
         max_p = math.ceil((2 * (1 + self.alpha)) / (1 - self.alpha))
-        for level in trange(1, k + 1, leave=False):
-            block_size = 2 ** (k - level)
-            num_blocks = math.ceil(domain_size / block_size)
-
-            for j in trange(1, num_blocks + 1, leave=False):
-                medians: List[int] = []
-                for p in trange(1, max_p + 1, leave=False):
-                    start = min((j - 1) * block_size, table.domain.end - 1)
-                    end = min(start + (p * block_size), table.domain.end)
-                    entries = table.filter_range(RangeQuery(start=start, end=end))
-                    median = self.__compute_median(entries)
-                    medians.append(median)
-                median_ds[(level, j)] = medians
-
-        return median_ds
+
+        tasks = [
+            (level, first_block, min(first_block + BLOCKS_PER_TASK, num_blocks + 1))
+            for level in range(1, k + 1)
+            for num_blocks in [math.ceil(domain_size / 2 ** (k - level))]
+            for first_block in range(1, num_blocks + 1, BLOCKS_PER_TASK)
+        ]
+        if self.num_processes <= 1:
+            for level, first_block, end_block in tqdm(tasks, leave=False):
+                yield from compute_block_medians(
+                    columnar_table, k, max_p, level, first_block, end_block
+                )
+            return
+
+        # The table is sent as plain arrays, since frozen dataclasses with
+        # slots (such as Domain) cannot be unpickled by spawned workers:
+        with get_multiprocessing_context().Pool(
+            self.num_processes,
+            initializer=_initialize_worker,
+            initargs=(
+                columnar_table.domain.start,
+                columnar_table.domain.end,
+                columnar_table.values,
+                columnar_table.offsets,
+                k,
+                max_p,
+            ),
+        ) as pool:
+            for block_medians in tqdm(
+                pool.imap(_compute_block_medians, tasks), total=len(tasks), leave=False
+            ):
+                yield from block_medians
 
     def generate_querier(
         self, domain: Domain, query: RangeQuery
@@ -88,12 +126,106 @@ class MedianAlphaApprox(
             domain=domain, initial_query=query, alpha=self.alpha
         )
 
-    def __compute_median(self, unioned_list: List[int]) -> int:
-        if len(unioned_list) <= 0:
-            return 0
-        sorted_list = list(sorted(unioned_list))
-        midpoint = math.ceil(len(sorted_list) / 2) - 1
-        return sorted_list[midpoint]
+
+def compute_block_medians(
+    table: ColumnarTable,
+    k: int,
+    max_p: int,
+    level: int,
+    first_block: int,
+    end_block: int,
+) -> List[Tuple[Tuple[int, int], List[int]]]:
+    """
+    Computes the entries of the :class:`MedianAlphaApprox` data structure
+    for the blocks :code:`first_block, ..., end_block - 1` (indexed from 1)
+    of the given level: the medians of the windows of :code:`1, ..., max_p`
+    blocks starting at each block.
+
+    :param table: the table
+    :param k: the number of levels
+    :param max_p: the maximum number of blocks in a window
+    :param level: the level of the blocks
+    :param first_block: the first block
+    :param end_block: the block after the last block
+    :return: the :code:`((level, j), medians)` entry of each block
+    """
+    block_size = 2 ** (k - level)
+    sorted_runs: Dict[int, List[int]] = {}
+
+    def sorted_run(start: int) -> List[int]:
+        # Consecutive blocks share most of their windows, so the records of
+        # each block are sorted once:
+        if start not in sorted_runs:
+            records = table.filter_range_view(
+                RangeQuery(start=start, end=min(start + block_size, table.domain.end))
+            )
+            sorted_runs[start] = sorted(records.tolist())
+        return sorted_runs[start]
+
+    entries = []
+    for j in range(first_block, end_block):
+        start = min((j - 1) * block_size, table.domain.end - 1)
+        window = sorted_run(start)
+        medians = [median_of_sorted(window)]
+        for p in range(2, max_p + 1):
+            run_start = start + (p - 1) * block_size
+            if run_start < table.domain.end:
+                # The window is made of two sorted runs, which Timsort
+                # merges in linear time:
+                window = sorted(window + sorted_run(run_start))
+            medians.append(median_of_sorted(window))
+        entries.append(((level, j), medians))
+    return entries
+
+
+def median_of_sorted(sorted_records: List[int]) -> int:
+    """
+    Returns the (lower) median of the given sorted records, or 0 if there
+    are none.
+
+    :param sorted_records: the records, in sorted order
+    :return: the median
+    """
+    if len(sorted_records) <= 0:
+        return 0
+    midpoint = math.ceil(len(sorted_records) / 2) - 1
+    return sorted_records[midpoint]
+
+
+#: State installed in each worker process by :func:`_initialize_worker`.
+_worker_table: Optional[ColumnarTable] = None
+_worker_k = 0
+_worker_max_p = 0
+
+
+def _initialize_worker(
+    domain_start: int,
+    domain_end: int,
+    values: npt.NDArray[Any],
+    offsets: npt.NDArray[np.int64],
+    k: int,
+    max_p: int,
+) -> None:
+    global _worker_table, _worker_k, _worker_max_p
+    domain = Domain(start=domain_start, end=domain_end)
+    _worker_table = ColumnarTable(
+        entries=ColumnarEntries(domain, values, offsets),
+        domain=domain,
+        values=values,
+        offsets=offsets,
+    )
+    _worker_k = k
+    _worker_max_p = max_p
+
+
+def _compute_block_medians(
+    task: Tuple[int, int, int],
+) -> List[Tuple[Tuple[int, int], List[int]]]:
+    assert _worker_table is not None
+    level, first_block, end_block = task
+    return compute_block_medians(
+        _worker_table, _worker_k, _worker_max_p, level, first_block, end_block
+    )
 
 
 class MedianAlphaApproxQuerier(RangeAggregateQuerier[Tuple[int, int], List[int]]):
@@ -0,0 +1,201 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from ...range_aggregate_scheme import RangeAggregateScheme
+from ...range_aggregate_querier import (
+    RangeAggregateQuerier,
+    ResolveContinue,
+    ResolveDone,
+)
+from ...table import Table
+from ...columnar_table import ColumnarTable
+from ...domain import Domain
+from ...range_query import RangeQuery
+
+from typing import Dict, Iterator, List, Tuple, Union
+
+import math
+import enum
+
+import numpy as np
+
+# Sentinel value used to populate the unused elements of the tuples used to
+# key the dictionary in the MedianWaveletMatrix scheme.
+UNUSED_ELEMENT = 0
+
+
+class MedianWaveletMatrixTableID(enum.IntEnum):
+    """
+    Internal class assigning identifiers to each of the data structures used
+    in the :class:`MedianWaveletMatrix` scheme.
+    """
+
+    #: ID for the number of levels of the wavelet matrix.
+    NUM_LEVELS = 0
+
+    #: ID for the position of the first record at each domain value.
+    OFFSETS = 1
+
+    #: ID for the number of zero bits before each position of each level.
+    RANKS = 2
+
+    #: ID for the total number of zero bits in each level.
+    ZEROS = 3
+
+    #: ID for the distinct record values, by rank.
+    VALUES = 4
+
+
+class MedianWaveletMatrix(
+    RangeAggregateScheme[Dict[Tuple[int, int, int], int], Tuple[int, int, int], int]
+):
+    """
+    Implements exact range medians with a wavelet matrix [CNP15] over the
+    records sorted by domain value.
+
+    Each record is replaced by the rank of its value among the distinct
+    record values, and the wavelet matrix stores one bit of the rank per
+    level, along with the number of zero bits before each position. A
+    query first looks up the positions of the records in the query range
+    and then descends one level per round, narrowing the range of
+    positions to the records that share a prefix of bits with the median.
+    The median is thus found after :code:`log2(number of distinct values)`
+    rounds, with an index of :code:`O(n log(number of distinct values))`
+    entries.
+
+    As in :class:`MedianAlphaApprox`, the median of an even number of
+    records is the lower of the two middle records, and the median of an
+    empty range is 0.
+    """
+
+    def setup(self, table: Table) -> Dict[Tuple[int, int, int], int]:
+        return dict(self.setup_stream(table))
+
+    def setup_stream(self, table: Table) -> Iterator[Tuple[Tuple[int, int, int], int]]:
+        columnar_table = ColumnarTable.from_table(table)
+        values, codes = np.unique(columnar_table.values, return_inverse=True)
+        codes = codes.reshape(-1).astype(np.int64)
+        num_levels = max(len(values) - 1, 0).bit_length()
+
+        yield (
+            MedianWaveletMatrixTableID.NUM_LEVELS,
+            UNUSED_ELEMENT,
+            UNUSED_ELEMENT,
+        ), num_levels
+        for index, offset in enumerate(columnar_table.offsets.tolist()):
+            yield (MedianWaveletMatrixTableID.OFFSETS, index, UNUSED_ELEMENT), offset
+        for code, value in enumerate(values.tolist()):
+            yield (MedianWaveletMatrixTableID.VALUES, code, UNUSED_ELEMENT), value
+
+        for level in range(num_levels):
+            bits = (codes >> (num_levels - level - 1)) & 1
+            ranks = np.zeros(len(codes) + 1, dtype=np.int64)
+            np.cumsum(bits == 0, out=ranks[1:])
+            for position, rank in enumerate(ranks.tolist()):
+                yield (MedianWaveletMatrixTableID.RANKS, level, position), rank
+            yield (
+                MedianWaveletMatrixTableID.ZEROS,
+                level,
+                UNUSED_ELEMENT,
+            ), int(ranks[-1])
+
+            # The next level orders the records stably by their bit at this
+            # level, so the records sharing a prefix stay contiguous:
+            codes = np.concatenate((codes[bits == 0], codes[bits == 1]))
+
+    def generate_querier(
+        self, domain: Domain, query: RangeQuery
+    ) -> MedianWaveletMatrixQuerier:
+        return MedianWaveletMatrixQuerier(domain=domain, initial_query=query)
+
+
+class MedianWaveletMatrixQuerier(RangeAggregateQuerier[Tuple[int, int, int], int]):
+    """
+    Associated querier for the :class:`MedianWaveletMatrix` scheme.
+    """
+
+    def __init__(self, domain: Domain, initial_query: RangeQuery):
+        self.domain = domain
+        self.initial_query = initial_query
+        #: The number of levels of the wavelet matrix, once known.
+        self.num_levels = -1
+        #: The level that the pending subqueries read (-1 before the range
+        #: of positions is known).
+        self.level = -1
+        #: The range of positions of the candidate records in the current
+        #: level.
+        self.start = 0
+        self.end = 0
+        #: The rank of the median among the candidate records.
+        self.rank = 0
+        #: The bits of the median's code read so far.
+        self.code = 0
+
+    def query(self) -> List[Tuple[int, int, int]]:
+        return [
+            (
+                MedianWaveletMatrixTableID.OFFSETS,
+                self.initial_query.start - self.domain.start,
+                UNUSED_ELEMENT,
+            ),
+            (
+                MedianWaveletMatrixTableID.OFFSETS,
+                self.initial_query.end - self.domain.start,
+                UNUSED_ELEMENT,
+            ),
+            (
+                MedianWaveletMatrixTableID.NUM_LEVELS,
+                UNUSED_ELEMENT,
+                UNUSED_ELEMENT,
+            ),
+        ]
+
+    def resolve(
+        self, responses: List[int]
+    ) -> Union[ResolveDone, ResolveContinue[Tuple[int, int, int]]]:
+        if self.level < 0:
+            self.start, self.end, self.num_levels = responses
+            if self.start >= self.end:
+                return ResolveDone(0)
+            self.rank = math.ceil((self.end - self.start) / 2) - 1
+        elif self.level < self.num_levels:
+            start_zeros, end_zeros, num_zeros = responses
+            if self.rank < end_zeros - start_zeros:
+                self.start, self.end = start_zeros, end_zeros
+                self.code = 2 * self.code
+            else:
+                self.rank -= end_zeros - start_zeros
+                self.start = num_zeros + self.start - start_zeros
+                self.end = num_zeros + self.end - end_zeros
+                self.code = 2 * self.code + 1
+        else:
+            return ResolveDone(responses[0])
+
+        self.level += 1
+        if self.level >= self.num_levels:
+            return ResolveContinue(
+                [(MedianWaveletMatrixTableID.VALUES, self.code, UNUSED_ELEMENT)]
+            )
+        return ResolveContinue(
+            [
+                (MedianWaveletMatrixTableID.RANKS, self.level, self.start),
+                (MedianWaveletMatrixTableID.RANKS, self.level, self.end),
+                (MedianWaveletMatrixTableID.ZEROS, self.level, UNUSED_ELEMENT),
+            ]
+        )
@@ -14,8 +14,14 @@
 ## limitations under the License.
 ##
 
-__all__ = ["MinimumASTable", "MinimumSparseTable", "MinimumLinearEMT"]
+__all__ = [
+    "MinimumASTable",
+    "MinimumSparseTable",
+    "MinimumSparseTable2D",
+    "MinimumLinearEMT",
+]
 
 from .minimum_as_table import MinimumASTable
 from .minimum_sparse_table import MinimumSparseTable
+from .minimum_sparse_table_2d import MinimumSparseTable2D
 from .minimum_linear_emt import MinimumLinearEMT
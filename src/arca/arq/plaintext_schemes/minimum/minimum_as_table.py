@@ -22,51 +22,52 @@ from ...range_aggregate_querier import (
     ResolveDone,
 )
 from ...table import Table
+from ...columnar_table import as_integer_array
+from ...array_mapping import LevelArrayMapping
 from ...domain import Domain
 from ...range_query import RangeQuery
 
 from ....util.math import log2_ceil
 
-from typing import Dict, Iterable, List, Tuple
+from typing import Any, List, Tuple
 from dataclasses import dataclass
-from tqdm import trange
 
-import math
+import numpy as np
+import numpy.typing as npt
 
 
 class MinimumASTable(
-    RangeAggregateScheme[Dict[Tuple[int, int], int], Tuple[int, int], int]
+    RangeAggregateScheme[LevelArrayMapping[int], Tuple[int, int], int]
 ):
     """
     Implements the one-dimensional minimum technique for using the [AS87]
     interval selection technique.
-    """
 
-    def setup(self, table: Table) -> Dict[Tuple[int, int], int]:
-        as_table_ds: Dict[Tuple[int, int], int] = {}
+    At level :code:`p`, the domain is split into segments of size
+    :code:`2**p`. Each point in the left half of a segment stores the
+    minimum from that point to the middle of the segment, and each point in
+    the right half stores the minimum from the middle of the segment to that
+    point.
+    """
 
-        ending_power_of_2 = log2_ceil(table.domain.size())
-        table_points = list(
-            table.iterate_over_unique_domain_points(
-                lambda lst: min(lst) if len(lst) > 0 else 0
+    def setup(self, table: Table) -> LevelArrayMapping[int]:
+        table_points = as_integer_array(
+            list(
+                table.iterate_over_unique_domain_points(
+                    lambda lst: min(lst) if len(lst) > 0 else 0
+                )
             )
         )
-        for power in trange(ending_power_of_2 + 1, leave=False):
-            range_size = 2**power
-            num_segments = math.ceil(table.domain.size() / range_size)
-
-            for segment_index in trange(num_segments, leave=False):
-                start = segment_index * range_size
-                end = min(start + range_size, table.domain.size())
-                halfway = min(start + int(range_size / 2), end)
+        size = len(table_points)
 
-                ds1 = self.__running_minimum(
-                    table_points, power, reversed(range(start, halfway))
-                )
-                ds2 = self.__running_minimum(table_points, power, range(halfway, end))
-                as_table_ds = {**as_table_ds, **ds1, **ds2}
+        ending_power_of_2 = log2_ceil(table.domain.size())
+        as_table = np.empty((ending_power_of_2 + 1, size), dtype=table_points.dtype)
+        for power in range(ending_power_of_2 + 1):
+            # Levels 0 and 1 both consist of single-point half-segments:
+            half_size = max(2 ** (power - 1), 1)
+            as_table[power] = self.__running_minimum(table_points, half_size)
 
-        return as_table_ds
+        return LevelArrayMapping(as_table)
 
     def generate_querier(
         self, domain: Domain, query: RangeQuery
@@ -74,18 +75,28 @@ class MinimumASTable(
         return MinimumASTableQuerier(domain=domain, initial_query=query)
 
     def __running_minimum(
-        self, table_points: List[int], level: int, iterator: Iterable[int]
-    ) -> Dict[Tuple[int, int], int]:
-        as_table_ds = {}
-
-        current_minimum = None
-        for i in iterator:
-            value = table_points[i]
-            if current_minimum is None or value < current_minimum:
-                current_minimum = value
-            as_table_ds[(level, i)] = current_minimum
-
-        return as_table_ds
+        self, table_points: npt.NDArray[Any], half_size: int
+    ) -> npt.NDArray[Any]:
+        """
+        Computes the running minimum towards the middle of every segment of
+        size :code:`2 * half_size`, i.e., backwards over each left half and
+        forwards over each right half.
+        """
+        size = len(table_points)
+        num_halves = -(-size // half_size)
+
+        # Padding with the maximum value leaves every running minimum over
+        # real points unchanged:
+        padded_points = np.full(
+            num_halves * half_size, table_points.max(), dtype=table_points.dtype
+        )
+        padded_points[:size] = table_points
+        halves = padded_points.reshape(num_halves, half_size)
+
+        running_minimum = np.minimum.accumulate(halves, axis=1)
+        left_halves = halves[0::2, ::-1]
+        running_minimum[0::2] = np.minimum.accumulate(left_halves, axis=1)[:, ::-1]
+        return running_minimum.reshape(-1)[:size]
 
 
 @dataclass(frozen=True)
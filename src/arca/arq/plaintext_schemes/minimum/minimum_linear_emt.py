@@ -16,8 +16,16 @@
 
 from __future__ import annotations
 
-from .minimum_sparse_table import MinimumSparseTable
-from ...range_aggregate_scheme import RangeAggregateScheme
+from .minimum_sparse_table import (
+    MinimumSparseTable,
+    point_minimum,
+    sparse_table_suffix,
+    sparse_table_suffix_subqueries,
+)
+from ...range_aggregate_scheme import (
+    AppendableRangeAggregateScheme,
+    check_extended_domain,
+)
 from ...range_aggregate_querier import (
     RangeAggregateQuerier,
     ResolveDone,
@@ -28,13 +36,12 @@ from ...range_query import RangeQuery
 from ....util.math import log2_ceil
 
 
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
 
 import math
 import itertools
 import enum
 
-
 # Sentinel value used to populate the third element of the tuples used to
 # key the dictionary in the MinimumLinearEMT scheme (the third element of
 # the tuples are not used for the lookup tables; the third element is only
@@ -59,12 +66,19 @@ class MinimumLinearEMTTableID(enum.IntEnum):
 
 
 class MinimumLinearEMT(
-    RangeAggregateScheme[Dict[Tuple[int, int, int], int], Tuple[int, int, int], int]
+    AppendableRangeAggregateScheme[
+        Dict[Tuple[int, int, int], int], Tuple[int, int, int], int
+    ]
 ):
     """
     Implements the one-dimensional sparse table technique for range minimum
     queries from [EMT22]. This scheme allows for asymptotically linear
     storage in exchange for a limitation on the query size.
+
+    Appending records only recomputes the entries of the last (partial)
+    block onwards, unless the block size or the number of levels of the
+    sparse table over the blocks changes, in which case the data structure
+    is rebuilt.
     """
 
     def __init__(self) -> None:
@@ -75,55 +89,106 @@ class MinimumLinearEMT(
         return max(log2_ceil(domain_size), 1)
 
     def setup(self, table: Table) -> Dict[Tuple[int, int, int], int]:
-        block_size = MinimumLinearEMT.compute_block_size(table.domain.size())
-        num_blocks = math.ceil(table.domain.size() / block_size)
-
-        # Divide the domain into blocks of size `block_size`:
-        blocks = [
-            table.filter_range(
-                RangeQuery(
-                    start=block_index * block_size,
-                    end=min((block_index + 1) * block_size, table.domain.size()),
-                )
-            )
-            for block_index in range(num_blocks)
-        ]
+        return dict(self.setup_stream(table))
 
-        block_minimums = map(lambda block: min(block) if len(block) > 0 else 0, blocks)
+    def setup_stream(self, table: Table) -> Iterator[Tuple[Tuple[int, int, int], int]]:
+        block_size = MinimumLinearEMT.compute_block_size(table.domain.size())
+        points = list(table.iterate_over_unique_domain_points(point_minimum))
 
-        # Make the sparse table over the block_minimums:
+        # Make the sparse table over the minimums of the blocks of size
+        # `block_size` that the domain is divided into:
+        block_minimums = list(block_minimums_of(points, block_size))
         block_minimum_table = Table.make(list(enumerate(block_minimums)))
         sparse_table = self.minimum_sparse_table_scheme.setup(block_minimum_table)
 
-        # Convert everything to a dict:
-        combined_structure: Dict[Tuple[int, int, int], int] = {}
         for key, value in sparse_table.items():
-            combined_structure[(MinimumLinearEMTTableID.SPARSE_TABLE, *key)] = value
-
-        # Make the lookup tables:
-        lookup_left = [0] * table.domain.size()
-        lookup_right = [0] * table.domain.size()
-        for block_index, block in enumerate(blocks):
-            start = block_index * block_size
-            end = min(start + block_size, table.domain.size())
-
-            # Fixed LEFT, moving RIGHT (and vice versa):
-            lookup_left[start:end] = itertools.accumulate(block, min)
-            lookup_right[start:end] = list(
-                reversed(list(itertools.accumulate(reversed(block), min)))
+            yield (MinimumLinearEMTTableID.SPARSE_TABLE, *key), value
+
+        yield from lookup_table_entries(points, 0, block_size, 0)
+
+    def append_subqueries(
+        self, domain: Domain, extended_domain: Domain
+    ) -> List[Tuple[int, int, int]]:
+        check_extended_domain(domain, extended_domain)
+        if self.needs_rebuild(domain.size(), extended_domain.size()):
+            return []
+
+        block_size = MinimumLinearEMT.compute_block_size(domain.size())
+        num_levels = MinimumSparseTable.compute_num_levels(
+            math.ceil(domain.size() / block_size)
+        )
+        return [
+            (MinimumLinearEMTTableID.SPARSE_TABLE, *key)
+            for key in sparse_table_suffix_subqueries(
+                domain.size() // block_size,
+                math.ceil(extended_domain.size() / block_size),
+                num_levels,
             )
+        ]
 
-        lookup_tables = [
-            (MinimumLinearEMTTableID.LOOKUP_LEFT, lookup_left),
-            (MinimumLinearEMTTableID.LOOKUP_RIGHT, lookup_right),
+    def append(
+        self,
+        domain: Domain,
+        extended_table: Table,
+        responses: Mapping[Tuple[int, int, int], int],
+    ) -> Iterator[Tuple[Tuple[int, int, int], int]]:
+        check_extended_domain(domain, extended_table.domain)
+        size = domain.size()
+        extended_size = extended_table.domain.size()
+        if self.needs_rebuild(size, extended_size):
+            yield from self.setup_stream(extended_table)
+            return
+
+        block_size = MinimumLinearEMT.compute_block_size(size)
+        num_levels = MinimumSparseTable.compute_num_levels(math.ceil(size / block_size))
+
+        # Every entry before the (possibly partial) last block of the
+        # original table is unchanged:
+        first_block = size // block_size
+        first_index = first_block * block_size
+        points = [
+            point_minimum(extended_table.filter(domain.start + index))
+            for index in range(first_index, extended_size)
         ]
-        for lookup_table_id, lookup_table in lookup_tables:
-            for index, value in enumerate(lookup_table):
-                combined_structure[
-                    (lookup_table_id, index, LOOKUP_THIRD_ELEMENT)
-                ] = value
 
-        return combined_structure
+        sparse_responses = {
+            (level, index): value
+            for (table_id, level, index), value in responses.items()
+            if table_id == MinimumLinearEMTTableID.SPARSE_TABLE
+        }
+        sparse_entries = sparse_table_suffix(
+            list(block_minimums_of(points, block_size)),
+            first_block,
+            math.ceil(extended_size / block_size),
+            num_levels,
+            sparse_responses,
+        )
+        for key, value in sparse_entries.items():
+            yield (MinimumLinearEMTTableID.SPARSE_TABLE, *key), value
+
+        yield from lookup_table_entries(points, first_index, block_size, size)
+
+    @staticmethod
+    def needs_rebuild(domain_size: int, extended_domain_size: int) -> bool:
+        """
+        Returns whether appending to a table of :paramref:`domain_size`
+        points to get one of :paramref:`extended_domain_size` points changes
+        the shape of the data structure, so that it must be rebuilt.
+
+        :param domain_size: the size of the original domain
+        :param extended_domain_size: the size of the extended domain
+        :return: whether the data structure must be rebuilt
+        """
+        block_size = MinimumLinearEMT.compute_block_size(domain_size)
+        if MinimumLinearEMT.compute_block_size(extended_domain_size) != block_size:
+            return True
+        num_levels = MinimumSparseTable.compute_num_levels(
+            math.ceil(domain_size / block_size)
+        )
+        extended_num_levels = MinimumSparseTable.compute_num_levels(
+            math.ceil(extended_domain_size / block_size)
+        )
+        return extended_num_levels != num_levels
 
     def generate_querier(
         self, domain: Domain, query: RangeQuery
@@ -135,6 +200,57 @@ class MinimumLinearEMT(
         )
 
 
+def block_minimums_of(points: Sequence[int], block_size: int) -> Iterator[int]:
+    """
+    Yields the minimum of each block of :paramref:`block_size` consecutive
+    points (the last block may be smaller).
+
+    :param points: the values of the points
+    :param block_size: the number of points in each block
+    :return: an iterator over the minimum of each block
+    """
+    for start in range(0, len(points), block_size):
+        yield min(points[start : start + block_size])
+
+
+def lookup_table_entries(
+    points: Sequence[int], first_index: int, block_size: int, left_start: int
+) -> Iterator[Tuple[Tuple[int, int, int], int]]:
+    """
+    Yields the entries of the lookup tables of :class:`MinimumLinearEMT`
+    over the given points.
+
+    :param points: the values of the points :code:`first_index, ...`, where
+        :paramref:`first_index` must be the start of a block
+    :param first_index: the index of the first point in :paramref:`points`
+    :param block_size: the number of points in each block
+    :param left_start: the index from which to yield the entries of the
+        left-sided lookup table; entries before it are skipped
+    :return: an iterator over the entries of both lookup tables
+    """
+    for start in range(0, len(points), block_size):
+        block = points[start : start + block_size]
+
+        # Fixed LEFT, moving RIGHT (and vice versa):
+        lookup_left = itertools.accumulate(block, min)
+        lookup_right = reversed(list(itertools.accumulate(reversed(block), min)))
+        for offset, value in enumerate(lookup_left):
+            index = first_index + start + offset
+            if index >= left_start:
+                yield (
+                    MinimumLinearEMTTableID.LOOKUP_LEFT,
+                    index,
+                    LOOKUP_THIRD_ELEMENT,
+                ), value
+        for offset, value in enumerate(lookup_right):
+            index = first_index + start + offset
+            yield (
+                MinimumLinearEMTTableID.LOOKUP_RIGHT,
+                index,
+                LOOKUP_THIRD_ELEMENT,
+            ), value
+
+
 class MinimumLinearEMTQuerier(RangeAggregateQuerier[Tuple[int, int, int], int]):
     """
     Associated querier for the :class:`MinimumSparseTable` scheme.
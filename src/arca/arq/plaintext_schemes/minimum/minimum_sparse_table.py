@@ -16,82 +16,111 @@
 
 from __future__ import annotations
 
-from ...range_aggregate_scheme import RangeAggregateScheme
+from ...range_aggregate_scheme import (
+    AppendableRangeAggregateScheme,
+    check_extended_domain,
+)
 from ...range_aggregate_querier import (
     RangeAggregateQuerier,
     ResolveDone,
 )
 from ...table import Table
+from ...columnar_table import as_integer_array
+from ...array_mapping import LevelArrayMapping
 from ...domain import Domain
 from ...range_query import RangeQuery
-from ....util.math import log2_ceil, log2_floor
+from ....util.math import log2_floor
 
-from typing import Deque, Dict, Iterable, Iterator, List, Tuple
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
 from dataclasses import dataclass
 
-import collections
+import numpy as np
 
 
 class MinimumSparseTable(
-    RangeAggregateScheme[Dict[Tuple[int, int], int], Tuple[int, int], int]
+    AppendableRangeAggregateScheme[LevelArrayMapping[int], Tuple[int, int], int]
 ):
     """
     Implements the one-dimensional sparse table technique for range minimum
     queries from [BFPSS05].
+
+    Level :code:`power` of the table stores, at each index :code:`i`, the
+    minimum over the "left-hanging" window of size :code:`2**power` ending
+    at :code:`i` (i.e., the points
+    :code:`max(i - 2**power + 1, 0), ..., i`).
+
+    Appending records only adds the windows ending at the new domain
+    values, unless the table needs a new level (i.e. the size of the domain
+    reaches a power of two), in which case the table is rebuilt.
     """
 
-    def setup(self, table: Table) -> Dict[Tuple[int, int], int]:
-        ending_power_of_2 = log2_ceil(table.domain.size())
-        sparse_table_ds = {}
-        table_points = list(
-            table.iterate_over_unique_domain_points(
-                lambda lst: min(lst) if len(lst) > 0 else 0
+    def setup(self, table: Table) -> LevelArrayMapping[int]:
+        num_levels = MinimumSparseTable.compute_num_levels(table.domain.size())
+        table_points = as_integer_array(
+            list(table.iterate_over_unique_domain_points(point_minimum))
+        )
+
+        sparse_table = np.empty(
+            (num_levels, len(table_points)), dtype=table_points.dtype
+        )
+        sparse_table[0] = table_points
+        for power in range(1, num_levels):
+            # A window of size 2**power is the union of the two windows of
+            # size 2**(power - 1) ending at i and at i - 2**(power - 1):
+            shift = 2 ** (power - 1)
+            previous_level = sparse_table[power - 1]
+            sparse_table[power, :shift] = previous_level[:shift]
+            np.minimum(
+                previous_level[shift:],
+                previous_level[:-shift],
+                out=sparse_table[power, shift:],
             )
+
+        return LevelArrayMapping(sparse_table)
+
+    @staticmethod
+    def compute_num_levels(domain_size: int) -> int:
+        # Queries of length n read the level floor(log2(n)), so the levels
+        # must go up to that of a query over the whole domain:
+        return log2_floor(domain_size) + 1
+
+    def append_subqueries(
+        self, domain: Domain, extended_domain: Domain
+    ) -> List[Tuple[int, int]]:
+        check_extended_domain(domain, extended_domain)
+        num_levels = MinimumSparseTable.compute_num_levels(domain.size())
+        if MinimumSparseTable.compute_num_levels(extended_domain.size()) > num_levels:
+            return []
+        return sparse_table_suffix_subqueries(
+            domain.size(), extended_domain.size(), num_levels
         )
-        for power in range(ending_power_of_2):
-            range_size = 2**power
-            for index, minimum in enumerate(
-                self.__sliding_window_minimum(
-                    range_size,
-                    table_points,
-                )
-            ):
-                sparse_table_ds[(power, index)] = minimum
-
-        return sparse_table_ds
+
+    def append(
+        self,
+        domain: Domain,
+        extended_table: Table,
+        responses: Mapping[Tuple[int, int], int],
+    ) -> Iterator[Tuple[Tuple[int, int], int]]:
+        check_extended_domain(domain, extended_table.domain)
+        num_levels = MinimumSparseTable.compute_num_levels(domain.size())
+        extended_size = extended_table.domain.size()
+        if MinimumSparseTable.compute_num_levels(extended_size) > num_levels:
+            yield from self.setup(extended_table).items()
+            return
+
+        points = [
+            point_minimum(extended_table.filter(domain_value))
+            for domain_value in range(domain.end, extended_table.domain.end)
+        ]
+        yield from sparse_table_suffix(
+            points, domain.size(), extended_size, num_levels, responses
+        ).items()
 
     def generate_querier(
         self, domain: Domain, query: RangeQuery
     ) -> MinimumSparseTableQuerier:
         return MinimumSparseTableQuerier(domain=domain, initial_query=query)
 
-    def __sliding_window_minimum(
-        self, window_size: int, lst: Iterable[int]
-    ) -> Iterator[int]:
-        """
-        A iterator which takes the size of the window, `window_size`, and
-        an iterable, `lst`. Then returns an iterator such that the ith element
-        yielded is equal to min(list(lst)[max(i - window_size + 1, 0):i+1]).
-
-        Each yield takes amortized O(1) time, and overall the generator
-        requires O(window_size) space.
-
-        Source (licensed under the MIT License):
-        https://github.com/keegancsmith/Sliding-Window-Minimum/blob/master/sliding_window_minimum.py
-
-        :param window_size: the size of the window
-        :param lst: an iterable
-        :return: an iterator
-        """
-        window: Deque[Tuple[int, int]] = collections.deque()
-        for i, x in enumerate(lst):
-            while window and window[-1][0] >= x:
-                window.pop()
-            window.append((x, i))
-            while window[0][1] <= i - window_size:
-                window.popleft()
-            yield window[0][0]
-
 
 @dataclass(frozen=True)
 class MinimumSparseTableQuerier(RangeAggregateQuerier[Tuple[int, int], int]):
@@ -132,12 +161,12 @@ class MinimumSparseTableQuerier(RangeAggregateQuerier[Tuple[int, int], int]):
         #   B:        |________|
         #
         # For range_1_index, we want the window that corresponds to Window A.
-        # Recall that __sliding_window_minimum (used to generate the table in
-        # `setup`) uses what we call "left-hanging" windows (i.e. the initial
-        # elements of the sliding window iterator have the window "hanging
-        # off" of the left-side of the array. Thus, in this example, we should
-        # query index 3, since that corresponds to the window of size 2**2
-        # whose left-most point lines up with domain point 0:
+        # Recall that the table built in `setup` uses what we call
+        # "left-hanging" windows (i.e. the initial elements of each level
+        # have the window "hanging off" of the left-side of the array).
+        # Thus, in this example, we should query index 3, since that
+        # corresponds to the window of size 2**2 whose left-most point lines
+        # up with domain point 0:
         #
         #   0 + (2 ** 2) - 1 = 3
         #   ^      ^       ^
@@ -165,3 +194,74 @@ class MinimumSparseTableQuerier(RangeAggregateQuerier[Tuple[int, int], int]):
         if len(responses) <= 0:
             raise ValueError("responses cannot be empty")
         return ResolveDone(min(responses))
+
+
+def point_minimum(records: List[int]) -> int:
+    """
+    Returns the minimum of the records at a single domain point, or 0 if
+    there are none.
+
+    :param records: the records at the domain point
+    :return: the minimum
+    """
+    return min(records) if len(records) > 0 else 0
+
+
+def sparse_table_suffix_subqueries(
+    first_index: int, size: int, num_levels: int
+) -> List[Tuple[int, int]]:
+    """
+    Returns the entries of a sparse table (as built by
+    :class:`MinimumSparseTable`) over the points :code:`0, ...,
+    first_index - 1` that :func:`sparse_table_suffix` reads to extend it to
+    the points :code:`0, ..., size - 1`.
+
+    :param first_index: the index of the first new (or changed) point
+    :param size: the number of points in the extended table
+    :param num_levels: the number of levels of the table
+    :return: the :code:`(level, index)` keys of the entries to read
+    """
+    subqueries = []
+    for power in range(1, num_levels):
+        shift = 2 ** (power - 1)
+        for index in range(max(first_index - shift, 0), first_index):
+            if index + shift < size:
+                subqueries.append((power - 1, index))
+    return subqueries
+
+
+def sparse_table_suffix(
+    points: Sequence[int],
+    first_index: int,
+    size: int,
+    num_levels: int,
+    responses: Mapping[Tuple[int, int], int],
+) -> Dict[Tuple[int, int], int]:
+    """
+    Computes the entries of a sparse table (as built by
+    :class:`MinimumSparseTable`) at the indices :code:`first_index, ...,
+    size - 1`, i.e. the entries whose windows end at one of the given
+    points.
+
+    :param points: the values of the points :code:`first_index, ...,
+        size - 1`
+    :param first_index: the index of the first point in :paramref:`points`
+    :param size: the number of points in the table
+    :param num_levels: the number of levels of the table
+    :param responses: the entries returned by
+        :func:`sparse_table_suffix_subqueries`
+    :return: the computed entries, by :code:`(level, index)`
+    """
+    entries: Dict[Tuple[int, int], int] = {}
+    for index in range(first_index, size):
+        entries[(0, index)] = points[index - first_index]
+    for power in range(1, num_levels):
+        shift = 2 ** (power - 1)
+        for index in range(first_index, size):
+            value = entries[(power - 1, index)]
+            if index >= shift:
+                left_key = (power - 1, index - shift)
+                left = entries[left_key] if index - shift >= first_index else None
+                value = min(value, responses[left_key] if left is None else left)
+            entries[(power, index)] = value
+    return entries
@@ -0,0 +1,150 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from .minimum_sparse_table import MinimumSparseTable
+from ...range_aggregate_scheme_2d import RangeAggregateScheme2D
+from ...range_aggregate_querier import (
+    RangeAggregateQuerier,
+    ResolveDone,
+)
+from ...table_2d import Table2D
+from ...array_mapping import NDArrayMapping
+from ...domain_2d import Domain2D
+from ...range_query import RangeQuery
+from ...range_query_2d import RangeQuery2D
+from ....util.math import log2_floor
+
+from typing import Any, List, Tuple
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+
+class MinimumSparseTable2D(
+    RangeAggregateScheme2D[NDArrayMapping, Tuple[int, int, int, int], int]
+):
+    """
+    Implements the two-dimensional sparse table technique for range minimum
+    queries, i.e. a :class:`MinimumSparseTable` along each axis.
+
+    Level :code:`(power_x, power_y)` of the table stores, at each point
+    :code:`(i, j)`, the minimum over the "left-hanging" window of size
+    :code:`2**power_x` by :code:`2**power_y` whose corner farthest from the
+    origin is :code:`(i, j)`. Any rectangle is the union of four (possibly
+    overlapping) such windows.
+
+    The table has :code:`O(n m log(n) log(m))` entries for an :code:`n` by
+    :code:`m` grid, so it suits much smaller grids than
+    :class:`SumPrefix2D`, which has a single entry per point.
+    """
+
+    def setup(self, table: Table2D) -> NDArrayMapping:
+        table_points = table.reduce_points(np.minimum, 0)
+        size_x, size_y = table.domain.shape()
+        num_levels_x = MinimumSparseTable.compute_num_levels(size_x)
+        num_levels_y = MinimumSparseTable.compute_num_levels(size_y)
+
+        sparse_table = np.empty(
+            (num_levels_x, num_levels_y, size_x, size_y), dtype=table_points.dtype
+        )
+        sparse_table[0, 0] = table_points
+        for power_x in range(num_levels_x):
+            if power_x > 0:
+                extend_windows(
+                    sparse_table[power_x - 1, 0],
+                    2 ** (power_x - 1),
+                    0,
+                    sparse_table[power_x, 0],
+                )
+            for power_y in range(1, num_levels_y):
+                extend_windows(
+                    sparse_table[power_x, power_y - 1],
+                    2 ** (power_y - 1),
+                    1,
+                    sparse_table[power_x, power_y],
+                )
+
+        return NDArrayMapping(sparse_table)
+
+    def generate_querier(
+        self, domain: Domain2D, query: RangeQuery2D
+    ) -> MinimumSparseTable2DQuerier:
+        return MinimumSparseTable2DQuerier(domain=domain, initial_query=query)
+
+
+def extend_windows(
+    previous_level: npt.NDArray[Any], shift: int, axis: int, out: npt.NDArray[Any]
+) -> None:
+    """
+    Computes a level of a sparse table from the previous level along the
+    given axis: a window of size :code:`2 * shift` is the union of the two
+    windows of size :code:`shift` ending at :code:`i` and at :code:`i -
+    shift`.
+
+    :param previous_level: the windows of size :paramref:`shift`
+    :param shift: the size of the windows of the previous level
+    :param axis: the axis to double the windows along
+    :param out: the array to write the windows of size :code:`2 * shift` to
+    """
+    previous = np.moveaxis(previous_level, axis, 0)
+    current = np.moveaxis(out, axis, 0)
+    current[:shift] = previous[:shift]
+    np.minimum(previous[shift:], previous[:-shift], out=current[shift:])
+
+
+@dataclass(frozen=True)
+class MinimumSparseTable2DQuerier(
+    RangeAggregateQuerier[Tuple[int, int, int, int], int]
+):
+    """
+    Associated querier for the :class:`MinimumSparseTable2D` scheme.
+    """
+
+    domain: Domain2D
+    initial_query: RangeQuery2D
+
+    def query(self) -> List[Tuple[int, int, int, int]]:
+        power_x, indices_x = self.__windows(self.initial_query.x, self.domain.x.start)
+        power_y, indices_y = self.__windows(self.initial_query.y, self.domain.y.start)
+        # Queries one or two points wide need fewer than four windows:
+        return list(
+            dict.fromkeys(
+                (power_x, power_y, index_x, index_y)
+                for index_x in indices_x
+                for index_y in indices_y
+            )
+        )
+
+    def resolve(self, responses: List[int]) -> ResolveDone:
+        if len(responses) <= 0:
+            raise ValueError("responses cannot be empty")
+        return ResolveDone(min(responses))
+
+    @staticmethod
+    def __windows(range_query: RangeQuery, start: int) -> Tuple[int, List[int]]:
+        """
+        Returns the level and the (zero-indexed) ends of the two windows
+        covering the given range along one axis, as in
+        :class:`MinimumSparseTableQuerier`.
+        """
+        power = log2_floor(range_query.length())
+        first_end = range_query.start - start + 2**power - 1
+        second_end = range_query.end - start - 1
+        return power, [first_end, second_end]
@@ -22,23 +22,23 @@ from ...range_aggregate_querier import (
     ResolveDone,
 )
 from ...table import Table
+from ...columnar_table import ColumnarTable
+from ...array_mapping import LevelArrayMapping
 from ...domain import Domain
 from ...range_query import RangeQuery
 
 from ....util.math import log2_ceil
 
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, List, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
-from tqdm import trange
 
-import math
-import statistics
+import numpy as np
+import numpy.typing as npt
 
 
 class ModeASTable(
     RangeAggregateScheme[
-        Dict[Tuple[int, int], Tuple[int, int]], Tuple[int, int], Tuple[int, int]
+        LevelArrayMapping[Tuple[int, int]], Tuple[int, int], Tuple[int, int]
     ]
 ):
     """
@@ -68,56 +68,138 @@ class ModeASTable(
 
     (This is a really rough sketch that doesn't really capture everything,
     so you probably should read the paper for more details.)
+
+    Each point of a half-segment stores the running mode of the records
+    between it and the middle of the segment, along with the mode's count.
+    Every record is counted, so points holding several records contribute
+    their full histogram of values, and points without records contribute
+    nothing.
     """
 
-    def setup(self, table: Table) -> Dict[Tuple[int, int], Tuple[int, int]]:
-        as_table_ds: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    def setup(self, table: Table) -> LevelArrayMapping[Tuple[int, int]]:
+        columnar_table = ColumnarTable.from_table(table)
+        size = table.domain.size()
+        values, codes = np.unique(columnar_table.values, return_inverse=True)
+        codes = codes.reshape(-1).astype(np.int64)
 
-        ending_power_of_2 = log2_ceil(table.domain.size())
-        table_points = list(
-            table.iterate_over_unique_domain_points(
-                lambda lst: statistics.mode(lst)
-                if len(lst) > 0
-                else 0  # TODO(zespirit): this needs to output counts, not the mode
-            )
+        # Collapse the records into a histogram of the values at each point,
+        # as (point, code, count) triples ordered by point and then by code:
+        record_points = np.repeat(
+            np.arange(size, dtype=np.int64), np.diff(columnar_table.offsets)
         )
-        for power in trange(ending_power_of_2 + 1, leave=False):
-            range_size = 2**power
-            num_segments = math.ceil(table.domain.size() / range_size)
-
-            for segment_index in trange(num_segments, leave=False):
-                start = segment_index * range_size
-                end = min(start + range_size, table.domain.size())
-                halfway = min(start + int(range_size / 2), end)
+        num_codes = max(len(values), 1)
+        histogram, histogram_counts = np.unique(
+            record_points * num_codes + codes, return_counts=True
+        )
+        histogram_points = histogram // num_codes
+        histogram_codes = histogram % num_codes
 
-                ds1 = self.__running_mode(
-                    table_points, power, reversed(range(start, halfway))
-                )
-                ds2 = self.__running_mode(table_points, power, range(halfway, end))
-                as_table_ds = {**as_table_ds, **ds1, **ds2}
+        ending_power_of_2 = log2_ceil(table.domain.size())
+        as_table = np.zeros(
+            (ending_power_of_2 + 1, size, 2),
+            dtype=np.result_type(values.dtype, np.int64),
+        )
+        for power in range(ending_power_of_2 + 1):
+            # Levels 0 and 1 both consist of single-point half-segments:
+            half_size = max(2 ** (power - 1), 1)
+            mode_codes, mode_counts = self.__running_mode(
+                size, histogram_points, histogram_codes, histogram_counts, half_size
+            )
+            has_records = mode_counts > 0
+            as_table[power, has_records, 0] = values[mode_codes[has_records]]
+            as_table[power, :, 1] = mode_counts
 
-        return as_table_ds
+        return LevelArrayMapping(as_table)
 
     def generate_querier(self, domain: Domain, query: RangeQuery) -> ModeASTableQuerier:
         return ModeASTableQuerier(domain=domain, initial_query=query)
 
     def __running_mode(
-        self, table_points: List[int], level: int, iterator: Iterable[int]
-    ) -> Dict[Tuple[int, int], Tuple[int, int]]:
-        as_table_ds = {}
-
-        counts: Dict[int, int] = defaultdict(lambda: 0)
-        current_mode = 0
-        current_count = 0
-        for i in iterator:
-            value = table_points[i]
-            counts[value] += 1
-            if counts[value] > current_count:
-                current_mode = value
-                current_count = counts[value]
-            as_table_ds[(level, i)] = (current_mode, current_count)
+        self,
+        size: int,
+        histogram_points: npt.NDArray[np.int64],
+        histogram_codes: npt.NDArray[np.int64],
+        histogram_counts: npt.NDArray[np.intp],
+        half_size: int,
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Computes the running mode towards the middle of every segment of size
+        :code:`2 * half_size`, i.e., backwards over each left half and
+        forwards over each right half. Ties are broken in favor of the value
+        that reached the count first (and, within a point, in favor of the
+        smallest value).
+
+        :param size: the number of points
+        :param histogram_points: the point of each histogram entry
+        :param histogram_codes: integer codes identifying the value of each
+            histogram entry
+        :param histogram_counts: the number of records of each histogram
+            entry
+        :param half_size: the size of each half-segment
+        :return: for each point, the code of its running mode and the
+            running mode's count (0 if no records have been scanned yet)
+        """
+        num_entries = len(histogram_points)
+        entries = np.arange(num_entries)
+        halves = histogram_points // half_size
+        offsets = histogram_points % half_size
+        scan_offsets = np.where(halves % 2 == 0, half_size - 1 - offsets, offsets)
+
+        # Lay all of the histogram entries out in the order in which they are
+        # scanned:
+        scan_order = np.lexsort((histogram_codes, scan_offsets, halves))
+        scan_halves = halves[scan_order]
+        scan_codes = histogram_codes[scan_order]
+        scan_keys = scan_halves * half_size + scan_offsets[scan_order]
+
+        # Count how many times each value has been seen so far in its half:
+        group_order = np.lexsort((entries, scan_codes, scan_halves))
+        group_halves = scan_halves[group_order]
+        group_codes = scan_codes[group_order]
+        group_totals = np.cumsum(histogram_counts[scan_order][group_order])
+        is_group_start = np.ones(num_entries, dtype=bool)
+        is_group_start[1:] = (group_halves[1:] != group_halves[:-1]) | (
+            group_codes[1:] != group_codes[:-1]
+        )
+        group_starts = np.maximum.accumulate(np.where(is_group_start, entries, 0))
+        totals_before_group = np.zeros(num_entries, dtype=np.int64)
+        totals_before_group[1:] = group_totals[:-1]
+        scan_counts = np.empty(num_entries, dtype=np.int64)
+        scan_counts[group_order] = group_totals - totals_before_group[group_starts]
+
+        # Running maximum count, segmented by half. Shifting every half above
+        # all of the counts in the halves before it keeps the halves apart:
+        shift = scan_halves * (int(histogram_counts.sum()) + 1)
+        running_counts = np.maximum.accumulate(scan_counts + shift) - shift
+
+        # The running mode changes exactly when a count exceeds the previous
+        # running maximum (the first entry of each half always does):
+        previous_counts = np.zeros(num_entries, dtype=np.int64)
+        previous_counts[1:] = running_counts[:-1]
+        previous_counts[1:][scan_halves[1:] != scan_halves[:-1]] = 0
+        is_new_mode = scan_counts > previous_counts
+        last_new_mode = np.maximum.accumulate(np.where(is_new_mode, entries, 0))
+
+        # Each point takes the running mode after the last histogram entry
+        # scanned up to and including it within its half (points without
+        # records take the running mode of the points scanned before them):
+        points = np.arange(size, dtype=np.int64)
+        point_halves = points // half_size
+        point_offsets = points % half_size
+        point_keys = point_halves * half_size + np.where(
+            point_halves % 2 == 0, half_size - 1 - point_offsets, point_offsets
+        )
+        last_scanned = np.searchsorted(scan_keys, point_keys, side="right") - 1
+        has_scanned = last_scanned >= 0
+        has_scanned[has_scanned] = (
+            scan_halves[last_scanned[has_scanned]] == point_halves[has_scanned]
+        )
 
-        return as_table_ds
+        mode_codes = np.zeros(size, dtype=np.int64)
+        mode_codes[has_scanned] = scan_codes[last_new_mode[last_scanned[has_scanned]]]
+        mode_counts = np.zeros(size, dtype=np.int64)
+        mode_counts[has_scanned] = running_counts[last_scanned[has_scanned]]
+        return mode_codes, mode_counts
 
 
 @dataclass(frozen=True)
@@ -138,5 +220,9 @@ class ModeASTableQuerier(RangeAggregateQuerier[Tuple[int, int], Tuple[int, int]]
     def resolve(self, responses: List[Tuple[int, int]]) -> ResolveDone:
         if len(responses) <= 0:
             raise ValueError("responses cannot be empty")
-        maximal_mode_tuple = max(responses, key=lambda tup: tup[1])
-        return ResolveDone(maximal_mode_tuple[0])
+        # The halves of the segment are disjoint, so when both halves have
+        # the same mode, its count over the query is the sum of its counts:
+        counts: Dict[int, int] = {}
+        for mode, count in responses:
+            counts[mode] = counts.get(mode, 0) + count
+        return ResolveDone(max(counts, key=lambda mode: counts[mode]))
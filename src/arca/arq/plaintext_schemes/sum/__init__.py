@@ -14,6 +14,9 @@
 ## limitations under the License.
 ##
 
-__all__ = ["SumPrefix"]
+__all__ = ["MomentsPrefix", "SumFenwick", "SumPrefix", "SumPrefix2D"]
 
+from .moments_prefix import MomentsPrefix
+from .sum_fenwick import SumFenwick
 from .sum_prefix import SumPrefix
+from .sum_prefix_2d import SumPrefix2D
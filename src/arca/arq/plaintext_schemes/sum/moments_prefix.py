@@ -0,0 +1,134 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from ...range_aggregate_scheme import (
+    AppendableRangeAggregateScheme,
+    check_extended_domain,
+)
+from ...range_aggregate_querier import (
+    RangeAggregateQuerier,
+    ResolveDone,
+)
+from ...table import Table
+from ...columnar_table import ColumnarTable
+from ...array_mapping import TupleArrayMapping, is_safe_to_accumulate
+from ...domain import Domain
+from ...range_query import RangeQuery
+from ...moments import Moments
+
+from typing import Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+
+#: The (count, sum, sum of squares) of the records up to a domain value.
+MomentsTuple = Tuple[int, int, int]
+
+
+class MomentsPrefix(
+    AppendableRangeAggregateScheme[TupleArrayMapping[MomentsTuple], int, MomentsTuple]
+):
+    """
+    Implements one-dimensional prefix sums of the count, the sum and the sum
+    of squares of the records, stored together in each entry.
+
+    A single query (of at most two subqueries, as with :class:`SumPrefix`)
+    thus resolves to the :class:`Moments` of the range, from which its
+    count, sum, mean and variance all follow. The values are tuples of
+    three integers, so they can be stored with a fixed-width serializer
+    such as :code:`StructSerializer(format_string="qqq")`.
+    """
+
+    def setup(self, table: Table) -> TupleArrayMapping[MomentsTuple]:
+        columnar_table = ColumnarTable.from_table(table)
+        values = columnar_table.values
+
+        # Every partial sum of squares (and so every partial sum) must fit
+        # in the dtype, or else the records are kept as Python integers:
+        if not is_safe_to_accumulate(values, power=2):
+            values = values.astype(object)
+
+        # Since the records are sorted by domain value, the prefix sums at a
+        # domain value are the running sums of all records up to the end of
+        # that value's slice:
+        running_sums = np.zeros(len(values) + 1, dtype=values.dtype)
+        np.cumsum(values, out=running_sums[1:])
+        running_squares = np.zeros(len(values) + 1, dtype=values.dtype)
+        np.cumsum(values * values, out=running_squares[1:])
+
+        ends = columnar_table.offsets[1:]
+        return TupleArrayMapping(
+            start=table.domain.start,
+            array=np.stack(
+                [ends.astype(values.dtype), running_sums[ends], running_squares[ends]],
+                axis=1,
+            ),
+        )
+
+    def append_subqueries(self, domain: Domain, extended_domain: Domain) -> List[int]:
+        check_extended_domain(domain, extended_domain)
+        return [domain.end - 1]
+
+    def append(
+        self,
+        domain: Domain,
+        extended_table: Table,
+        responses: Mapping[int, MomentsTuple],
+    ) -> Iterator[Tuple[int, MomentsTuple]]:
+        check_extended_domain(domain, extended_table.domain)
+        count, total, sum_of_squares = responses[domain.end - 1]
+        for domain_value in range(domain.end, extended_table.domain.end):
+            records = extended_table.filter(domain_value)
+            count += len(records)
+            total += sum(records)
+            sum_of_squares += sum(record * record for record in records)
+            yield domain_value, (count, total, sum_of_squares)
+
+    def generate_querier(
+        self, domain: Domain, query: RangeQuery
+    ) -> MomentsPrefixQuerier:
+        return MomentsPrefixQuerier(domain=domain, initial_query=query)
+
+
+class MomentsPrefixQuerier(RangeAggregateQuerier[int, MomentsTuple]):
+    """
+    Associated querier for the :class:`MomentsPrefix` scheme.
+    """
+
+    def __init__(self, domain: Domain, initial_query: RangeQuery):
+        self.domain = domain
+        self.initial_query = initial_query
+
+    def query(self) -> List[int]:
+        start = self.initial_query.start - 1
+        end = self.initial_query.end - 1
+
+        queries = []
+        if start >= self.domain.start:
+            queries.append(start)
+        if end >= self.domain.start:
+            queries.append(end)
+        return queries
+
+    def resolve(self, responses: List[MomentsTuple]) -> ResolveDone:
+        moments = [Moments(*response) for response in responses]
+        if len(self.query()) > 1:
+            return ResolveDone(moments[1] - moments[0])
+        else:
+            return ResolveDone(moments[0])
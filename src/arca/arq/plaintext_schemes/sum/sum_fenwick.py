@@ -0,0 +1,147 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from ...range_aggregate_scheme import UpdatableRangeAggregateScheme
+from ...range_aggregate_querier import (
+    RangeAggregateQuerier,
+    ResolveDone,
+)
+from ...table import Table
+from ...columnar_table import ColumnarTable
+from ...array_mapping import ArrayMapping, is_safe_to_accumulate
+from ...domain import Domain
+from ...range_query import RangeQuery
+
+from typing import List
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+class SumFenwick(UpdatableRangeAggregateScheme[ArrayMapping, int, int]):
+    """
+    Implements one-dimensional range sums with a Fenwick tree (binary
+    indexed tree) [Fen94].
+
+    Numbering the domain points :code:`1, ..., n`, node :code:`i` of the
+    tree stores the sum of the records at points
+    :code:`i - lowbit(i) + 1, ..., i`, where :code:`lowbit(i)` is the lowest
+    set bit of :code:`i`. Both a range query and the change of a single
+    record touch at most :code:`log2(n) + 1` nodes per endpoint, so unlike
+    :class:`SumPrefix`, the structure can be updated without recomputing
+    it.
+    """
+
+    def setup(self, table: Table) -> ArrayMapping:
+        columnar_table = ColumnarTable.from_table(table)
+        values = columnar_table.values
+        if not is_safe_to_accumulate(values):
+            values = values.astype(object)
+
+        running_sums = np.zeros(len(values) + 1, dtype=values.dtype)
+        np.cumsum(values, out=running_sums[1:])
+        prefix_sums = np.zeros(table.domain.size() + 1, dtype=values.dtype)
+        prefix_sums[1:] = running_sums[columnar_table.offsets[1:]]
+
+        # Node i covers the points between prefixes i - lowbit(i) and i:
+        nodes = np.arange(1, table.domain.size() + 1)
+        return ArrayMapping(
+            start=1, array=prefix_sums[nodes] - prefix_sums[nodes - (nodes & -nodes)]
+        )
+
+    def generate_querier(self, domain: Domain, query: RangeQuery) -> SumFenwickQuerier:
+        return SumFenwickQuerier(domain=domain, initial_query=query)
+
+    def update_subqueries(self, domain: Domain, domain_value: int) -> List[int]:
+        if not domain.start <= domain_value < domain.end:
+            raise ValueError("domain value is outside of the domain")
+        return fenwick_update_nodes(domain_value - domain.start + 1, domain.size())
+
+    def update_responses(self, responses: List[int], delta: int) -> List[int]:
+        return [response + delta for response in responses]
+
+
+@dataclass(frozen=True)
+class SumFenwickQuerier(RangeAggregateQuerier[int, int]):
+    """
+    Associated querier for the :class:`SumFenwick` scheme.
+
+    A range sum is the difference of two prefix sums. The nodes shared by
+    both prefixes cancel out, so only the others are queried.
+    """
+
+    domain: Domain
+    initial_query: RangeQuery
+    #: Nodes whose values are added to the sum.
+    added_nodes: List[int] = field(init=False, compare=False)
+    #: Nodes whose values are subtracted from the sum.
+    subtracted_nodes: List[int] = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        end_nodes = fenwick_prefix_nodes(self.initial_query.end - self.domain.start)
+        start_nodes = fenwick_prefix_nodes(self.initial_query.start - self.domain.start)
+        shared_nodes = set(end_nodes).intersection(start_nodes)
+        object.__setattr__(
+            self,
+            "added_nodes",
+            [node for node in end_nodes if node not in shared_nodes],
+        )
+        object.__setattr__(
+            self,
+            "subtracted_nodes",
+            [node for node in start_nodes if node not in shared_nodes],
+        )
+
+    def query(self) -> List[int]:
+        return self.added_nodes + self.subtracted_nodes
+
+    def resolve(self, responses: List[int]) -> ResolveDone:
+        num_added = len(self.added_nodes)
+        return ResolveDone(sum(responses[:num_added]) - sum(responses[num_added:]))
+
+
+def fenwick_prefix_nodes(position: int) -> List[int]:
+    """
+    Returns the nodes of a Fenwick tree whose sum is the prefix sum of the
+    points :code:`1, ..., position`.
+
+    :param position: the last point of the prefix, or 0 for an empty prefix
+    :return: the nodes, in decreasing order
+    """
+    nodes = []
+    while position > 0:
+        nodes.append(position)
+        position -= position & -position
+    return nodes
+
+
+def fenwick_update_nodes(position: int, size: int) -> List[int]:
+    """
+    Returns the nodes of a Fenwick tree over :paramref:`size` points that
+    cover the given point.
+
+    :param position: the point, between 1 and :paramref:`size`
+    :param size: the number of points in the tree
+    :return: the nodes, in increasing order
+    """
+    nodes = []
+    while 0 < position <= size:
+        nodes.append(position)
+        position += position & -position
+    return nodes
@@ -16,32 +16,60 @@
 
 from __future__ import annotations
 
-from ...range_aggregate_scheme import RangeAggregateScheme
+from ...range_aggregate_scheme import (
+    AppendableRangeAggregateScheme,
+    check_extended_domain,
+)
 from ...range_aggregate_querier import (
     RangeAggregateQuerier,
     ResolveDone,
 )
 from ...table import Table
+from ...columnar_table import ColumnarTable
+from ...array_mapping import ArrayMapping, is_safe_to_accumulate
 from ...domain import Domain
 from ...range_query import RangeQuery
 
-from typing import Dict, List
-from tqdm import tqdm, trange
+from typing import Iterator, List, Mapping, Tuple
+
+import numpy as np
 
 
-class SumPrefix(RangeAggregateScheme[Dict[int, int], int, int]):
+class SumPrefix(AppendableRangeAggregateScheme[ArrayMapping, int, int]):
     """
     Implements one-dimensional prefix sums.
+
+    Appending records only adds the prefix sums of the new domain values,
+    which continue from the last prefix sum of the original table.
     """
 
-    def setup(self, table: Table) -> Dict[int, int]:
-        running_sum = 0
-        prefix_mapping = {}
-        for domain_value in trange(table.domain.start, table.domain.end, leave=True):
-            sum_at_value = sum(table.filter(domain_value))
-            running_sum += sum_at_value
-            prefix_mapping[domain_value] = running_sum
-        return prefix_mapping
+    def setup(self, table: Table) -> ArrayMapping:
+        columnar_table = ColumnarTable.from_table(table)
+        values = columnar_table.values
+        if not is_safe_to_accumulate(values):
+            values = values.astype(object)
+
+        # Since the records are sorted by domain value, the prefix sum at a
+        # domain value is the running sum of all records up to the end of
+        # that value's slice:
+        running_sums = np.zeros(len(values) + 1, dtype=values.dtype)
+        np.cumsum(values, out=running_sums[1:])
+        return ArrayMapping(
+            start=table.domain.start, array=running_sums[columnar_table.offsets[1:]]
+        )
+
+    def append_subqueries(self, domain: Domain, extended_domain: Domain) -> List[int]:
+        check_extended_domain(domain, extended_domain)
+        return [domain.end - 1]
+
+    def append(
+        self, domain: Domain, extended_table: Table, responses: Mapping[int, int]
+    ) -> Iterator[Tuple[int, int]]:
+        check_extended_domain(domain, extended_table.domain)
+        running_sum = responses[domain.end - 1]
+        for domain_value in range(domain.end, extended_table.domain.end):
+            running_sum += sum(extended_table.filter(domain_value))
+            yield domain_value, running_sum
 
     def generate_querier(self, domain: Domain, query: RangeQuery) -> SumPrefixQuerier:
         return SumPrefixQuerier(domain=domain, initial_query=query)
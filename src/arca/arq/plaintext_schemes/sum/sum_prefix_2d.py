@@ -0,0 +1,95 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from ...range_aggregate_scheme_2d import RangeAggregateScheme2D
+from ...range_aggregate_querier import (
+    RangeAggregateQuerier,
+    ResolveDone,
+)
+from ...table_2d import Table2D
+from ...array_mapping import NDArrayMapping, is_safe_to_accumulate
+from ...domain_2d import Domain2D
+from ...range_query_2d import RangeQuery2D
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+class SumPrefix2D(RangeAggregateScheme2D[NDArrayMapping, Tuple[int, int], int]):
+    """
+    Implements two-dimensional prefix sums (summed-area tables).
+
+    The entry at :code:`(i, j)` is the sum of the records at every point
+    whose coordinates are at most :code:`(domain.x.start + i, domain.y.start
+    + j)`, so the sum over any rectangle follows from (at most) four
+    entries by inclusion-exclusion.
+    """
+
+    def setup(self, table: Table2D) -> NDArrayMapping:
+        # Every prefix sum adds up a subset of the records, so it is enough
+        # to bound the records themselves:
+        if is_safe_to_accumulate(table.values):
+            point_sums = table.reduce_points(np.add, 0)
+        else:
+            point_sums = table.reduce_points(np.add, 0, dtype=object)
+
+        prefix_sums = np.cumsum(np.cumsum(point_sums, axis=0), axis=1)
+        return NDArrayMapping(prefix_sums)
+
+    def generate_querier(
+        self, domain: Domain2D, query: RangeQuery2D
+    ) -> SumPrefix2DQuerier:
+        return SumPrefix2DQuerier(domain=domain, initial_query=query)
+
+
+class SumPrefix2DQuerier(RangeAggregateQuerier[Tuple[int, int], int]):
+    """
+    Associated querier for the :class:`SumPrefix2D` scheme.
+    """
+
+    def __init__(self, domain: Domain2D, initial_query: RangeQuery2D):
+        self.domain = domain
+        self.initial_query = initial_query
+
+        x_start = initial_query.x.start - domain.x.start - 1
+        x_end = initial_query.x.end - domain.x.start - 1
+        y_start = initial_query.y.start - domain.y.start - 1
+        y_end = initial_query.y.end - domain.y.start - 1
+
+        #: The entries to add or subtract (by inclusion-exclusion), with the
+        #: sign of each. Entries with a negative index are prefix sums over
+        #: no points and are left out.
+        self.signed_subqueries: List[Tuple[Tuple[int, int], int]] = [
+            ((x, y), x_sign * y_sign)
+            for x, x_sign in [(x_end, 1), (x_start, -1)]
+            for y, y_sign in [(y_end, 1), (y_start, -1)]
+            if x >= 0 and y >= 0
+        ]
+
+    def query(self) -> List[Tuple[int, int]]:
+        return [subquery for subquery, _ in self.signed_subqueries]
+
+    def resolve(self, responses: List[int]) -> ResolveDone:
+        return ResolveDone(
+            sum(
+                sign * response
+                for (_, sign), response in zip(self.signed_subqueries, responses)
+            )
+        )
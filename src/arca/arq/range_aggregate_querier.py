@@ -15,6 +15,8 @@
 ##
 
 
+from .moments import Moments
+
 from abc import ABC, abstractmethod
 from typing import TypeVar, List, Generic, Union
 from dataclasses import dataclass
@@ -22,10 +24,14 @@ from fractions import Fraction
 from decimal import Decimal
 
 
+#: The result of an aggregate range query.
+Aggregate = Union[int, float, Fraction, Decimal, Moments]
+
+
 @dataclass(frozen=True)
 class ResolveDone:
     __slots__ = ["aggregate"]
-    aggregate: Union[int, float, Fraction, Decimal]
+    aggregate: Aggregate
 
 
 ResolveDSQueryType = TypeVar("ResolveDSQueryType")
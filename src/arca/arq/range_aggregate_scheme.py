@@ -21,7 +21,7 @@ from .domain import Domain
 
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import Any, Generic, Iterator, List, Mapping, Tuple, TypeVar
 
 
 DSType = TypeVar("DSType")
@@ -42,6 +42,24 @@ class RangeAggregateScheme(ABC, Generic[DSType, DSQueryType, DSResponseType]):
         """
         ...
 
+    def setup_stream(self, table: Table) -> Iterator[Tuple[Any, Any]]:
+        r"""
+        Corresponds to the :math:`\mathbb{S}` algorithm, but yields the
+        (key, value) entries of the plaintext data structure one at a time
+        instead of returning the whole structure.
+
+        By default, this iterates over the output of :func:`setup`. Schemes
+        override it to produce their entries without building a
+        :code:`dict` of the whole structure first.
+
+        :param table: the :class:`Table` to compute the data structure over
+        :return: an iterator over the entries of the data structure
+        """
+        ds = self.setup(table)
+        if not isinstance(ds, Mapping):
+            raise TypeError(f"{type(self).__name__} does not produce a mapping")
+        yield from ds.items()
+
     @abstractmethod
     def generate_querier(
         self, domain: Domain, query: RangeQuery
@@ -50,3 +68,100 @@ class RangeAggregateScheme(ABC, Generic[DSType, DSQueryType, DSResponseType]):
         Corresponds to the :math:`\mathbb{Q}` algorithm.
         """
         ...
+
+
+class UpdatableRangeAggregateScheme(
+    RangeAggregateScheme[DSType, DSQueryType, DSResponseType]
+):
+    """
+    Interface for plaintext aggregate range query schemes whose data
+    structure can be updated in place when a record is added to (or removed
+    from) the underlying :class:`Table`, by changing only a few entries.
+    """
+
+    @abstractmethod
+    def update_subqueries(self, domain: Domain, domain_value: int) -> List[DSQueryType]:
+        """
+        Returns the keys of the entries of the data structure that change
+        when a record at the given domain value changes.
+
+        :param domain: the :class:`Domain` of the underlying :class:`Table`
+        :param domain_value: the domain value of the record
+        :return: the keys of the affected entries
+        """
+        ...
+
+    @abstractmethod
+    def update_responses(
+        self, responses: List[DSResponseType], delta: int
+    ) -> List[DSResponseType]:
+        """
+        Computes the new values of the entries returned by
+        :func:`update_subqueries` after a record of value :paramref:`delta`
+        is added (or, if negative, the record of value :code:`-delta` is
+        removed).
+
+        :param responses: the current values of the affected entries
+        :param delta: the value of the record being added
+        :return: the new values of the affected entries, in the same order
+        """
+        ...
+
+
+class AppendableRangeAggregateScheme(
+    RangeAggregateScheme[DSType, DSQueryType, DSResponseType]
+):
+    """
+    Interface for plaintext aggregate range query schemes whose data
+    structure can be extended when records are appended past the end of
+    the domain (see :func:`Table.extend`), by computing only the entries
+    that are new or that change.
+    """
+
+    @abstractmethod
+    def append_subqueries(
+        self, domain: Domain, extended_domain: Domain
+    ) -> List[DSQueryType]:
+        """
+        Returns the keys of the existing entries of the data structure that
+        :func:`append` needs to read.
+
+        :param domain: the :class:`Domain` of the original :class:`Table`
+        :param extended_domain: the :class:`Domain` of the extended
+            :class:`Table`
+        :return: the keys of the entries to read
+        """
+        ...
+
+    @abstractmethod
+    def append(
+        self,
+        domain: Domain,
+        extended_table: Table,
+        responses: Mapping[DSQueryType, DSResponseType],
+    ) -> Iterator[Tuple[DSQueryType, DSResponseType]]:
+        """
+        Yields the entries of the data structure of the extended table
+        that are not entries of the data structure of the original table.
+        Together with the unchanged entries of the original data structure,
+        they make up the output of :func:`setup` on the extended table.
+
+        :param domain: the :class:`Domain` of the original :class:`Table`
+        :param extended_table: the extended :class:`Table`
+        :param responses: the existing entries with the keys returned by
+            :func:`append_subqueries`
+        :return: an iterator over the new and changed entries
+        """
+        ...
+
+
+def check_extended_domain(domain: Domain, extended_domain: Domain) -> None:
+    """
+    Checks that :paramref:`extended_domain` extends :paramref:`domain` past
+    its end, as :func:`Table.extend` does.
+
+    :param domain: the original domain
+    :param extended_domain: the extended domain
+    """
+    if extended_domain.start != domain.start or extended_domain.end < domain.end:
+        raise ValueError("domain must be extended past its end")
@@ -0,0 +1,73 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from .range_query_2d import RangeQuery2D
+from .range_aggregate_querier import RangeAggregateQuerier
+from .table_2d import Table2D
+from .domain_2d import Domain2D
+
+from abc import ABC, abstractmethod
+from typing import Any, Generic, Iterator, Mapping, Tuple, TypeVar
+
+
+DSType = TypeVar("DSType")
+DSQueryType = TypeVar("DSQueryType")
+DSResponseType = TypeVar("DSResponseType")
+
+
+class RangeAggregateScheme2D(ABC, Generic[DSType, DSQueryType, DSResponseType]):
+    r"""
+    Interface for plaintext aggregate range query schemes over
+    two-dimensional tables; the counterpart of :class:`RangeAggregateScheme`
+    for :class:`Table2D`, :class:`Domain2D` and :class:`RangeQuery2D`.
+
+    The queriers that these schemes generate are ordinary
+    :class:`RangeAggregateQuerier` objects, so :class:`ARQ` runs them in the
+    same way as those of one-dimensional schemes.
+    """
+
+    @abstractmethod
+    def setup(self, table: Table2D) -> DSType:
+        r"""
+        Corresponds to the :math:`\mathbb{S}` algorithm.
+        """
+        ...
+
+    def setup_stream(self, table: Table2D) -> Iterator[Tuple[Any, Any]]:
+        r"""
+        Corresponds to the :math:`\mathbb{S}` algorithm, but yields the
+        (key, value) entries of the plaintext data structure one at a time;
+        see :func:`RangeAggregateScheme.setup_stream`.
+
+        :param table: the :class:`Table2D` to compute the data structure over
+        :return: an iterator over the entries of the data structure
+        """
+        ds = self.setup(table)
+        if not isinstance(ds, Mapping):
+            raise TypeError(f"{type(self).__name__} does not produce a mapping")
+        yield from ds.items()
+
+    @abstractmethod
+    def generate_querier(
+        self, domain: Domain2D, query: RangeQuery2D
+    ) -> RangeAggregateQuerier[DSQueryType, DSResponseType]:
+        r"""
+        Corresponds to the :math:`\mathbb{Q}` algorithm.
+        """
+        ...
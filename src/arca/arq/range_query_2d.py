@@ -0,0 +1,53 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from .range_query import RangeQuery
+from .domain_2d import Domain2D
+
+from dataclasses import dataclass
+from typing import Iterator
+
+
+@dataclass(frozen=True)
+class RangeQuery2D:
+    """
+    Represents a two-dimensional range query: the product of a
+    :class:`RangeQuery` along each axis.
+    """
+
+    __slots__ = ["x", "y"]
+
+    #: Range along the first axis.
+    x: RangeQuery
+    #: Range along the second axis.
+    y: RangeQuery
+
+    def area(self) -> int:
+        """
+        Returns the number of points contained within the query.
+
+        :return: the area of the :class:`RangeQuery2D`
+        """
+        return self.x.length() * self.y.length()
+
+    @staticmethod
+    def enumerate_all(domain: Domain2D) -> Iterator[RangeQuery2D]:
+        for x_query in RangeQuery.enumerate_all(domain.x):
+            for y_query in RangeQuery.enumerate_all(domain.y):
+                yield RangeQuery2D(x=x_query, y=y_query)
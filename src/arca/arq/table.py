@@ -16,9 +16,18 @@
 
 from __future__ import annotations
 
-from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Tuple,
+)
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import ChainMap, defaultdict
 
 from .range_query import RangeQuery
 from .domain import Domain
@@ -34,7 +43,7 @@ class Table:
     """
 
     __slots__ = ["entries", "domain"]
-    entries: Dict[int, List[int]]
+    entries: Mapping[int, List[int]]
     domain: Domain
 
     def number_of_filled_domain_points(self) -> int:
@@ -65,7 +74,7 @@ class Table:
         """
         result: List[int] = []
         for domain_value in range(range_query.start, range_query.end):
-            result = result + self.filter(domain_value)
+            result.extend(self.filter(domain_value))
         return result
 
     def iterate_over_unique_domain_points(
@@ -74,6 +83,45 @@ class Table:
         for domain_value in range(self.domain.start, self.domain.end):
             yield disambiguator(self.filter(domain_value))
 
+    def extend(self, records: Iterable[Tuple[int, int]]) -> Table:
+        r"""
+        Makes a table holding the records of this table followed by the
+        given records, which must all lie after the end of this table's
+        domain (e.g. records with newer timestamps). The domain of the new
+        table is extended to cover them.
+
+        The records of this table are shared with the new table rather than
+        copied: the entries of an extended table are a
+        :class:`~collections.ChainMap` of layers, and a layer is only merged
+        into a newer one once the newer one is at least as large. Over any
+        sequence of appends, each record is thus copied :math:`O(\log n)`
+        times, and lookups go through :math:`O(\log n)` layers.
+
+        :param records: the records to append
+        :return: a new :class:`Table`
+        """
+        mapping: Dict[int, List[int]] = defaultdict(list)
+        for attr1, attr2 in records:
+            if attr1 < self.domain.end:
+                raise ValueError("records must lie after the end of the domain")
+            mapping[attr1].append(attr2)
+        if len(mapping) <= 0:
+            return self
+
+        layer: Dict[int, List[int]] = dict(mapping)
+        older_layers: List[MutableMapping[int, List[int]]]
+        if isinstance(self.entries, ChainMap):
+            older_layers = list(self.entries.maps)
+        elif isinstance(self.entries, MutableMapping):
+            older_layers = [self.entries]
+        else:
+            older_layers = [dict(self.entries)]
+        while len(older_layers) > 0 and len(older_layers[0]) <= len(layer):
+            layer = {**older_layers.pop(0), **layer}
+        entries = ChainMap(layer, *older_layers)
+        domain = Domain(start=self.domain.start, end=max(mapping.keys()) + 1)
+        return Table(entries=entries, domain=domain)
+
     @staticmethod
     def make(records: Iterable[Tuple[int, int]]) -> Table:
         """
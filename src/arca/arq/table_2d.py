@@ -0,0 +1,203 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from .domain import Domain
+from .domain_2d import Domain2D
+from .range_query_2d import RangeQuery2D
+from .columnar_table import as_integer_array
+
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+@dataclass(frozen=True, eq=False)
+class Table2D:
+    """
+    Represents a collection of records located at the points of a
+    two-dimensional :class:`Domain2D`, e.g. records with a location and a
+    timestamp.
+
+    Like a :class:`ColumnarTable`, the records are stored in a single array
+    sorted by point (in row-major order, i.e. by the first coordinate and
+    then by the second), together with a CSR-style array of offsets such
+    that the records located at point :code:`(domain.x.start + i,
+    domain.y.start + j)` are exactly :code:`values[offsets[k]:offsets[k +
+    1]]` for :code:`k = i * domain.y.size() + j`.
+    """
+
+    __slots__ = ["domain", "values", "offsets"]
+
+    #: The grid of points that the records are located at.
+    domain: Domain2D
+    #: The records, sorted by point (stable with respect to the order in
+    #: which records were given to :func:`make`).
+    values: npt.NDArray[Any]
+    #: Array of length :code:`domain.size() + 1` delimiting the records at
+    #: each point.
+    offsets: npt.NDArray[np.int64]
+
+    def number_of_records(self) -> int:
+        return len(self.values)
+
+    def filter(self, x: int, y: int) -> List[int]:
+        """
+        Returns all of the records located at the given point.
+
+        :param x: the first coordinate of the point
+        :param y: the second coordinate of the point
+        :return: a List of all records located at the point
+        """
+        if not (
+            self.domain.x.start <= x < self.domain.x.end
+            and self.domain.y.start <= y < self.domain.y.end
+        ):
+            return []
+        index = (x - self.domain.x.start) * self.domain.y.size() + (
+            y - self.domain.y.start
+        )
+        records: List[int] = self.values[
+            self.offsets[index] : self.offsets[index + 1]
+        ].tolist()
+        return records
+
+    def filter_range(self, range_query: RangeQuery2D) -> List[int]:
+        """
+        Returns all of the records contained in the given range_query.
+
+        :param range_query: the range to filter over
+        :return: a List of all records matching the filter
+        """
+        x_start = max(range_query.x.start, self.domain.x.start)
+        x_end = min(range_query.x.end, self.domain.x.end)
+        y_start = max(range_query.y.start, self.domain.y.start) - self.domain.y.start
+        y_end = min(range_query.y.end, self.domain.y.end) - self.domain.y.start
+
+        records: List[int] = []
+        if y_start >= y_end:
+            return records
+        for x in range(x_start - self.domain.x.start, x_end - self.domain.x.start):
+            # The records of each row of the range are contiguous:
+            row = x * self.domain.y.size()
+            records.extend(
+                self.values[
+                    self.offsets[row + y_start] : self.offsets[row + y_end]
+                ].tolist()
+            )
+        return records
+
+    def reduce_points(
+        self, ufunc: np.ufunc, empty_value: int, dtype: Optional[npt.DTypeLike] = None
+    ) -> npt.NDArray[Any]:
+        """
+        Reduces the records at each point with the given NumPy ufunc (e.g.
+        :code:`np.add` or :code:`np.minimum`).
+
+        :param ufunc: the ufunc to reduce the records of each point with
+        :param empty_value: the value of points without records
+        :param dtype: the dtype to reduce in, by default that of the records
+            (at least 64-bit)
+        :return: an array of shape :code:`domain.shape()` holding the
+            reduction at each point
+        """
+        if dtype is None:
+            dtype = np.result_type(self.values.dtype, np.int64)
+        reduced = np.full(self.domain.size(), empty_value, dtype=dtype)
+        counts = np.diff(self.offsets)
+        filled_points = np.flatnonzero(counts)
+        if len(filled_points) > 0:
+            reduced[filled_points] = ufunc.reduceat(
+                self.values.astype(dtype, copy=False), self.offsets[filled_points]
+            )
+        return reduced.reshape(self.domain.shape())
+
+    @staticmethod
+    def make(records: Iterable[Tuple[int, int, int]]) -> Table2D:
+        """
+        Makes a table from the :code:`(x, y, value)` records in the given
+        iterator.
+
+        :param records: the records to generate the :class:`Table2D` from
+        :return: a new :class:`Table2D`
+        """
+        records = list(records)
+        return Table2D.from_arrays(
+            np.array([record[0] for record in records], dtype=np.int64),
+            np.array([record[1] for record in records], dtype=np.int64),
+            as_integer_array([record[2] for record in records]),
+        )
+
+    @staticmethod
+    def make_from_grid(grid: Sequence[Sequence[int]]) -> Table2D:
+        """
+        Makes a table with a single record at each point of the given grid,
+        where :code:`grid[x][y]` is the record at point :code:`(x, y)`.
+
+        :param grid: the records, as a list of rows of equal length
+        :return: a new :class:`Table2D`
+        """
+        values = as_integer_array([value for row in grid for value in row])
+        values = values.reshape(len(grid), -1)
+        xs, ys = np.indices(values.shape, dtype=np.int64)
+        return Table2D.from_arrays(xs.reshape(-1), ys.reshape(-1), values.reshape(-1))
+
+    @staticmethod
+    def from_arrays(
+        xs: npt.NDArray[np.int64],
+        ys: npt.NDArray[np.int64],
+        values: npt.NDArray[Any],
+        domain: Optional[Domain2D] = None,
+    ) -> Table2D:
+        """
+        Makes a table from parallel arrays of coordinates and records
+        without creating a Python object per record.
+
+        :param xs: the first coordinate of each record
+        :param ys: the second coordinate of each record
+        :param values: the records
+        :param domain: the domain of the table; by default, the smallest
+            domain containing every record
+        :return: a new :class:`Table2D`
+        """
+        if domain is None:
+            domain = Domain2D(
+                x=Domain(start=int(xs.min()), end=int(xs.max()) + 1),
+                y=Domain(start=int(ys.min()), end=int(ys.max()) + 1),
+            )
+        in_domain = (
+            (domain.x.start <= xs)
+            & (xs < domain.x.end)
+            & (domain.y.start <= ys)
+            & (ys < domain.y.end)
+        )
+        positions = (xs[in_domain] - domain.x.start) * domain.y.size() + (
+            ys[in_domain] - domain.y.start
+        )
+
+        order = np.argsort(positions, kind="stable")
+        counts = np.bincount(positions, minlength=domain.size())
+        offsets = np.zeros(domain.size() + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        sorted_values = values[in_domain][order]
+        sorted_values.flags.writeable = False
+        offsets.flags.writeable = False
+        return Table2D(domain=domain, values=sorted_values, offsets=offsets)
@@ -0,0 +1,32 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+__all__ = [
+    "TableSpec",
+    "QuerySpec",
+    "BenchmarkCase",
+    "AGGREGATE_SCHEMES",
+    "EDS_SCHEMES",
+    "generate_table",
+    "run_case",
+    "run_benchmark",
+    "main",
+]
+
+from .workloads import TableSpec, generate_table
+from .schemes import AGGREGATE_SCHEMES, EDS_SCHEMES
+from .runner import BenchmarkCase, QuerySpec, run_benchmark, run_case
+from .cli import main
@@ -0,0 +1,137 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from .runner import QuerySpec, run_benchmark
+from .schemes import AGGREGATE_SCHEMES, EDS_SCHEMES
+from .workloads import DISTRIBUTIONS, TableSpec
+
+from typing import List, Optional
+
+import argparse
+import json
+import sys
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the benchmark suite from the command line and writes its report
+    as JSON.
+
+    :param argv: the command line arguments, excluding the program name
+    :return: the exit status
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m arca.bench",
+        description=(
+            "Benchmarks ARQ setup, loading and querying over a synthetic table "
+            "for each combination of plaintext and encrypted dictionary scheme."
+        ),
+    )
+    parser.add_argument(
+        "--aggregate",
+        action="append",
+        choices=list(AGGREGATE_SCHEMES),
+        help="plaintext scheme to benchmark (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--eds",
+        action="append",
+        choices=list(EDS_SCHEMES),
+        help="encrypted dictionary scheme to benchmark (repeatable; default: all)",
+    )
+    parser.add_argument("--domain-size", type=int, default=TableSpec.domain_size)
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=TableSpec.density,
+        help="fraction of domain points holding records",
+    )
+    parser.add_argument(
+        "--records-per-point", type=int, default=TableSpec.records_per_point
+    )
+    parser.add_argument(
+        "--distribution", choices=DISTRIBUTIONS, default=TableSpec.distribution
+    )
+    parser.add_argument("--max-value", type=int, default=TableSpec.max_value)
+    parser.add_argument("--seed", type=int, default=TableSpec.seed)
+    parser.add_argument(
+        "--bucket-size",
+        type=int,
+        default=QuerySpec.bucket_size,
+        help="width of each bucket of query lengths, as a percentage of the domain",
+    )
+    parser.add_argument(
+        "--samples-per-bucket", type=int, default=QuerySpec.num_samples_per_bucket
+    )
+    parser.add_argument(
+        "--query-batch-size",
+        type=int,
+        default=QuerySpec.batch_size,
+        help="number of queries resolved together",
+    )
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument(
+        "--no-isolate",
+        action="store_true",
+        help="run every case in this process instead of a fresh one",
+    )
+    parser.add_argument(
+        "--output", "-o", help="file to write the report to (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        table = TableSpec(
+            domain_size=args.domain_size,
+            density=args.density,
+            records_per_point=args.records_per_point,
+            distribution=args.distribution,
+            max_value=args.max_value,
+            seed=args.seed,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if args.bucket_size <= 0 or args.samples_per_bucket < 0:
+        parser.error("bucket size must be positive")
+    if args.query_batch_size <= 0:
+        parser.error("query batch size must be positive")
+
+    report = run_benchmark(
+        table,
+        QuerySpec(
+            bucket_size=args.bucket_size,
+            num_samples_per_bucket=args.samples_per_bucket,
+            batch_size=args.query_batch_size,
+        ),
+        aggregates=args.aggregate,
+        eds_schemes=args.eds,
+        num_processes=args.processes,
+        isolate=not args.no_isolate,
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
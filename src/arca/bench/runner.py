@@ -0,0 +1,282 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from ..arq import ARQ, RangeQuery
+from .schemes import AGGREGATE_SCHEMES, EDS_SCHEMES
+from .workloads import TableSpec, generate_table
+
+from typing import Any, Dict, List, Optional, Sequence
+from dataclasses import asdict, dataclass, field
+from multiprocessing.connection import Connection
+
+import contextlib
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+import traceback
+
+import numpy as np
+
+
+#: Latency percentiles reported for each benchmark case.
+PERCENTILES = [50, 90, 99]
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    """
+    Describes the queries to run against each encrypted index, as sampled
+    by :func:`RangeQuery.enumerate_samples_from_buckets`.
+    """
+
+    #: Width of each bucket of query lengths, as a percentage of the domain.
+    bucket_size: int = 10
+    #: Number of queries sampled from each bucket.
+    num_samples_per_bucket: int = 10
+    #: Number of queries sent to :func:`ARQ.query_many` at once.
+    batch_size: int = 1
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """
+    A single (plaintext scheme, encrypted dictionary scheme) pair to
+    benchmark.
+    """
+
+    aggregate: str
+    eds: str
+    table: TableSpec = field(default_factory=TableSpec)
+    queries: QuerySpec = field(default_factory=QuerySpec)
+    #: Number of processes available to multiprocess schemes.
+    num_processes: int = 2
+
+
+def run_case(case: BenchmarkCase) -> Dict[str, Any]:
+    """
+    Runs :func:`ARQ.setup`, :func:`ARQ.load_eds` and a sample of queries for
+    the given case in the current process.
+
+    :param case: the case to benchmark
+    :return: a JSON-serializable summary of the measurements
+    """
+    aggregate_spec = AGGREGATE_SCHEMES[case.aggregate]
+    eds_scheme = EDS_SCHEMES[case.eds](
+        aggregate_spec.key_serializer,
+        aggregate_spec.value_serializer,
+        case.num_processes,
+    )
+    arq_scheme: ARQ[Any, Any, Any, Any] = ARQ(
+        eds_scheme=eds_scheme, aggregate_scheme=aggregate_spec.make_scheme()
+    )
+
+    table = generate_table(case.table)
+    random.seed(case.table.seed)
+    queries = [
+        query
+        for _, query in RangeQuery.enumerate_samples_from_buckets(
+            table.domain,
+            bucket_size=case.queries.bucket_size,
+            num_samples_per_bucket=case.queries.num_samples_per_bucket,
+        )
+    ]
+    baseline_rss = peak_rss_bytes()
+
+    key = arq_scheme.generate_key()
+    # Some schemes report progress on stdout, which is reserved for results:
+    with contextlib.redirect_stdout(sys.stderr):
+        start = time.perf_counter()
+        eds_serialized = arq_scheme.setup(key, table)
+        setup_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    eds = arq_scheme.load_eds(eds_serialized)
+    load_seconds = time.perf_counter() - start
+
+    latencies: List[float] = []
+    query_start = time.perf_counter()
+    for index in range(0, len(queries), case.queries.batch_size):
+        batch = queries[index : index + case.queries.batch_size]
+        start = time.perf_counter()
+        arq_scheme.query_many(key, table.domain, batch, eds)
+        latencies.extend([(time.perf_counter() - start) / len(batch)] * len(batch))
+    query_seconds = time.perf_counter() - query_start
+
+    num_records = table.number_of_records()
+    return {
+        "aggregate": case.aggregate,
+        "eds": case.eds,
+        "records": num_records,
+        "setup_seconds": setup_seconds,
+        "setup_records_per_second": _rate(num_records, setup_seconds),
+        "index_bytes": len(eds_serialized),
+        "load_seconds": load_seconds,
+        "queries": {
+            "count": len(queries),
+            "batch_size": case.queries.batch_size,
+            "seconds": query_seconds,
+            "queries_per_second": _rate(len(queries), query_seconds),
+            "latency_seconds": summarize_latencies(latencies),
+        },
+        "baseline_rss_bytes": baseline_rss,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def run_case_isolated(case: BenchmarkCase) -> Dict[str, Any]:
+    """
+    Runs :func:`run_case` in a freshly spawned process, so that its peak
+    resident set size is not inflated by earlier cases.
+
+    :param case: the case to benchmark
+    :return: the summary returned by :func:`run_case`
+    """
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case_in_child, args=(case, sender))
+    process.start()
+    sender.close()
+    try:
+        status, payload = receiver.recv()
+    except EOFError:
+        status, payload = "error", "benchmark process exited without a result"
+    finally:
+        process.join()
+        receiver.close()
+
+    if status != "ok":
+        raise RuntimeError(
+            f"benchmark of {case.aggregate} with {case.eds} failed:\n{payload}"
+        )
+    result: Dict[str, Any] = payload
+    return result
+
+
+def _run_case_in_child(case: BenchmarkCase, sender: Connection) -> None:
+    try:
+        sender.send(("ok", run_case(case)))
+    except BaseException:
+        sender.send(("error", traceback.format_exc()))
+    finally:
+        sender.close()
+
+
+def run_benchmark(
+    table: TableSpec,
+    queries: QuerySpec,
+    *,
+    aggregates: Optional[Sequence[str]] = None,
+    eds_schemes: Optional[Sequence[str]] = None,
+    num_processes: int = 2,
+    isolate: bool = True,
+) -> Dict[str, Any]:
+    """
+    Benchmarks every combination of the given plaintext and encrypted
+    dictionary schemes over the same synthetic table.
+
+    :param table: the table to benchmark over
+    :param queries: the queries to run against each encrypted index
+    :param aggregates: names from :data:`AGGREGATE_SCHEMES`, or
+        :py:const:`None` for all of them
+    :param eds_schemes: names from :data:`EDS_SCHEMES`, or :py:const:`None`
+        for all of them
+    :param num_processes: number of processes available to multiprocess
+        schemes
+    :param isolate: whether to run each case in its own process
+    :return: a JSON-serializable report of the environment, the workload and
+        the measurements of each case
+    """
+    aggregates = list(AGGREGATE_SCHEMES) if aggregates is None else aggregates
+    eds_schemes = list(EDS_SCHEMES) if eds_schemes is None else eds_schemes
+    for name in aggregates:
+        if name not in AGGREGATE_SCHEMES:
+            raise ValueError(f"unknown aggregate scheme {name}")
+    for name in eds_schemes:
+        if name not in EDS_SCHEMES:
+            raise ValueError(f"unknown encrypted dictionary scheme {name}")
+
+    run = run_case_isolated if isolate else run_case
+    results = [
+        run(
+            BenchmarkCase(
+                aggregate=aggregate,
+                eds=eds,
+                table=table,
+                queries=queries,
+                num_processes=num_processes,
+            )
+        )
+        for aggregate in aggregates
+        for eds in eds_schemes
+    ]
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+        },
+        "table": asdict(table),
+        "queries": asdict(queries),
+        "isolated": isolate,
+        "results": results,
+    }
+
+
+def summarize_latencies(latencies: Sequence[float]) -> Dict[str, Optional[float]]:
+    """
+    Summarizes the given latencies with their mean, maximum and each of the
+    :data:`PERCENTILES`.
+
+    :param latencies: the latencies, in seconds
+    :return: a mapping from statistic names (e.g. :code:`p50`) to seconds, or
+        to :py:const:`None` if there are no latencies
+    """
+    names = ["mean", "max", *[f"p{percentile}" for percentile in PERCENTILES]]
+    if len(latencies) <= 0:
+        return {name: None for name in names}
+    values = [
+        float(np.mean(latencies)),
+        float(np.max(latencies)),
+        *np.percentile(latencies, PERCENTILES).tolist(),
+    ]
+    return dict(zip(names, values))
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Returns the peak resident set size of the current process, or
+    :py:const:`None` if the platform does not report it.
+
+    :return: the peak resident set size in bytes
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, while macOS reports bytes:
+    return int(peak_rss) if sys.platform == "darwin" else int(peak_rss) * 1024
+
+
+def _rate(count: int, seconds: float) -> Optional[float]:
+    return count / seconds if seconds > 0 else None
@@ -0,0 +1,142 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from ..arq import RangeAggregateScheme
+from ..arq.plaintext_schemes.median import MedianAlphaApprox, MedianWaveletMatrix
+from ..arq.plaintext_schemes.minimum import (
+    MinimumASTable,
+    MinimumLinearEMT,
+    MinimumSparseTable,
+)
+from ..arq.plaintext_schemes.mode import ModeASTable
+from ..arq.plaintext_schemes.sum import MomentsPrefix, SumFenwick, SumPrefix
+from ..ste.containers import HashContainerFormat, SortedContainerFormat
+from ..ste.edx import EDX, MultiprocessEDX, SimpleEDX
+from ..ste.serializers import (
+    IntSerializer,
+    PickleSerializer,
+    Serializer,
+    StructSerializer,
+)
+from ..ste.symmetric_encryption import AesGcmSymmetricEncryptionScheme
+
+from typing import Any, Callable, Dict
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AggregateSchemeSpec:
+    """
+    Describes how to benchmark a plaintext :class:`RangeAggregateScheme`.
+    """
+
+    #: Creates the scheme.
+    make_scheme: Callable[[], RangeAggregateScheme[Any, Any, Any]]
+    #: Serializer for the keys of the scheme's plaintext data structure.
+    key_serializer: Serializer[Any]
+    #: Serializer for the values of the scheme's plaintext data structure.
+    value_serializer: Serializer[Any]
+
+
+#: Creates an encrypted dictionary scheme from the key serializer, the value
+#: serializer and the number of processes it may use.
+EDSFactory = Callable[[Serializer[Any], Serializer[Any], int], EDX[Any, Any, Any, Any]]
+
+
+#: The plaintext schemes that can be benchmarked, by name.
+AGGREGATE_SCHEMES: Dict[str, AggregateSchemeSpec] = {
+    "SumPrefix": AggregateSchemeSpec(
+        make_scheme=SumPrefix,
+        key_serializer=IntSerializer(),
+        value_serializer=IntSerializer(),
+    ),
+    "SumFenwick": AggregateSchemeSpec(
+        make_scheme=SumFenwick,
+        key_serializer=IntSerializer(),
+        value_serializer=IntSerializer(),
+    ),
+    "MomentsPrefix": AggregateSchemeSpec(
+        make_scheme=MomentsPrefix,
+        key_serializer=IntSerializer(),
+        value_serializer=StructSerializer(format_string="qqq"),
+    ),
+    "MinimumSparseTable": AggregateSchemeSpec(
+        make_scheme=MinimumSparseTable,
+        key_serializer=StructSerializer(format_string="ii"),
+        value_serializer=IntSerializer(),
+    ),
+    "MinimumASTable": AggregateSchemeSpec(
+        make_scheme=MinimumASTable,
+        key_serializer=StructSerializer(format_string="ii"),
+        value_serializer=IntSerializer(),
+    ),
+    "MinimumLinearEMT": AggregateSchemeSpec(
+        make_scheme=MinimumLinearEMT,
+        key_serializer=StructSerializer(format_string="iii"),
+        value_serializer=IntSerializer(),
+    ),
+    "ModeASTable": AggregateSchemeSpec(
+        make_scheme=ModeASTable,
+        key_serializer=StructSerializer(format_string="ii"),
+        value_serializer=StructSerializer(format_string="ii"),
+    ),
+    "MedianAlphaApprox": AggregateSchemeSpec(
+        make_scheme=lambda: MedianAlphaApprox(alpha=0.5),
+        key_serializer=StructSerializer(format_string="ii"),
+        value_serializer=PickleSerializer(),
+    ),
+    "MedianWaveletMatrix": AggregateSchemeSpec(
+        make_scheme=MedianWaveletMatrix,
+        key_serializer=StructSerializer(format_string="iii"),
+        value_serializer=IntSerializer(),
+    ),
+}
+
+
+#: The encrypted dictionary schemes that can be benchmarked, by name.
+EDS_SCHEMES: Dict[str, EDSFactory] = {
+    "SimpleEDX": lambda key_serializer, value_serializer, _: SimpleEDX(
+        dx_key_serializer=key_serializer,
+        dx_value_serializer=value_serializer,
+    ),
+    "SimpleEDX+SortedContainer": lambda key_serializer, value_serializer, _: SimpleEDX(
+        dx_key_serializer=key_serializer,
+        dx_value_serializer=value_serializer,
+        container_format=SortedContainerFormat(),
+    ),
+    "SimpleEDX+HashContainer": lambda key_serializer, value_serializer, _: SimpleEDX(
+        dx_key_serializer=key_serializer,
+        dx_value_serializer=value_serializer,
+        container_format=HashContainerFormat(),
+    ),
+    "SimpleEDX+AesGcm+HashContainer": lambda key_serializer, value_serializer, _: (
+        SimpleEDX(
+            dx_key_serializer=key_serializer,
+            dx_value_serializer=value_serializer,
+            encryption_scheme=AesGcmSymmetricEncryptionScheme(),
+            container_format=HashContainerFormat(),
+        )
+    ),
+    "MultiprocessEDX": lambda key_serializer, value_serializer, num_processes: (
+        MultiprocessEDX(
+            num_processes=num_processes,
+            dx_key_serializer=key_serializer,
+            dx_value_serializer=value_serializer,
+        )
+    ),
+}
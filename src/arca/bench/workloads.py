@@ -0,0 +1,92 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from ..arq import Domain, Table
+
+from typing import Dict, List
+from dataclasses import dataclass
+
+import numpy as np
+
+
+#: Value distributions supported by :func:`generate_table`.
+DISTRIBUTIONS = ["uniform", "zipf", "normal"]
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """
+    Describes a synthetic :class:`Table` to benchmark over.
+    """
+
+    #: Number of points in the domain, which always starts at 0.
+    domain_size: int = 2**12
+    #: Fraction of domain points that hold at least one record.
+    density: float = 1.0
+    #: Number of records at each filled domain point.
+    records_per_point: int = 1
+    #: Distribution of the record values; one of :data:`DISTRIBUTIONS`.
+    distribution: str = "uniform"
+    #: Record values are drawn from :code:`0, ..., max_value - 1`.
+    max_value: int = 1000
+    #: Seed for the random number generator.
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.domain_size <= 0:
+            raise ValueError("domain_size must be positive")
+        if not 0 < self.density <= 1:
+            raise ValueError("density must be in (0, 1]")
+        if self.records_per_point <= 0:
+            raise ValueError("records_per_point must be positive")
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {DISTRIBUTIONS}")
+        if self.max_value <= 0:
+            raise ValueError("max_value must be positive")
+
+
+def generate_table(spec: TableSpec) -> Table:
+    """
+    Generates the synthetic :class:`Table` described by the given spec. The
+    same spec always generates the same table.
+
+    :param spec: the description of the table
+    :return: a new :class:`Table` over the domain :code:`[0, domain_size)`
+    """
+    rng = np.random.default_rng(spec.seed)
+
+    filled_points = np.flatnonzero(rng.random(spec.domain_size) < spec.density)
+    num_records = len(filled_points) * spec.records_per_point
+    if spec.distribution == "uniform":
+        values = rng.integers(0, spec.max_value, size=num_records)
+    elif spec.distribution == "zipf":
+        values = np.minimum(rng.zipf(1.5, size=num_records), spec.max_value) - 1
+    else:
+        values = np.clip(
+            np.rint(rng.normal(spec.max_value / 2, spec.max_value / 6, num_records)),
+            0,
+            spec.max_value - 1,
+        ).astype(np.int64)
+
+    entries: Dict[int, List[int]] = {}
+    for point, point_values in zip(
+        filled_points.tolist(),
+        values.reshape(-1, spec.records_per_point).tolist(),
+    ):
+        entries[point] = point_values
+    return Table(entries=entries, domain=Domain(start=0, end=spec.domain_size))
@@ -22,14 +22,20 @@ from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.primitives import hashes, hmac, serialization, constant_time
 from cryptography.hazmat.primitives import padding as sym_padding
 
-from typing import Tuple, TYPE_CHECKING
+from typing import Iterable, List, Sequence, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from cryptography.hazmat.primitives.asymmetric import RSAPublicKey, RSAPrivateKey
 
+import hashlib
+import hmac as std_hmac
 import os
 
 
+#: Block size of AES, in bytes.
+AES_BLOCK_SIZE = 16
+
+
 def AsymmetricKeyGen() -> Tuple[RSAPublicKey, RSAPrivateKey]:
     """
     Generates a public-key pair for asymmetric encryption purposes.
@@ -192,6 +198,35 @@ def HMAC(key: bytes, data: bytes) -> bytes:
     return h.finalize()
 
 
+def HashBatch(data: Iterable[bytes]) -> List[bytes]:
+    """
+    Computes :func:`Hash` over each of the given inputs.
+
+    :param data: the inputs to hash
+    :return: the SHA512 hash of each input, in order
+    """
+    return [hashlib.sha512(datum).digest() for datum in data]
+
+
+def HMACBatch(key: bytes, data: Iterable[bytes]) -> List[bytes]:
+    """
+    Computes :func:`HMAC` over each of the given inputs under the same key.
+    The key schedule is computed once, and a copy of the keyed state is
+    used for each input.
+
+    :param key:
+    :param data: the inputs to authenticate
+    :return: the SHA-512 HMAC of each input, in order
+    """
+    prototype = std_hmac.new(key, digestmod=hashlib.sha512)
+    results = []
+    for datum in data:
+        h = prototype.copy()
+        h.update(datum)
+        results.append(h.digest())
+    return results
+
+
 def SymmetricEncrypt(key: bytes, plaintext: bytes) -> bytes:
     """
     Encrypt the plaintext using AES-CBC mode with the provided key and IV.
@@ -235,6 +270,54 @@ def SymmetricDecrypt(key: bytes, ciphertext: bytes) -> bytes:
     return plaintext
 
 
+def SymmetricEncryptBatch(key: bytes, plaintexts: Sequence[bytes]) -> List[bytes]:
+    """
+    Encrypts each of the given plaintexts as in :func:`SymmetricEncrypt`
+    (each with its own random IV). The key and the padding scheme are set up
+    once, and the IVs of the whole batch are drawn in a single call.
+
+    :param key:
+    :param plaintexts: the plaintexts to encrypt
+    :return: the ciphertext of each plaintext, in order
+    """
+    algorithm = algorithms.AES(key)
+    pkcs7 = sym_padding.PKCS7(AES_BLOCK_SIZE * 8)
+    ivs = SecureRandom(AES_BLOCK_SIZE * len(plaintexts))
+
+    ciphertexts = []
+    for index, plaintext in enumerate(plaintexts):
+        padder = pkcs7.padder()
+        padded_data = padder.update(plaintext) + padder.finalize()
+
+        iv = ivs[index * AES_BLOCK_SIZE : (index + 1) * AES_BLOCK_SIZE]
+        encryptor = Cipher(algorithm, modes.CBC(iv)).encryptor()
+        ciphertexts.append(iv + encryptor.update(padded_data) + encryptor.finalize())
+    return ciphertexts
+
+
+def SymmetricDecryptBatch(key: bytes, ciphertexts: Sequence[bytes]) -> List[bytes]:
+    """
+    Decrypts each of the given ciphertexts as in :func:`SymmetricDecrypt`,
+    setting up the key and the padding scheme once for the whole batch.
+
+    :param key:
+    :param ciphertexts: the ciphertexts to decrypt, each prefixed by its IV
+    :return: the plaintext of each ciphertext, in order
+    """
+    algorithm = algorithms.AES(key)
+    pkcs7 = sym_padding.PKCS7(AES_BLOCK_SIZE * 8)
+
+    plaintexts = []
+    for ciphertext in ciphertexts:
+        iv, encrypted_data = ciphertext[:AES_BLOCK_SIZE], ciphertext[AES_BLOCK_SIZE:]
+        decryptor = Cipher(algorithm, modes.CBC(iv)).decryptor()
+        padded_data = decryptor.update(encrypted_data) + decryptor.finalize()
+
+        unpadder = pkcs7.unpadder()
+        plaintexts.append(unpadder.update(padded_data) + unpadder.finalize())
+    return plaintexts
+
+
 def SecureRandom(num_bytes: int) -> bytes:
     """
     Given a length, return that many randomly generated bytes. Can be used for an IV or symmetric key.
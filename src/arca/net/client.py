@@ -0,0 +1,129 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from .remote import ARQRemote
+from .protocol import (
+    MessageKind,
+    RemoteError,
+    pack_frame,
+    pack_items,
+    read_frame,
+    unpack_items,
+)
+
+from typing import Dict, List, Optional
+
+import asyncio
+
+
+class ARQClient(ARQRemote):
+    """
+    Runs the client's side of the query protocol of :class:`ARQ` against an
+    :class:`ARQServer` over a single connection.
+
+    Requests are pipelined: any number of coroutines may query the server
+    concurrently over the same connection, and each waits only for the
+    response to its own request.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.next_request_id = 0
+        self.pending: Dict[int, asyncio.Future[List[Optional[bytes]]]] = {}
+        self.response_reader = asyncio.ensure_future(self.__read_responses())
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> ARQClient:
+        """
+        Connects to a server listening over TCP.
+
+        :param host: the address of the server
+        :param port: the port of the server
+        :return: the connected client
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> ARQClient:
+        """
+        Connects to a server listening on a Unix socket.
+
+        :param path: the path of the socket
+        :return: the connected client
+        """
+        reader, writer = await asyncio.open_unix_connection(path)
+        return cls(reader, writer)
+
+    async def query_server_batch(
+        self, search_tokens: List[bytes]
+    ) -> List[Optional[bytes]]:
+        if self.response_reader.done():
+            raise ConnectionError("connection to the server is closed")
+        request_id = self.next_request_id
+        self.next_request_id += 1
+
+        loop = asyncio.get_running_loop()
+        response: asyncio.Future[List[Optional[bytes]]] = loop.create_future()
+        self.pending[request_id] = response
+        self.writer.write(
+            pack_frame(request_id, MessageKind.QUERY, pack_items(search_tokens))
+        )
+        await self.writer.drain()
+        return await response
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self.response_reader.cancel()
+        try:
+            await self.response_reader
+        except asyncio.CancelledError:
+            pass
+
+    async def __read_responses(self) -> None:
+        error: BaseException = ConnectionError("connection to the server was closed")
+        try:
+            while True:
+                request_id, kind, payload = await read_frame(self.reader)
+                response = self.pending.pop(request_id, None)
+                if response is None or response.done():
+                    continue
+                if kind == MessageKind.RESPONSE:
+                    response.set_result(unpack_items(payload))
+                elif kind == MessageKind.ERROR:
+                    response.set_exception(RemoteError(payload.decode("utf-8")))
+                else:
+                    response.set_exception(
+                        RemoteError(f"unexpected {kind.name} message")
+                    )
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            for response in self.pending.values():
+                if not response.done():
+                    response.set_exception(error)
+            self.pending.clear()
@@ -0,0 +1,160 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from ..util.iterators import chunked
+from .client import ARQClient
+from .remote import ARQRemote
+
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import asyncio
+
+
+#: A batch of search tokens waiting to be sent, along with the future that
+#: receives their responses.
+PendingBatch = Tuple[List[bytes], "asyncio.Future[List[Optional[bytes]]]"]
+
+
+class ARQClientPool(ARQRemote):
+    """
+    Runs the client's side of the query protocol of :class:`ARQ` against an
+    :class:`ARQServer` over a pool of persistent connections.
+
+    Search tokens sent by concurrent queries are not sent one batch at a
+    time. Every batch submitted during the same iteration of the event loop
+    is merged into shared requests of at most :attr:`max_batch_size`
+    distinct tokens. Each request goes to the connection with the fewest
+    requests in flight, and each query receives the responses to its own
+    tokens.
+    """
+
+    def __init__(self, clients: List[ARQClient], max_batch_size: int = 4096):
+        if len(clients) <= 0:
+            raise ValueError("a pool needs at least one connection")
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        #: The connections of the pool.
+        self.clients = clients
+        #: The maximum number of search tokens sent in a single request.
+        self.max_batch_size = max_batch_size
+        self.pending: List[PendingBatch] = []
+        self.senders: Set[asyncio.Future[None]] = set()
+
+    @classmethod
+    async def connect_tcp(
+        cls, host: str, port: int, size: int, max_batch_size: int = 4096
+    ) -> ARQClientPool:
+        """
+        Opens a pool of connections to a server listening over TCP.
+
+        :param host: the address of the server
+        :param port: the port of the server
+        :param size: the number of connections to open
+        :param max_batch_size: the maximum number of search tokens sent in a
+            single request
+        :return: the connected pool
+        """
+        return await cls.__connect(
+            lambda: ARQClient.connect_tcp(host, port), size, max_batch_size
+        )
+
+    @classmethod
+    async def connect_unix(
+        cls, path: str, size: int, max_batch_size: int = 4096
+    ) -> ARQClientPool:
+        """
+        Opens a pool of connections to a server listening on a Unix socket.
+
+        :param path: the path of the socket
+        :param size: the number of connections to open
+        :param max_batch_size: the maximum number of search tokens sent in a
+            single request
+        :return: the connected pool
+        """
+        return await cls.__connect(
+            lambda: ARQClient.connect_unix(path), size, max_batch_size
+        )
+
+    async def query_server_batch(
+        self, search_tokens: List[bytes]
+    ) -> List[Optional[bytes]]:
+        loop = asyncio.get_running_loop()
+        response: asyncio.Future[List[Optional[bytes]]] = loop.create_future()
+        if len(self.pending) <= 0:
+            loop.call_soon(self.__flush)
+        self.pending.append((search_tokens, response))
+        return await response
+
+    async def close(self) -> None:
+        """
+        Closes every connection of the pool once the search tokens submitted
+        so far, including any submitted while closing, have been answered.
+        """
+        while len(self.pending) > 0 or len(self.senders) > 0:
+            if len(self.pending) > 0:
+                self.__flush()
+            await asyncio.gather(*self.senders, return_exceptions=True)
+        await asyncio.gather(*(client.close() for client in self.clients))
+
+    def __flush(self) -> None:
+        batches = self.pending
+        if len(batches) <= 0:
+            return
+        self.pending = []
+        sender = asyncio.ensure_future(self.__send(batches))
+        self.senders.add(sender)
+        sender.add_done_callback(self.senders.discard)
+
+    async def __send(self, batches: List[PendingBatch]) -> None:
+        unique_stks = list(
+            dict.fromkeys(stk for search_tokens, _ in batches for stk in search_tokens)
+        )
+        try:
+            chunks = list(chunked(unique_stks, self.max_batch_size))
+            clients = sorted(self.clients, key=lambda client: len(client.pending))
+            chunk_responses = await asyncio.gather(
+                *(
+                    clients[index % len(clients)].query_server_batch(chunk)
+                    for index, chunk in enumerate(chunks)
+                )
+            )
+        except Exception as e:
+            for _, response in batches:
+                if not response.done():
+                    response.set_exception(e)
+            return
+
+        responses: Dict[bytes, Optional[bytes]] = {}
+        for chunk, cts in zip(chunks, chunk_responses):
+            responses.update(zip(chunk, cts))
+        for search_tokens, response in batches:
+            if not response.done():
+                response.set_result([responses[stk] for stk in search_tokens])
+
+    @classmethod
+    async def __connect(
+        cls,
+        connect: Callable[[], Awaitable[ARQClient]],
+        size: int,
+        max_batch_size: int,
+    ) -> ARQClientPool:
+        if size <= 0:
+            raise ValueError("a pool needs at least one connection")
+        clients = await asyncio.gather(*(connect() for _ in range(size)))
+        return cls(list(clients), max_batch_size)
@@ -0,0 +1,138 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import asyncio
+import enum
+import struct
+
+
+#: Layout of the header preceding every frame: the length of the payload in
+#: bytes, the identifier of the request that the frame belongs to and the
+#: :class:`MessageKind` of the frame.
+FRAME_HEADER = struct.Struct("<IQB")
+
+#: Largest payload that will be read from a peer.
+MAX_PAYLOAD_SIZE = 2**30
+
+#: Layout of the number of items in a payload.
+ITEM_COUNT = struct.Struct("<I")
+
+#: Layout of the length preceding each item in a payload.
+ITEM_LENGTH = struct.Struct("<I")
+
+#: Item length recorded for a missing item (e.g. a search token that did
+#: not match anything in the encrypted data structure).
+MISSING_ITEM = 2**32 - 1
+
+
+class MessageKind(enum.IntEnum):
+    """
+    Identifies the contents of a frame.
+    """
+
+    #: A batch of search tokens, sent by the client.
+    QUERY = 1
+
+    #: The responses to a batch of search tokens, in the same order, sent
+    #: by the server.
+    RESPONSE = 2
+
+    #: A UTF-8 description of why a request failed, sent by the server.
+    ERROR = 3
+
+
+class RemoteError(Exception):
+    """
+    Raised by the client when the server fails to answer a request.
+    """
+
+
+def pack_frame(request_id: int, kind: MessageKind, payload: bytes) -> bytes:
+    """
+    Packs a frame of the given kind for the given request.
+
+    :param request_id: the identifier of the request
+    :param kind: the kind of the frame
+    :param payload: the payload of the frame
+    :return: the frame
+    """
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        raise ValueError("payload is too large")
+    return FRAME_HEADER.pack(len(payload), request_id, kind) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, MessageKind, bytes]:
+    """
+    Reads the next frame from the given stream.
+
+    :param reader: the stream to read from
+    :return: the request identifier, kind and payload of the frame
+    :raises asyncio.IncompleteReadError: if the stream ends before a whole
+        frame is read
+    """
+    header = await reader.readexactly(FRAME_HEADER.size)
+    payload_size, request_id, kind = FRAME_HEADER.unpack(header)
+    if payload_size > MAX_PAYLOAD_SIZE:
+        raise ValueError("payload is too large")
+    payload = await reader.readexactly(payload_size)
+    return request_id, MessageKind(kind), payload
+
+
+def pack_items(items: Sequence[Optional[bytes]]) -> bytes:
+    """
+    Packs the given items (search tokens or responses) into a payload.
+
+    :param items: the items to pack; :py:const:`None` marks a missing item
+    :return: the payload
+    """
+    chunks = [ITEM_COUNT.pack(len(items))]
+    for item in items:
+        if item is None:
+            chunks.append(ITEM_LENGTH.pack(MISSING_ITEM))
+        else:
+            chunks.append(ITEM_LENGTH.pack(len(item)))
+            chunks.append(item)
+    return b"".join(chunks)
+
+
+def unpack_items(payload: bytes) -> List[Optional[bytes]]:
+    """
+    Unpacks the items in a payload created by :func:`pack_items`.
+
+    :param payload: the payload to unpack
+    :return: the items, with :py:const:`None` for each missing item
+    """
+    (count,) = ITEM_COUNT.unpack_from(payload)
+    start = ITEM_COUNT.size
+    items: List[Optional[bytes]] = []
+    for _ in range(count):
+        (length,) = ITEM_LENGTH.unpack_from(payload, start)
+        start += ITEM_LENGTH.size
+        if length == MISSING_ITEM:
+            items.append(None)
+            continue
+        if start + length > len(payload):
+            raise ValueError("payload is truncated")
+        items.append(payload[start : start + length])
+        start += length
+    if start != len(payload):
+        raise ValueError("payload has trailing data")
+    return items
@@ -0,0 +1,120 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from ..arq.arq import ARQ
+from ..arq.domain import Domain
+from ..arq.domain_2d import Domain2D
+from ..arq.range_query import RangeQuery
+from ..arq.range_query_2d import RangeQuery2D
+from ..arq.range_aggregate_querier import Aggregate, ResolveDone, ResolveContinue
+
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Sequence, Union
+
+import asyncio
+
+
+class ARQRemote(ABC):
+    """
+    Runs the client's side of the query protocol of :class:`ARQ` against a
+    remote :class:`ARQServer`.
+    """
+
+    @abstractmethod
+    async def query_server_batch(
+        self, search_tokens: List[bytes]
+    ) -> List[Optional[bytes]]:
+        """
+        Sends a batch of search tokens to the server. Like
+        :func:`ARQ.query_server_batch`, the output is aligned with
+        :paramref:`search_tokens`.
+
+        :param search_tokens: the search tokens to look up
+        :return: the response to each search token, or :py:const:`None` if
+            it does not match anything in the encrypted data structure
+        """
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Closes the connection(s) to the server, failing any requests still
+        in flight.
+        """
+        ...
+
+    async def query(
+        self,
+        arq: ARQ[Any, Any, Any, Any],
+        key: bytes,
+        domain: Union[Domain, Domain2D],
+        query: Union[RangeQuery, RangeQuery2D],
+    ) -> Aggregate:
+        """
+        Answers the given query by running the rounds of the query protocol
+        of :func:`ARQ.generate_querier` against the server.
+
+        :param arq: the scheme that the server's index was built with
+        :param key: the key that the index was built with
+        :param domain: the :class:`Domain` of the underlying :class:`Table`
+        :param query: the query to answer
+        :return: the aggregate
+        """
+        querier = arq.generate_querier(key, domain, query)
+        subqueries = querier.query()
+        while True:
+            if len(subqueries) <= 0:
+                raise ValueError(
+                    f"querier {type(querier).__name__} "
+                    "returned no subqueries before resolving"
+                )
+            responses = await self.query_server_batch(querier.token(subqueries))
+            result = querier.resolve([ct for ct in responses if ct is not None])
+            if isinstance(result, ResolveDone):
+                return result.aggregate
+            elif isinstance(result, ResolveContinue):
+                subqueries = result.subqueries
+
+    async def query_many(
+        self,
+        arq: ARQ[Any, Any, Any, Any],
+        key: bytes,
+        domain: Union[Domain, Domain2D],
+        queries: Sequence[Union[RangeQuery, RangeQuery2D]],
+    ) -> List[Aggregate]:
+        """
+        Answers each of the given queries concurrently.
+
+        :param arq: the scheme that the server's index was built with
+        :param key: the key that the index was built with
+        :param domain: the :class:`Domain` of the underlying :class:`Table`
+        :param queries: the queries to answer
+        :return: the aggregates, in the same order as :paramref:`queries`
+        """
+        return list(
+            await asyncio.gather(
+                *(self.query(arq, key, domain, query) for query in queries)
+            )
+        )
+
+    async def __aenter__(self) -> ARQRemote:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
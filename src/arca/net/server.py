@@ -0,0 +1,158 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from ..ste.eds import EDS
+from .protocol import MessageKind, pack_frame, pack_items, read_frame, unpack_items
+
+from typing import Any, Generic, List, Optional, TypeVar
+
+import asyncio
+
+
+EdsType = TypeVar("EdsType")
+
+
+class ARQServer(Generic[EdsType]):
+    """
+    Answers batches of search tokens over an encrypted data structure that
+    is loaded once, on behalf of any number of :class:`ARQClient`
+    connections. This is the server's side of the query protocol of
+    :class:`ARQ` (see :func:`ARQ.query_server_batch`).
+
+    Each connection carries a sequence of frames (see :mod:`protocol`). A
+    client may send several requests without waiting for their responses;
+    each response is tagged with the identifier of its request.
+    """
+
+    __slots__ = ["eds_scheme", "eds"]
+
+    def __init__(self, eds_scheme: EDS[Any, Any, EdsType, Any, Any], eds: EdsType):
+        #: The scheme that :attr:`eds` was encrypted with.
+        self.eds_scheme = eds_scheme
+        #: The encrypted data structure, as returned by :func:`EDS.load_eds`.
+        self.eds = eds
+
+    @classmethod
+    def from_bytes(
+        cls, eds_scheme: EDS[Any, Any, EdsType, Any, Any], eds_bytes: bytes
+    ) -> ARQServer[EdsType]:
+        """
+        Creates a server over the serialized encrypted data structure.
+
+        :param eds_scheme: the scheme that the structure was encrypted with
+        :param eds_bytes: the serialized encrypted data structure
+        :return: the server
+        """
+        return cls(eds_scheme, eds_scheme.load_eds(eds_bytes))
+
+    def query_batch(
+        self, search_tokens: List[Optional[bytes]]
+    ) -> List[Optional[bytes]]:
+        """
+        Answers a batch of search tokens.
+
+        :param search_tokens: the search tokens to look up
+        :return: the response to each search token, or :py:const:`None` if
+            it does not match anything in the encrypted data structure
+        """
+        responses: List[Optional[bytes]] = []
+        for stk in search_tokens:
+            if stk is None:
+                raise ValueError("search tokens must not be missing")
+            responses.append(self.eds_scheme.query(stk, self.eds))
+        return responses
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Answers the requests sent over a connection until the client closes
+        it.
+
+        :param reader: the stream to read requests from
+        :param writer: the stream to write responses to
+        """
+        try:
+            while True:
+                try:
+                    request_id, kind, payload = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    if kind != MessageKind.QUERY:
+                        raise ValueError(f"unexpected {kind.name} message")
+                    # Looking up the batch may take a while, so it runs in
+                    # the default executor to keep other connections served.
+                    responses = await asyncio.get_running_loop().run_in_executor(
+                        None, self.query_batch, unpack_items(payload)
+                    )
+                    frame = pack_frame(
+                        request_id, MessageKind.RESPONSE, pack_items(responses)
+                    )
+                except Exception as e:
+                    frame = pack_frame(
+                        request_id, MessageKind.ERROR, repr(e).encode("utf-8")
+                    )
+                writer.write(frame)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start_tcp(self, host: str, port: int) -> asyncio.AbstractServer:
+        """
+        Starts listening for connections over TCP.
+
+        :param host: the address to listen on
+        :param port: the port to listen on, or 0 to pick a free port
+        :return: the listening server
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """
+        Starts listening for connections on a Unix socket.
+
+        :param path: the path of the socket
+        :return: the listening server
+        """
+        return await asyncio.start_unix_server(self.handle_connection, path)
+
+    async def serve_tcp(self, host: str, port: int) -> None:
+        """
+        Answers requests over TCP until cancelled.
+
+        :param host: the address to listen on
+        :param port: the port to listen on
+        """
+        server = await self.start_tcp(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path: str) -> None:
+        """
+        Answers requests on a Unix socket until cancelled.
+
+        :param path: the path of the socket
+        """
+        server = await self.start_unix(path)
+        async with server:
+            await server.serve_forever()
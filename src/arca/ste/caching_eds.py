@@ -0,0 +1,132 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+from ..util.lru import LRUCache
+from .eds import EDS, UpdatableEDS
+
+from typing import Any, BinaryIO, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+from dataclasses import dataclass, field
+
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+EdsType = TypeVar("EdsType")
+PlaintextInputType = TypeVar("PlaintextInputType")
+TokenInputType = TypeVar("TokenInputType", bound=Hashable)
+ResolveOutputType = TypeVar("ResolveOutputType")
+
+
+@dataclass(frozen=True)
+class CachingEDS(
+    EDS[KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType],
+    Generic[KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType],
+):
+    """
+    Wraps an encrypted data structure scheme, memoizing the client-side
+    algorithms :func:`token` and :func:`resolve` in bounded LRU caches.
+
+    Since both are deterministic for a fixed key, queries that share
+    subqueries (e.g. repeated refreshes of the same range) skip the
+    underlying HMAC and decryption entirely. Resolved responses are shared
+    between calls, so they must not be modified.
+    """
+
+    #: The scheme being wrapped.
+    eds_scheme: EDS[
+        KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType
+    ]
+    #: The maximum number of search tokens to cache.
+    token_cache_size: int = 65536
+    #: The maximum number of resolved responses to cache.
+    response_cache_size: int = 65536
+    #: Cache of the search token of each (key, keyword) pair.
+    token_cache: LRUCache[Tuple[KeyType, TokenInputType], bytes] = field(
+        init=False, repr=False, compare=False
+    )
+    #: Cache of the resolved output of each (key, response) pair.
+    response_cache: LRUCache[Tuple[KeyType, bytes], ResolveOutputType] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "token_cache", LRUCache(self.token_cache_size))
+        object.__setattr__(self, "response_cache", LRUCache(self.response_cache_size))
+
+    def generate_key(self) -> KeyType:
+        return self.eds_scheme.generate_key()
+
+    def encrypt(self, key: KeyType, plaintext_ds: PlaintextInputType) -> bytes:
+        return self.eds_scheme.encrypt(key, plaintext_ds)
+
+    def build_plaintext_ds(self, entries: Iterable[Any]) -> PlaintextInputType:
+        return self.eds_scheme.build_plaintext_ds(entries)
+
+    def encrypt_to(self, key: KeyType, entries: Iterable[Any], sink: BinaryIO) -> None:
+        self.eds_scheme.encrypt_to(key, entries, sink)
+
+    def load_eds(self, eds_bytes: bytes) -> EdsType:
+        return self.eds_scheme.load_eds(eds_bytes)
+
+    def token(self, key: KeyType, keyword: TokenInputType) -> bytes:
+        return self.token_cache.get_or_compute(
+            (key, keyword), lambda _: self.eds_scheme.token(key, keyword)
+        )
+
+    def query(self, token: bytes, eds: EdsType) -> Optional[bytes]:
+        return self.eds_scheme.query(token, eds)
+
+    def resolve(self, key: KeyType, response: bytes) -> ResolveOutputType:
+        return self.response_cache.get_or_compute(
+            (key, response), lambda _: self.eds_scheme.resolve(key, response)
+        )
+
+    def clear_caches(self) -> None:
+        """
+        Empties both caches, e.g. after the key or the encrypted data
+        structure changes.
+        """
+        self.token_cache.clear()
+        self.response_cache.clear()
+
+
+@dataclass(frozen=True)
+class UpdatableCachingEDS(
+    CachingEDS[KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType],
+    UpdatableEDS[
+        KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType
+    ],
+    Generic[KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType],
+):
+    """
+    A :class:`CachingEDS` that wraps an updatable encrypted data structure
+    scheme and passes updates through to it.
+
+    Updated entries are encrypted afresh, so their responses never hit a
+    stale cache entry; search tokens are unaffected by updates.
+    """
+
+    #: The scheme being wrapped.
+    eds_scheme: UpdatableEDS[
+        KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType
+    ]
+
+    def encrypt_update(self, key: KeyType, entries: Iterable[Any]) -> bytes:
+        return self.eds_scheme.encrypt_update(key, entries)
+
+    def apply_update(self, eds: EdsType, update: bytes) -> None:
+        self.eds_scheme.apply_update(eds, update)
@@ -0,0 +1,28 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+__all__ = [
+    "Container",
+    "ContainerFormat",
+    "SortedContainer",
+    "SortedContainerFormat",
+    "HashContainer",
+    "HashContainerFormat",
+]
+
+from .container import Container, ContainerFormat
+from .sorted_container import SortedContainer, SortedContainerFormat
+from .hash_container import HashContainer, HashContainerFormat
@@ -0,0 +1,386 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from ...util.iterators import chunked
+
+from abc import ABC, abstractmethod
+
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import enum
+import mmap
+import pickle
+import struct
+
+import numpy as np
+
+
+#: Types of buffers that a :class:`Container` can be loaded from.
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+#: Magic bytes at the start of every container.
+CONTAINER_MAGIC = b"ARCA"
+
+#: Layout of the header at the start of every container: the magic bytes,
+#: the container kind, the format version, the width of every ciphertext in
+#: bytes (or 0 if ciphertexts vary in length), the width of each label in
+#: bytes and the number of entries.
+CONTAINER_HEADER = struct.Struct("<4sBBHQQ")
+
+#: Layout of each entry of the offsets table of variable-width ciphertexts.
+OFFSET_DTYPE = np.dtype("<u8")
+
+#: Largest ciphertext width that can be recorded in a container header.
+MAX_CIPHERTEXT_WIDTH = 2**16 - 1
+
+#: Pickle protocol written by :func:`dump_pickled_pairs`; the oldest one that
+#: can encode :code:`bytes` objects directly.
+PICKLE_PROTOCOL = 3
+
+#: Number of entries added to the pickled :code:`dict` by each SETITEMS
+#: opcode written by :func:`dump_pickled_pairs`.
+PICKLE_BATCH_SIZE = 1000
+
+
+class ContainerKind(enum.IntEnum):
+    """
+    Identifies the layout of the data following a container header.
+    """
+
+    #: Labels are sorted and looked up with binary search.
+    SORTED = 1
+
+    #: Labels are placed in an open-addressing hash table.
+    HASH = 2
+
+
+class Container(Mapping[bytes, bytes]):
+    """
+    A read-only mapping from fixed-width labels to ciphertexts, backed by a
+    single flat buffer (typically a memory-mapped file) instead of a Python
+    object per entry.
+
+    Containers can be used wherever an encrypted data structure was
+    previously represented by a :code:`Dict[bytes, bytes]`.
+    """
+
+    @property
+    @abstractmethod
+    def label_width(self) -> int:
+        """
+        The width of every label in the container, in bytes.
+        """
+        ...
+
+
+class ContainerFormat(ABC):
+    """
+    Builds and loads a particular kind of :class:`Container`.
+    """
+
+    @abstractmethod
+    def dumps(self, items: Iterable[Tuple[bytes, bytes]]) -> bytes:
+        """
+        Serializes the given (label, ciphertext) pairs into a container.
+        All labels must be distinct and of the same width.
+
+        :param items: the (label, ciphertext) pairs to store
+        :return: the container in serialized form
+        """
+        ...
+
+    @abstractmethod
+    def loads(self, buffer: Buffer) -> Container:
+        """
+        Opens a container over the given buffer without copying it.
+
+        :param buffer: a container, as previously generated from :func:`dumps`
+        :return: a :class:`Container` over :paramref:`buffer`
+        """
+        ...
+
+    def dump(self, items: Iterable[Tuple[bytes, bytes]], sink: BinaryIO) -> None:
+        """
+        Writes the container holding the given (label, ciphertext) pairs to
+        the given file-like object.
+
+        Containers are laid out around an index over all of their labels, so
+        by default the container is built in memory with :func:`dumps` and
+        then written out.
+
+        :param items: the (label, ciphertext) pairs to store
+        :param sink: the binary file-like object to write to
+        """
+        sink.write(self.dumps(items))
+
+    def open(self, path: str) -> Container:
+        """
+        Memory-maps the container stored in the file at the given path.
+
+        :param path: the path of a file containing the output of :func:`dumps`
+        :return: a :class:`Container` over the mapped file
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.loads(buffer)
+
+
+class CiphertextRegion:
+    """
+    Reads the ciphertexts stored at the end of a container, in entry order.
+
+    If every ciphertext has the same width, the ciphertexts are simply
+    concatenated. Otherwise, they are preceded by a table of
+    :code:`count + 1` little-endian uint64 offsets such that the i-th
+    ciphertext is located at :code:`buffer[offsets[i]:offsets[i + 1]]`.
+    """
+
+    __slots__ = ["buffer", "start", "ciphertext_width", "offsets"]
+
+    def __init__(self, buffer: Buffer, start: int, count: int, ciphertext_width: int):
+        self.buffer = buffer
+        self.ciphertext_width = ciphertext_width
+        if ciphertext_width > 0:
+            self.start = start
+            end = start + count * ciphertext_width
+        else:
+            self.start = start + (count + 1) * OFFSET_DTYPE.itemsize
+            self.offsets = np.frombuffer(
+                buffer, dtype=OFFSET_DTYPE, count=count + 1, offset=start
+            )
+            end = int(self.offsets[-1])
+        if end > len(buffer):
+            raise ValueError("container is truncated")
+
+    def get(self, index: int) -> bytes:
+        """
+        Returns the ciphertext of the entry with the given index.
+
+        :param index: the index of the entry
+        :return: the ciphertext
+        """
+        if self.ciphertext_width > 0:
+            start = self.start + index * self.ciphertext_width
+            end = start + self.ciphertext_width
+        else:
+            start, end = self.offsets[index : index + 2].tolist()
+        return bytes(self.buffer[start:end])
+
+
+def pack_ciphertexts(
+    ciphertexts: Sequence[bytes], start: int
+) -> Tuple[int, List[bytes]]:
+    """
+    Lays out the given ciphertexts in the format read by
+    :class:`CiphertextRegion`. Ciphertexts that all have the same width are
+    packed without an offsets table.
+
+    :param ciphertexts: the ciphertexts, in entry order
+    :param start: the position in the container at which the region starts
+    :return: the width of every ciphertext (or 0 if they vary in length) and
+        the chunks of bytes making up the region
+    """
+    widths = {len(ciphertext) for ciphertext in ciphertexts}
+    if len(widths) == 1:
+        (ciphertext_width,) = widths
+        if 0 < ciphertext_width <= MAX_CIPHERTEXT_WIDTH:
+            return ciphertext_width, list(ciphertexts)
+
+    ciphertexts_start = start + (len(ciphertexts) + 1) * OFFSET_DTYPE.itemsize
+    offsets = np.zeros(len(ciphertexts) + 1, dtype=OFFSET_DTYPE)
+    offsets[0] = ciphertexts_start
+    np.cumsum([len(ciphertext) for ciphertext in ciphertexts], out=offsets[1:])
+    offsets[1:] += ciphertexts_start
+    return 0, [offsets.tobytes(), *ciphertexts]
+
+
+def pack_header(
+    kind: ContainerKind,
+    version: int,
+    label_width: int,
+    count: int,
+    ciphertext_width: int = 0,
+) -> bytes:
+    """
+    Packs a container header.
+
+    :param kind: the layout of the container
+    :param version: the version of the layout
+    :param label_width: the width of each label in bytes
+    :param count: the number of entries in the container
+    :param ciphertext_width: the width of every ciphertext in bytes, or 0 if
+        ciphertexts vary in length
+    :return: the packed header
+    """
+    return CONTAINER_HEADER.pack(
+        CONTAINER_MAGIC, kind, version, ciphertext_width, label_width, count
+    )
+
+
+def unpack_header(
+    buffer: Buffer, kind: ContainerKind, version: int
+) -> Tuple[int, int, int]:
+    """
+    Unpacks and validates the header at the start of the given buffer.
+
+    :param buffer: the container to read the header of
+    :param kind: the expected layout of the container
+    :param version: the expected version of the layout
+    :return: the width of each label, the number of entries and the width
+        of every ciphertext (or 0 if ciphertexts vary in length)
+    """
+    if len(buffer) < CONTAINER_HEADER.size:
+        raise ValueError("buffer is too small to be a container")
+    (
+        magic,
+        actual_kind,
+        actual_version,
+        ciphertext_width,
+        label_width,
+        count,
+    ) = CONTAINER_HEADER.unpack_from(buffer)
+    if magic != CONTAINER_MAGIC:
+        raise ValueError("buffer is not a container")
+    if actual_kind != kind:
+        raise ValueError(f"expected a {kind.name} container, found kind {actual_kind}")
+    if actual_version != version:
+        raise ValueError(f"unsupported container version {actual_version}")
+    return label_width, count, ciphertext_width
+
+
+def check_label_widths(labels: Iterable[bytes]) -> int:
+    """
+    Returns the common width of the given labels, or 0 if there are none.
+
+    :param labels: the labels to check
+    :return: the width shared by every label
+    """
+    label_width: Optional[int] = None
+    for label in labels:
+        if label_width is None:
+            label_width = len(label)
+        elif len(label) != label_width:
+            raise ValueError("all labels must have the same width")
+    return label_width or 0
+
+
+def dump_encrypted_ds(
+    encrypted_ds: Dict[bytes, bytes], container_format: Optional[ContainerFormat]
+) -> bytes:
+    """
+    Serializes an encrypted dictionary, either as a pickled :code:`dict` or
+    (if a :paramref:`container_format` is given) as a container.
+
+    :param encrypted_ds: the (label, ciphertext) pairs to serialize
+    :param container_format: the container format to use, if any
+    :return: the serialized encrypted data structure
+    """
+    if container_format is None:
+        return pickle.dumps(encrypted_ds)
+    return container_format.dumps(encrypted_ds.items())
+
+
+def dump_encrypted_ds_to(
+    pairs: Iterable[Tuple[bytes, bytes]],
+    sink: BinaryIO,
+    container_format: Optional[ContainerFormat],
+) -> None:
+    """
+    Writes an encrypted dictionary to the given file-like object in the
+    same format as :func:`dump_encrypted_ds`. Without a
+    :paramref:`container_format`, the pairs are written as they are
+    produced rather than being collected first.
+
+    :param pairs: the (label, ciphertext) pairs to serialize; all labels
+        must be distinct
+    :param sink: the binary file-like object to write to
+    :param container_format: the container format to use, if any
+    """
+    if container_format is None:
+        dump_pickled_pairs(pairs, sink)
+    else:
+        container_format.dump(pairs, sink)
+
+
+def dump_pickled_pairs(pairs: Iterable[Tuple[bytes, bytes]], sink: BinaryIO) -> None:
+    """
+    Writes the given pairs to the given file-like object as a pickled
+    :code:`dict`, equivalent to :code:`pickle.dump(dict(pairs), sink)` but
+    without building the :code:`dict`. Only :data:`PICKLE_BATCH_SIZE` pairs
+    are held in memory at a time.
+
+    :param pairs: the (key, value) pairs to write; all keys must be distinct
+    :param sink: the binary file-like object to write to
+    """
+    sink.write(pickle.PROTO + bytes([PICKLE_PROTOCOL]) + pickle.EMPTY_DICT)
+    for batch in chunked(pairs, PICKLE_BATCH_SIZE):
+        sink.write(
+            b"".join(
+                [
+                    pickle.MARK,
+                    *(
+                        pickle_bytes(data)
+                        for label, ciphertext in batch
+                        for data in (label, ciphertext)
+                    ),
+                    pickle.SETITEMS,
+                ]
+            )
+        )
+    sink.write(pickle.STOP)
+
+
+def pickle_bytes(data: bytes) -> bytes:
+    """
+    Returns the pickle opcodes that push the given :code:`bytes` object onto
+    the unpickler's stack.
+
+    :param data: the object to encode
+    :return: the encoded object
+    """
+    if len(data) < 256:
+        return pickle.SHORT_BINBYTES + bytes([len(data)]) + data
+    if len(data) < 2**32:
+        return pickle.BINBYTES + struct.pack("<I", len(data)) + data
+    raise ValueError("cannot pickle bytes objects of 4 GiB or more")
+
+
+def load_encrypted_ds(
+    eds_bytes: bytes, container_format: Optional[ContainerFormat]
+) -> Mapping[bytes, bytes]:
+    """
+    Restores an encrypted dictionary serialized by :func:`dump_encrypted_ds`.
+
+    :param eds_bytes: the serialized encrypted data structure
+    :param container_format: the container format that was used, if any
+    :return: a mapping from labels to ciphertexts
+    """
+    if container_format is None:
+        eds: Dict[bytes, bytes] = pickle.loads(eds_bytes)
+        return eds
+    return container_format.loads(eds_bytes)
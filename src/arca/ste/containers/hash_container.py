@@ -0,0 +1,233 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from .container import (
+    Buffer,
+    Container,
+    ContainerFormat,
+    ContainerKind,
+    CONTAINER_HEADER,
+    CiphertextRegion,
+    check_label_widths,
+    pack_ciphertexts,
+    pack_header,
+    unpack_header,
+)
+
+from typing import Iterable, Iterator, Tuple
+from dataclasses import dataclass
+
+import math
+import struct
+
+
+#: Version of the layout written by :class:`HashContainerFormat`.
+HASH_CONTAINER_VERSION = 1
+
+#: Layout of the header following the common container header: the number
+#: of slots in the hash table.
+HASH_HEADER = struct.Struct("<Q")
+
+#: Layout of the entry reference at the end of each slot: one plus the index
+#: of the entry stored in the slot, or zero if the slot is empty.
+SLOT_REFERENCE = struct.Struct("<Q")
+
+
+class HashContainer(Container):
+    """
+    A :class:`Container` that stores the first :attr:`label_width` bytes of
+    each label in an open-addressing hash table with linear probing. The
+    layout following the header is:
+
+    .. code-block: text
+
+        num_slots   one little-endian uint64
+        slots       num_slots * (label_width + 8) bytes
+        ciphertexts in entry order (see :class:`CiphertextRegion`)
+
+    Each slot holds a label prefix followed by a reference to its entry.
+    Since labels are PRF outputs, the prefix is used directly as the hash
+    value, and a lookup is expected to touch a single slot.
+
+    The keys of a :class:`HashContainer` are the stored label prefixes. Any
+    label at least :attr:`label_width` bytes long can be looked up, and is
+    matched on its prefix alone.
+    """
+
+    __slots__ = [
+        "buffer",
+        "count",
+        "num_slots",
+        "slots_start",
+        "slot_size",
+        "ciphertexts",
+        "_label_width",
+    ]
+
+    def __init__(self, buffer: Buffer):
+        label_width, count, ciphertext_width = unpack_header(
+            buffer, ContainerKind.HASH, HASH_CONTAINER_VERSION
+        )
+        (num_slots,) = HASH_HEADER.unpack_from(buffer, CONTAINER_HEADER.size)
+        if num_slots <= count:
+            raise ValueError("container must have more slots than entries")
+
+        self.buffer = buffer
+        self.count = count
+        self.num_slots = num_slots
+        self.slots_start = CONTAINER_HEADER.size + HASH_HEADER.size
+        self.slot_size = label_width + SLOT_REFERENCE.size
+        self.ciphertexts = CiphertextRegion(
+            buffer,
+            self.slots_start + num_slots * self.slot_size,
+            count,
+            ciphertext_width,
+        )
+        self._label_width = label_width
+
+    @property
+    def label_width(self) -> int:
+        return self._label_width
+
+    @property
+    def load_factor(self) -> float:
+        """
+        The fraction of slots that are occupied.
+        """
+        return self.count / self.num_slots if self.num_slots > 0 else 0.0
+
+    def __getitem__(self, label: bytes) -> bytes:
+        index = self.__find(label)
+        if index < 0:
+            raise KeyError(label)
+        return self.ciphertexts.get(index)
+
+    def __contains__(self, label: object) -> bool:
+        return isinstance(label, bytes) and self.__find(label) >= 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for slot in range(self.num_slots):
+            start = self.slots_start + slot * self.slot_size
+            (reference,) = SLOT_REFERENCE.unpack_from(
+                self.buffer, start + self._label_width
+            )
+            if reference > 0:
+                yield bytes(self.buffer[start : start + self._label_width])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __find(self, label: bytes) -> int:
+        if len(label) < self._label_width or self.count <= 0:
+            return -1
+        prefix = label[: self._label_width]
+        slot = slot_for_prefix(prefix, self.num_slots)
+        for _ in range(self.num_slots):
+            start = self.slots_start + slot * self.slot_size
+            (reference,) = SLOT_REFERENCE.unpack_from(
+                self.buffer, start + self._label_width
+            )
+            if reference <= 0:
+                return -1
+            if self.buffer[start : start + self._label_width] == prefix:
+                return int(reference) - 1
+            slot = (slot + 1) % self.num_slots
+        return -1
+
+
+def slot_for_prefix(prefix: bytes, num_slots: int) -> int:
+    """
+    Returns the first slot probed for the given label prefix.
+
+    :param prefix: the label prefix
+    :param num_slots: the number of slots in the hash table
+    :return: the index of the home slot of :paramref:`prefix`
+    """
+    return int.from_bytes(prefix[:8], "little") % num_slots
+
+
+@dataclass(frozen=True)
+class HashContainerFormat(ContainerFormat):
+    """
+    Builds and loads :class:`HashContainer` objects.
+    """
+
+    #: The maximum fraction of slots that may be occupied. At least one slot
+    #: is always left empty so that lookups of missing labels terminate.
+    load_factor: float = 0.5
+
+    #: The number of bytes of each label to store. Labels must be distinct
+    #: on their first :attr:`prefix_length` bytes.
+    prefix_length: int = 16
+
+    def __post_init__(self) -> None:
+        if not 0 < self.load_factor < 1:
+            raise ValueError("load_factor must be in (0, 1)")
+        if self.prefix_length < 8:
+            raise ValueError("prefix_length must be at least 8")
+
+    def dumps(self, items: Iterable[Tuple[bytes, bytes]]) -> bytes:
+        labels = []
+        ciphertexts = []
+        for label, ciphertext in items:
+            labels.append(label)
+            ciphertexts.append(ciphertext)
+        if len(labels) > 0 and check_label_widths(labels) < self.prefix_length:
+            raise ValueError("labels are shorter than the prefix length")
+
+        count = len(labels)
+        num_slots = max(math.ceil(count / self.load_factor), count + 1)
+        slot_size = self.prefix_length + SLOT_REFERENCE.size
+        slots = bytearray(num_slots * slot_size)
+        for index, label in enumerate(labels):
+            prefix = label[: self.prefix_length]
+            slot = slot_for_prefix(prefix, num_slots)
+            while True:
+                start = slot * slot_size
+                (reference,) = SLOT_REFERENCE.unpack_from(
+                    slots, start + self.prefix_length
+                )
+                if reference <= 0:
+                    break
+                if slots[start : start + self.prefix_length] == prefix:
+                    raise ValueError("labels must have distinct prefixes")
+                slot = (slot + 1) % num_slots
+            slots[start : start + self.prefix_length] = prefix
+            SLOT_REFERENCE.pack_into(slots, start + self.prefix_length, index + 1)
+
+        ciphertext_width, ciphertext_region = pack_ciphertexts(
+            ciphertexts, CONTAINER_HEADER.size + HASH_HEADER.size + len(slots)
+        )
+
+        return b"".join(
+            [
+                pack_header(
+                    ContainerKind.HASH,
+                    HASH_CONTAINER_VERSION,
+                    self.prefix_length,
+                    count,
+                    ciphertext_width,
+                ),
+                HASH_HEADER.pack(num_slots),
+                slots,
+                *ciphertext_region,
+            ]
+        )
+
+    def loads(self, buffer: Buffer) -> HashContainer:
+        return HashContainer(buffer)
@@ -0,0 +1,143 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from .container import (
+    Buffer,
+    Container,
+    ContainerFormat,
+    ContainerKind,
+    CONTAINER_HEADER,
+    CiphertextRegion,
+    check_label_widths,
+    pack_ciphertexts,
+    pack_header,
+    unpack_header,
+)
+
+from typing import Iterable, Iterator, Tuple
+from dataclasses import dataclass
+
+import numpy as np
+
+
+#: Version of the layout written by :class:`SortedContainerFormat`.
+SORTED_CONTAINER_VERSION = 1
+
+
+class SortedContainer(Container):
+    """
+    A :class:`Container` whose labels are stored in sorted order. The layout
+    following the header is:
+
+    .. code-block: text
+
+        labels      count * label_width bytes, sorted
+        ciphertexts in label order (see :class:`CiphertextRegion`)
+
+    Lookups run a binary search over the labels region directly.
+    """
+
+    __slots__ = ["buffer", "count", "labels", "ciphertexts", "_label_width"]
+
+    def __init__(self, buffer: Buffer):
+        label_width, count, ciphertext_width = unpack_header(
+            buffer, ContainerKind.SORTED, SORTED_CONTAINER_VERSION
+        )
+        labels_start = CONTAINER_HEADER.size
+
+        self.buffer = buffer
+        self.count = count
+        self._label_width = label_width
+        self.labels = np.frombuffer(
+            buffer,
+            dtype=f"S{max(label_width, 1)}",
+            count=count,
+            offset=labels_start,
+        )
+        self.ciphertexts = CiphertextRegion(
+            buffer, labels_start + count * label_width, count, ciphertext_width
+        )
+
+    @property
+    def label_width(self) -> int:
+        return self._label_width
+
+    def __getitem__(self, label: bytes) -> bytes:
+        index = self.__find(label)
+        if index < 0:
+            raise KeyError(label)
+        return self.ciphertexts.get(index)
+
+    def __contains__(self, label: object) -> bool:
+        return isinstance(label, bytes) and self.__find(label) >= 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for index in range(self.count):
+            yield self.__label_at(index)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __label_at(self, index: int) -> bytes:
+        start = CONTAINER_HEADER.size + index * self._label_width
+        return bytes(self.buffer[start : start + self._label_width])
+
+    def __find(self, label: bytes) -> int:
+        if len(label) != self._label_width or self.count <= 0:
+            return -1
+        index = int(np.searchsorted(self.labels, label))
+        if index < self.count and self.__label_at(index) == label:
+            return index
+        return -1
+
+
+@dataclass(frozen=True)
+class SortedContainerFormat(ContainerFormat):
+    """
+    Builds and loads :class:`SortedContainer` objects.
+    """
+
+    def dumps(self, items: Iterable[Tuple[bytes, bytes]]) -> bytes:
+        sorted_items = sorted(items, key=lambda item: item[0])
+        labels = [label for label, _ in sorted_items]
+        ciphertexts = [ciphertext for _, ciphertext in sorted_items]
+        label_width = check_label_widths(labels)
+        for previous_label, label in zip(labels, labels[1:]):
+            if previous_label == label:
+                raise ValueError("labels must be distinct")
+
+        ciphertext_width, ciphertext_region = pack_ciphertexts(
+            ciphertexts, CONTAINER_HEADER.size + len(labels) * label_width
+        )
+
+        return b"".join(
+            [
+                pack_header(
+                    ContainerKind.SORTED,
+                    SORTED_CONTAINER_VERSION,
+                    label_width,
+                    len(labels),
+                    ciphertext_width,
+                ),
+                *labels,
+                *ciphertext_region,
+            ]
+        )
+
+    def loads(self, buffer: Buffer) -> SortedContainer:
+        return SortedContainer(buffer)
@@ -17,7 +17,7 @@
 from abc import ABC, abstractmethod
 
 
-from typing import Generic, Optional, TypeVar
+from typing import Any, BinaryIO, Generic, Iterable, Optional, TypeVar
 
 
 KeyType = TypeVar("KeyType")
@@ -60,6 +60,36 @@ class EDS(
         """
         ...
 
+    @abstractmethod
+    def build_plaintext_ds(self, entries: Iterable[Any]) -> PlaintextInputType:
+        """
+        Builds the plaintext data structure with the given entries (e.g. the
+        (key, value) pairs of a dictionary), as accepted by :func:`encrypt`.
+
+        :param entries: the entries of the plaintext structure
+        :return: the plaintext structure
+        """
+        ...
+
+    def encrypt_to(self, key: KeyType, entries: Iterable[Any], sink: BinaryIO) -> None:
+        """
+        Encrypts the plaintext data structure with the given entries (e.g.
+        the (key, value) pairs of a dictionary) with the given key, writing
+        the serialized encrypted data structure to :paramref:`sink`. The
+        bytes written can be passed to :func:`load_eds` just like the
+        output of :func:`encrypt`.
+
+        By default, the plaintext data structure is built with
+        :func:`build_plaintext_ds` and passed to :func:`encrypt`. Schemes
+        that can do better encrypt and write the entries as they are
+        produced, so the plaintext data structure never has to be built.
+
+        :param key: the key to encrypt with, as generated from :func:`generate_key`
+        :param entries: the entries of the plaintext structure to encrypt
+        :param sink: the binary file-like object to write to
+        """
+        sink.write(self.encrypt(key, self.build_plaintext_ds(entries)))
+
     @abstractmethod
     def load_eds(self, eds_bytes: bytes) -> EdsType:
         """
@@ -108,3 +138,37 @@ class EDS(
         :return: a list of plaintext values
         """
         ...
+
+
+class UpdatableEDS(
+    EDS[KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType],
+    Generic[KeyType, PlaintextInputType, EdsType, TokenInputType, ResolveOutputType],
+):
+    """
+    An interface representing an encrypted data structure scheme whose
+    encrypted data structures can be updated in place.
+    """
+
+    @abstractmethod
+    def encrypt_update(self, key: KeyType, entries: Iterable[Any]) -> bytes:
+        """
+        Encrypts new values for some entries of an encrypted data structure
+        previously created with the given key. The update is applied on the
+        server with :func:`apply_update`.
+
+        :param key: the key that the encrypted data structure was created with
+        :param entries: the entries to add or replace, as in :func:`encrypt_to`
+        :return: the serialized update
+        """
+        ...
+
+    @abstractmethod
+    def apply_update(self, eds: EdsType, update: bytes) -> None:
+        """
+        Applies an update from :func:`encrypt_update` to the given encrypted
+        data structure in place.
+
+        :param eds: the encrypted data structure from :func:`load_eds`
+        :param update: the serialized update
+        """
+        ...
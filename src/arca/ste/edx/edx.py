@@ -18,7 +18,7 @@ from abc import abstractmethod
 
 from ..eds import EDS
 
-from typing import Dict, Generic, Optional, TypeVar
+from typing import Iterable, Mapping, Generic, Optional, Tuple, TypeVar
 
 
 KeyType = TypeVar("KeyType")
@@ -28,7 +28,7 @@ DXValueType = TypeVar("DXValueType")
 
 
 class EDX(
-    EDS[KeyType, Dict[DXKeyType, DXValueType], EdsType, DXKeyType, DXValueType],
+    EDS[KeyType, Mapping[DXKeyType, DXValueType], EdsType, DXKeyType, DXValueType],
     Generic[KeyType, EdsType, DXKeyType, DXValueType],
 ):
     """
@@ -46,7 +46,7 @@ class EDX(
 
     @abstractmethod
     def encrypt(
-        self, key: KeyType, plaintext_ds: Dict[DXKeyType, DXValueType]
+        self, key: KeyType, plaintext_ds: Mapping[DXKeyType, DXValueType]
     ) -> bytes:
         """
         Encrypts the given plaintext dictionary with the given key
@@ -58,6 +58,11 @@ class EDX(
         """
         ...
 
+    def build_plaintext_ds(
+        self, entries: Iterable[Tuple[DXKeyType, DXValueType]]
+    ) -> Mapping[DXKeyType, DXValueType]:
+        return dict(entries)
+
     @abstractmethod
     def load_eds(self, eds_bytes: bytes) -> EdsType:
         """
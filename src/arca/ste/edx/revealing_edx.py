@@ -18,7 +18,7 @@ from abc import abstractmethod
 
 from ..revealing_eds import RevealingEDS
 
-from typing import Dict, Generic, Optional, TypeVar
+from typing import Iterable, Mapping, Generic, Optional, Tuple, TypeVar
 
 
 KeyType = TypeVar("KeyType")
@@ -29,7 +29,11 @@ DXValueType = TypeVar("DXValueType")
 
 class RevealingEDX(
     RevealingEDS[
-        KeyType, Dict[DXKeyType, DXValueType], EdsType, DXKeyType, Optional[DXValueType]
+        KeyType,
+        Mapping[DXKeyType, DXValueType],
+        EdsType,
+        DXKeyType,
+        Optional[DXValueType],
     ],
     Generic[KeyType, EdsType, DXKeyType, DXValueType],
 ):
@@ -48,7 +52,7 @@ class RevealingEDX(
 
     @abstractmethod
     def encrypt(
-        self, key: KeyType, plaintext_ds: Dict[DXKeyType, DXValueType]
+        self, key: KeyType, plaintext_ds: Mapping[DXKeyType, DXValueType]
     ) -> bytes:
         """
         Encrypts the given plaintext dictionary with the given key
@@ -60,6 +64,11 @@ class RevealingEDX(
         """
         ...
 
+    def build_plaintext_ds(
+        self, entries: Iterable[Tuple[DXKeyType, DXValueType]]
+    ) -> Mapping[DXKeyType, DXValueType]:
+        return dict(entries)
+
     @abstractmethod
     def load_eds(self, eds_bytes: bytes) -> EdsType:
         """
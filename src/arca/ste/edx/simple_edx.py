@@ -20,14 +20,32 @@ from ..symmetric_encryption import (
     SimpleSymmetricEncryptionScheme,
 )
 from ..hash_functions import HashFunctionScheme, SimpleHashFunctionScheme
+from ..containers import ContainerFormat
+from ..containers.container import (
+    dump_encrypted_ds,
+    dump_encrypted_ds_to,
+    load_encrypted_ds,
+)
+from ..parallel_encryption import encrypt_in_parallel, pack_shard, unpack_shard
 
 from .edx import EDX
-
-from typing import Dict, Generic, Optional, TypeVar
+from ..eds import UpdatableEDS
+
+from typing import (
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Generic,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from dataclasses import dataclass
-from tqdm import tqdm
+from functools import partial
 
-import pickle
 import os
 import enum
 
@@ -55,12 +73,24 @@ class SimpleEDXKeyPurpose(enum.IntEnum):
 
 @dataclass(frozen=True)
 class SimpleEDX(
-    EDX[bytes, Dict[bytes, bytes], DXKeyType, DXValueType],
+    EDX[bytes, Mapping[bytes, bytes], DXKeyType, DXValueType],
+    UpdatableEDS[
+        bytes,
+        Mapping[DXKeyType, DXValueType],
+        Mapping[bytes, bytes],
+        DXKeyType,
+        DXValueType,
+    ],
     Generic[DXKeyType, DXValueType],
 ):
     """
     Implements a simple encrypted dictionary scheme based on the Pi_bas
     encrypted multimap scheme from [CJJJKRS14].
+
+    By default, the encrypted dictionary is serialized as a pickled
+    :code:`dict`. If a :attr:`container_format` is given, it is serialized
+    as a flat container instead, which can be loaded (or memory-mapped
+    from a file) without deserializing every entry.
     """
 
     dx_key_serializer: Serializer[DXKeyType] = PickleSerializer()
@@ -68,35 +98,104 @@ class SimpleEDX(
     encryption_scheme: SymmetricEncryptionScheme = SimpleSymmetricEncryptionScheme()
     hashing_scheme: HashFunctionScheme = SimpleHashFunctionScheme()
     key_length: int = 16
+    container_format: Optional[ContainerFormat] = None
+    #: Number of entries whose labels and values are encrypted together in
+    #: a single call to the hashing and encryption schemes.
+    batch_size: int = 4096
+    #: Number of processes to encrypt with; see :func:`encrypt_in_parallel`.
+    num_processes: int = 1
 
     def generate_key(self) -> bytes:
         return bytes(os.urandom(self.key_length * 2))
 
-    def encrypt(self, key: bytes, plaintext_dx: Dict[DXKeyType, DXValueType]) -> bytes:
+    def encrypt(
+        self, key: bytes, plaintext_dx: Mapping[DXKeyType, DXValueType]
+    ) -> bytes:
+        encrypted_ds = dict(
+            self._encrypt_entries(key, plaintext_dx.items(), len(plaintext_dx))
+        )
+        return dump_encrypted_ds(encrypted_ds, self.container_format)
+
+    def encrypt_to(
+        self,
+        key: bytes,
+        entries: Iterable[Tuple[DXKeyType, DXValueType]],
+        sink: BinaryIO,
+    ) -> None:
+        dump_encrypted_ds_to(
+            self._encrypt_entries(key, entries), sink, self.container_format
+        )
+
+    def encrypt_update(
+        self, key: bytes, entries: Iterable[Tuple[DXKeyType, DXValueType]]
+    ) -> bytes:
         hmac_key = self._derive_key_for_purpose(key, SimpleEDXKeyPurpose.HMAC)
         symmetric_key = self._derive_key_for_purpose(key, SimpleEDXKeyPurpose.ENCRYPT)
+        return pack_shard(self._encrypt_chunk(hmac_key, symmetric_key, list(entries)))
+
+    def apply_update(self, eds: Mapping[bytes, bytes], update: bytes) -> None:
+        if not isinstance(eds, MutableMapping):
+            raise TypeError("encrypted dictionary is read-only")
+        eds.update(unpack_shard(update))
+
+    def _encrypt_entries(
+        self,
+        key: bytes,
+        entries: Iterable[Tuple[DXKeyType, DXValueType]],
+        num_entries: Optional[int] = None,
+    ) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Encrypts the given (key, value) pairs of a plaintext dictionary.
+        Used internally by :func:`encrypt` and :func:`encrypt_to`.
 
-        encrypted_ds = {}
-        for label, value in tqdm(plaintext_dx.items(), leave=False):
-            ct_label = self.hashing_scheme.hmac(
-                hmac_key, self.dx_key_serializer.save(label)
-            )
-            ct_value = self.encryption_scheme.encrypt(
-                symmetric_key, self.dx_value_serializer.save(value)
-            )
-            encrypted_ds[ct_label] = ct_value
-
-        return pickle.dumps(encrypted_ds)
+        :param key: the key generated in :func:`generate_key`
+        :param entries: the (key, value) pairs to encrypt
+        :param num_entries: the number of entries, if known
+        :return: an iterator over the (label, ciphertext) pair of each entry
+        """
+        hmac_key = self._derive_key_for_purpose(key, SimpleEDXKeyPurpose.HMAC)
+        symmetric_key = self._derive_key_for_purpose(key, SimpleEDXKeyPurpose.ENCRYPT)
+        return encrypt_in_parallel(
+            partial(self._encrypt_chunk, hmac_key, symmetric_key),
+            entries,
+            num_processes=self.num_processes,
+            batch_size=self.batch_size,
+            num_entries=num_entries,
+        )
+
+    def _encrypt_chunk(
+        self,
+        hmac_key: bytes,
+        symmetric_key: bytes,
+        chunk: List[Tuple[DXKeyType, DXValueType]],
+    ) -> List[Tuple[bytes, bytes]]:
+        """
+        Encrypts a chunk of the plaintext dictionary. Used internally by
+        :func:`encrypt`, possibly in a worker process.
 
-    def load_eds(self, eds_bytes: bytes) -> Dict[bytes, bytes]:
-        eds: Dict[bytes, bytes] = pickle.loads(eds_bytes)
-        return eds
+        :param hmac_key: the key to compute labels with
+        :param symmetric_key: the key to encrypt values with
+        :param chunk: the (key, value) pairs to encrypt
+        :return: the (label, ciphertext) pair of each entry
+        """
+        ct_labels = self.hashing_scheme.hmac_batch(
+            hmac_key, [self.dx_key_serializer.save(label) for label, _ in chunk]
+        )
+        ct_values = self.encryption_scheme.encrypt_batch(
+            symmetric_key,
+            [self.dx_value_serializer.save(value) for _, value in chunk],
+            labels=ct_labels,
+        )
+        return list(zip(ct_labels, ct_values))
+
+    def load_eds(self, eds_bytes: bytes) -> Mapping[bytes, bytes]:
+        return load_encrypted_ds(eds_bytes, self.container_format)
 
     def token(self, key: bytes, keyword: DXKeyType) -> bytes:
         hmac_key = self._derive_key_for_purpose(key, SimpleEDXKeyPurpose.HMAC)
         return self.hashing_scheme.hmac(hmac_key, self.dx_key_serializer.save(keyword))
 
-    def query(self, token: bytes, eds: Dict[bytes, bytes]) -> Optional[bytes]:
+    def query(self, token: bytes, eds: Mapping[bytes, bytes]) -> Optional[bytes]:
         if token not in eds:
             return None
         return eds[token]
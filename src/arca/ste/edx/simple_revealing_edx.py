@@ -19,16 +19,22 @@ from ..symmetric_encryption import (
     SymmetricEncryptionScheme,
     SimpleSymmetricEncryptionScheme,
 )
-from ..key_derivation import KeyDerivationScheme, SimpleKeyDerivationScheme
+from ..key_derivation import (
+    KeyDerivationScheme,
+    SimpleKeyDerivationScheme,
+    TokenKeySchedule,
+)
 from ..hash_functions import HashFunctionScheme, SimpleHashFunctionScheme
+from ..containers import ContainerFormat
+from ..containers.container import dump_encrypted_ds, load_encrypted_ds
+from ..parallel_encryption import encrypt_in_parallel
 
 from .revealing_edx import RevealingEDX
 
-from typing import Dict, Generic, Optional, TypeVar
-from dataclasses import dataclass
-from tqdm import tqdm
+from typing import List, Mapping, Generic, Optional, Tuple, TypeVar
+from dataclasses import dataclass, field
+from functools import partial
 
-import pickle
 import os
 
 
@@ -38,12 +44,17 @@ DXValueType = TypeVar("DXValueType")
 
 @dataclass(frozen=True)
 class SimpleRevealingEDX(
-    RevealingEDX[bytes, Dict[bytes, bytes], DXKeyType, DXValueType],
+    RevealingEDX[bytes, Mapping[bytes, bytes], DXKeyType, DXValueType],
     Generic[DXKeyType, DXValueType],
 ):
     """
     Implements a simple encrypted dictionary scheme based on the Pi_bas
     encrypted multimap scheme from [CJJJKRS14].
+
+    The label of each entry and the key that its value is encrypted with
+    are both derived from its search token by a :class:`TokenKeySchedule`.
+    The derived keys of the :attr:`token_cache_size` most recently queried
+    tokens are cached, so repeated queries skip the key derivation.
     """
 
     dx_key_serializer: Serializer[DXKeyType] = PickleSerializer()
@@ -52,28 +63,67 @@ class SimpleRevealingEDX(
     hashing_scheme: HashFunctionScheme = SimpleHashFunctionScheme()
     key_derivation_scheme: KeyDerivationScheme = SimpleKeyDerivationScheme()
     key_length: int = 16
+    container_format: Optional[ContainerFormat] = None
+    #: Number of entries encrypted together in each chunk.
+    batch_size: int = 4096
+    #: Number of processes to encrypt with; see :func:`encrypt_in_parallel`.
+    num_processes: int = 1
+    #: Number of recently queried tokens whose derived keys are cached.
+    token_cache_size: int = 1024
+    key_schedule: TokenKeySchedule = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "key_schedule",
+            TokenKeySchedule(
+                self.key_derivation_scheme,
+                label_purpose="hmac".encode(),
+                value_purpose="value".encode(),
+                cache_size=self.token_cache_size,
+            ),
+        )
 
     def generate_key(self) -> bytes:
         return bytes(os.urandom(self.key_length))
 
-    def encrypt(self, key: bytes, plaintext_dx: Dict[DXKeyType, DXValueType]) -> bytes:
-        encrypted_ds = {}
-        for label, value in tqdm(plaintext_dx.items(), leave=False):
-            token = self.token(key, label)
-
-            ct_label = self.key_derivation_scheme.hkdf(token, "hmac".encode())
-
-            symmetric_key = self.key_derivation_scheme.hkdf(token, "value".encode())
+    def encrypt(
+        self, key: bytes, plaintext_dx: Mapping[DXKeyType, DXValueType]
+    ) -> bytes:
+        encrypted_ds = dict(
+            encrypt_in_parallel(
+                partial(self._encrypt_chunk, key),
+                plaintext_dx.items(),
+                num_processes=self.num_processes,
+                batch_size=self.batch_size,
+                num_entries=len(plaintext_dx),
+            )
+        )
+        return dump_encrypted_ds(encrypted_ds, self.container_format)
+
+    def _encrypt_chunk(
+        self, key: bytes, chunk: List[Tuple[DXKeyType, DXValueType]]
+    ) -> List[Tuple[bytes, bytes]]:
+        """
+        Encrypts a chunk of the plaintext dictionary. Used internally by
+        :func:`encrypt`, possibly in a worker process.
+
+        :param key: the key generated in :func:`generate_key`
+        :param chunk: the (key, value) pairs to encrypt
+        :return: the (label, ciphertext) pair of each entry
+        """
+        encrypted_pairs = []
+        for label, value in chunk:
+            token_keys = self.key_schedule.derive(self.token(key, label))
             ct_value = self.encryption_scheme.encrypt(
-                symmetric_key, self.dx_value_serializer.save(value)
+                token_keys.value_key, self.dx_value_serializer.save(value)
             )
-            encrypted_ds[ct_label] = ct_value
-
-        return pickle.dumps(encrypted_ds)
+            # Each token has a single entry, so its label key is the label:
+            encrypted_pairs.append((token_keys.label_key, ct_value))
+        return encrypted_pairs
 
-    def load_eds(self, eds_bytes: bytes) -> Dict[bytes, bytes]:
-        eds: Dict[bytes, bytes] = pickle.loads(eds_bytes)
-        return eds
+    def load_eds(self, eds_bytes: bytes) -> Mapping[bytes, bytes]:
+        return load_encrypted_ds(eds_bytes, self.container_format)
 
     def token(self, key: bytes, keyword: DXKeyType) -> bytes:
         return self.key_derivation_scheme.hkdf(
@@ -81,12 +131,12 @@ class SimpleRevealingEDX(
             self.dx_key_serializer.save(keyword),
         )
 
-    def query(self, token: bytes, eds: Dict[bytes, bytes]) -> Optional[DXValueType]:
-        ct_label = self.key_derivation_scheme.hkdf(token, "hmac".encode())
-        if ct_label not in eds:
+    def query(self, token: bytes, eds: Mapping[bytes, bytes]) -> Optional[DXValueType]:
+        token_keys = self.key_schedule.get(token)
+        ct_value = eds.get(token_keys.label_key)
+        if ct_value is None:
             return None
 
-        symmetric_key = self.key_derivation_scheme.hkdf(token, "value".encode())
-        ciphertext = self.encryption_scheme.decrypt(symmetric_key, eds[ct_label])
+        ciphertext = self.encryption_scheme.decrypt(token_keys.value_key, ct_value)
         unserialized_value: DXValueType = self.dx_value_serializer.load(ciphertext)
         return unserialized_value
@@ -14,10 +14,11 @@
 ## limitations under the License.
 ##
 
-__all__ = ["Multimap", "EMM", "PiBaseEMM", "PiBaseRevealingEMM"]
+__all__ = ["Multimap", "EMM", "PiBaseEMM", "PiBasePackedEMM", "PiBaseRevealingEMM"]
 
 from .multimap import Multimap
 
 from .emm import EMM
 from .pi_base_emm import PiBaseEMM
+from .pi_base_packed_emm import PiBasePackedEMM
 from .pi_base_revealing_emm import PiBaseRevealingEMM
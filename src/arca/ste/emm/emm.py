@@ -19,7 +19,7 @@ from ..eds import EDS
 from .multimap import Multimap
 
 from abc import abstractmethod
-from typing import Generic, List, Optional, TypeVar
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
 
 
 KeyType = TypeVar("KeyType")
@@ -61,6 +61,15 @@ class EMM(
         """
         ...
 
+    def build_plaintext_ds(
+        self, entries: Iterable[Tuple[MMKeyType, List[MMValueType]]]
+    ) -> Multimap[MMKeyType, MMValueType]:
+        plaintext_mm: Multimap[MMKeyType, MMValueType] = Multimap()
+        for keyword, values in entries:
+            for value in values:
+                plaintext_mm.set(keyword, value)
+        return plaintext_mm
+
     @abstractmethod
     def load_eds(self, eds_bytes: bytes) -> EdsType:
         """
@@ -18,6 +18,7 @@ from typing import Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
 from collections import defaultdict
 from dataclasses import dataclass, field
 
+
 KeyType = TypeVar("KeyType")
 ValueType = TypeVar("ValueType")
 
@@ -82,3 +83,11 @@ class Multimap(Generic[KeyType, ValueType]):
         :returns: an iterator
         """
         return iter(self.multimap.items())
+
+    def __len__(self) -> int:
+        """
+        Returns the number of keys in the :class:`Multimap`.
+
+        :returns: the number of keys
+        """
+        return len(self.multimap)
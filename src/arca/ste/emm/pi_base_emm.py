@@ -20,11 +20,29 @@ from ..symmetric_encryption import (
     SimpleSymmetricEncryptionScheme,
 )
 from ..hash_functions import HashFunctionScheme, SimpleHashFunctionScheme
+from ..containers import ContainerFormat
+from ..containers.container import (
+    dump_encrypted_ds,
+    dump_encrypted_ds_to,
+    load_encrypted_ds,
+)
+from ..parallel_encryption import encrypt_in_parallel
 
 from .multimap import Multimap
 from .emm import EMM
 
-from typing import Dict, Generic, List, TypeVar
+from typing import (
+    BinaryIO,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from functools import partial
 
 import pickle
 import os
@@ -52,7 +70,7 @@ class PiBaseEMMKeyPurpose(enum.IntEnum):
 
 @dataclass(frozen=True)
 class PiBaseEMM(
-    EMM[bytes, Dict[bytes, bytes], MMKeyType, MMValueType],
+    EMM[bytes, Mapping[bytes, bytes], MMKeyType, MMValueType],
     Generic[MMKeyType, MMValueType],
 ):
     """
@@ -64,6 +82,12 @@ class PiBaseEMM(
     encryption_scheme: SymmetricEncryptionScheme = SimpleSymmetricEncryptionScheme()
     hashing_scheme: HashFunctionScheme = SimpleHashFunctionScheme()
     key_length: int = 16
+    container_format: Optional[ContainerFormat] = None
+    #: Number of keywords whose values are encrypted together in a single
+    #: call to the hashing and encryption schemes.
+    batch_size: int = 4096
+    #: Number of processes to encrypt with; see :func:`encrypt_in_parallel`.
+    num_processes: int = 1
 
     def generate_key(self) -> bytes:
         return bytes(os.urandom(self.key_length * 2))
@@ -71,32 +95,88 @@ class PiBaseEMM(
     def encrypt(
         self, key: bytes, plaintext_mm: Multimap[MMKeyType, MMValueType]
     ) -> bytes:
-        hmac_key = self.__derive_key_for_purpose(key, PiBaseEMMKeyPurpose.HMAC)
-        symmetric_key = self.__derive_key_for_purpose(key, PiBaseEMMKeyPurpose.ENCRYPT)
-
-        encrypted_ds = {}
-        for keyword, values in plaintext_mm:
-            token = self.hashing_scheme.hmac(
-                hmac_key, self.mm_key_serializer.save(keyword)
-            )
-            for index, value in enumerate(values):
-                ct_label = self.hashing_scheme.hash(token + bytes(index))
-                ct_value = self.encryption_scheme.encrypt(
-                    symmetric_key, self.mm_value_serializer.save(value)
-                )
-                encrypted_ds[ct_label] = ct_value
+        encrypted_ds = dict(self._encrypt_entries(key, plaintext_mm, len(plaintext_mm)))
+        return dump_encrypted_ds(encrypted_ds, self.container_format)
+
+    def encrypt_to(
+        self,
+        key: bytes,
+        entries: Iterable[Tuple[MMKeyType, List[MMValueType]]],
+        sink: BinaryIO,
+    ) -> None:
+        dump_encrypted_ds_to(
+            self._encrypt_entries(key, entries), sink, self.container_format
+        )
+
+    def _encrypt_entries(
+        self,
+        key: bytes,
+        entries: Iterable[Tuple[MMKeyType, List[MMValueType]]],
+        num_entries: Optional[int] = None,
+    ) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Encrypts the given (keyword, values) pairs of a plaintext multimap.
+        Used internally by :func:`encrypt` and :func:`encrypt_to`.
 
-        return pickle.dumps(encrypted_ds)
+        :param key: the key generated in :func:`generate_key`
+        :param entries: the (keyword, values) pairs to encrypt
+        :param num_entries: the number of keywords, if known
+        :return: an iterator over the (label, ciphertext) pairs
+        """
+        hmac_key = self._derive_key_for_purpose(key, PiBaseEMMKeyPurpose.HMAC)
+        symmetric_key = self._derive_key_for_purpose(key, PiBaseEMMKeyPurpose.ENCRYPT)
+        return encrypt_in_parallel(
+            partial(self._encrypt_chunk, hmac_key, symmetric_key),
+            entries,
+            num_processes=self.num_processes,
+            batch_size=self.batch_size,
+            num_entries=num_entries,
+        )
+
+    def _encrypt_chunk(
+        self,
+        hmac_key: bytes,
+        symmetric_key: bytes,
+        chunk: List[Tuple[MMKeyType, List[MMValueType]]],
+    ) -> List[Tuple[bytes, bytes]]:
+        """
+        Encrypts a chunk of the plaintext multimap. Used internally by
+        :func:`encrypt`, possibly in a worker process.
 
-    def load_eds(self, eds_bytes: bytes) -> Dict[bytes, bytes]:
-        eds: Dict[bytes, bytes] = pickle.loads(eds_bytes)
-        return eds
+        :param hmac_key: the key to compute search tokens with
+        :param symmetric_key: the key to encrypt values with
+        :param chunk: the (keyword, values) pairs to encrypt
+        :return: the (label, ciphertext) pair of each value
+        """
+        tokens = self.hashing_scheme.hmac_batch(
+            hmac_key, [self.mm_key_serializer.save(keyword) for keyword, _ in chunk]
+        )
+        ct_labels = self.hashing_scheme.hash_batch(
+            [
+                token + bytes(index)
+                for token, (_, values) in zip(tokens, chunk)
+                for index in range(len(values))
+            ]
+        )
+        ct_values = self.encryption_scheme.encrypt_batch(
+            symmetric_key,
+            [
+                self.mm_value_serializer.save(value)
+                for _, values in chunk
+                for value in values
+            ],
+            labels=ct_labels,
+        )
+        return list(zip(ct_labels, ct_values))
+
+    def load_eds(self, eds_bytes: bytes) -> Mapping[bytes, bytes]:
+        return load_encrypted_ds(eds_bytes, self.container_format)
 
     def token(self, key: bytes, keyword: MMKeyType) -> bytes:
-        hmac_key = self.__derive_key_for_purpose(key, PiBaseEMMKeyPurpose.HMAC)
+        hmac_key = self._derive_key_for_purpose(key, PiBaseEMMKeyPurpose.HMAC)
         return self.hashing_scheme.hmac(hmac_key, self.mm_key_serializer.save(keyword))
 
-    def query(self, token: bytes, eds: Dict[bytes, bytes]) -> bytes:
+    def query(self, token: bytes, eds: Mapping[bytes, bytes]) -> bytes:
         results: List[bytes] = []
 
         # Iterate until we can't find any more records:
@@ -111,18 +191,18 @@ class PiBaseEMM(
         return pickle.dumps(results)
 
     def resolve(self, key: bytes, response: bytes) -> List[MMValueType]:
-        symmetric_key = self.__derive_key_for_purpose(key, PiBaseEMMKeyPurpose.ENCRYPT)
+        symmetric_key = self._derive_key_for_purpose(key, PiBaseEMMKeyPurpose.ENCRYPT)
 
         unserialized_response: List[bytes] = pickle.loads(response)
-        pt_values: List[MMValueType] = []
-        for ct_value in unserialized_response:
-            pt_value = self.encryption_scheme.decrypt(symmetric_key, ct_value)
-            unserialized_value: MMValueType = self.mm_value_serializer.load(pt_value)
-            pt_values.append(unserialized_value)
-
+        pt_values: List[MMValueType] = [
+            self.mm_value_serializer.load(pt_value)
+            for pt_value in self.encryption_scheme.decrypt_batch(
+                symmetric_key, unserialized_response
+            )
+        ]
         return pt_values
 
-    def __derive_key_for_purpose(
+    def _derive_key_for_purpose(
         self, base_key: bytes, purpose: PiBaseEMMKeyPurpose
     ) -> bytes:
         """
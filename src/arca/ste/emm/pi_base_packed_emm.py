@@ -0,0 +1,186 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from .pi_base_emm import PiBaseEMM, PiBaseEMMKeyPurpose
+
+from typing import Generic, List, Mapping, Sequence, Tuple, TypeVar
+
+import math
+import pickle
+import struct
+
+from dataclasses import dataclass
+
+
+MMKeyType = TypeVar("MMKeyType")
+MMValueType = TypeVar("MMValueType")
+
+#: Fixed-width encoding of the index of a block, appended to a search token
+#: to derive the label of that block.
+BLOCK_INDEX = struct.Struct("<Q")
+
+#: Encoding of the (masked) number of blocks stored before the first block
+#: of each keyword.
+BLOCK_COUNT = struct.Struct("<Q")
+
+#: Encoding of the length of each serialized value within a block.
+VALUE_LENGTH = struct.Struct("<I")
+
+#: Appended to a search token to derive the mask of its block count. Its
+#: length differs from that of :data:`BLOCK_INDEX`, so the mask can never
+#: coincide with a block label.
+BLOCK_COUNT_MASK_SUFFIX = b"count"
+
+
+@dataclass(frozen=True)
+class PiBasePackedEMM(
+    PiBaseEMM[MMKeyType, MMValueType],
+    Generic[MMKeyType, MMValueType],
+):
+    """
+    A variant of the Pi_bas scheme from [CJJJKRS14] that packs up to
+    :attr:`block_size` values of a keyword into each ciphertext.
+
+    The i-th block of a keyword is stored under the label
+    :code:`hash(token || i)`, where :code:`i` is a fixed-width counter. The
+    first block is additionally prefixed with the number of blocks, masked
+    with :code:`hash(token || "count")` so that it is only revealed to the
+    holder of the search token. A query for a keyword with :code:`n` values
+    therefore costs :code:`ceil(n / block_size)` lookups (one lookup for a
+    keyword that does not exist), and :func:`resolve` decrypts all of the
+    blocks in one batch.
+    """
+
+    #: Maximum number of values packed into each ciphertext.
+    block_size: int = 64
+
+    def __post_init__(self) -> None:
+        if self.block_size <= 0:
+            raise ValueError("block_size must be positive")
+
+    def _encrypt_chunk(
+        self,
+        hmac_key: bytes,
+        symmetric_key: bytes,
+        chunk: List[Tuple[MMKeyType, List[MMValueType]]],
+    ) -> List[Tuple[bytes, bytes]]:
+        tokens = self.hashing_scheme.hmac_batch(
+            hmac_key, [self.mm_key_serializer.save(keyword) for keyword, _ in chunk]
+        )
+        masks = self.hashing_scheme.hash_batch(
+            [token + BLOCK_COUNT_MASK_SUFFIX for token in tokens]
+        )
+
+        label_inputs: List[bytes] = []
+        blocks: List[bytes] = []
+        # Positions in `blocks` of the first block of each keyword, along
+        # with the masked block count to prefix it with:
+        first_blocks: List[Tuple[int, bytes]] = []
+        for token, mask, (_, values) in zip(tokens, masks, chunk):
+            num_blocks = math.ceil(len(values) / self.block_size)
+            if num_blocks > 0:
+                first_blocks.append(
+                    (len(blocks), self._mask_block_count(num_blocks, mask))
+                )
+            for block_index in range(num_blocks):
+                start = block_index * self.block_size
+                label_inputs.append(token + BLOCK_INDEX.pack(block_index))
+                blocks.append(
+                    self._pack_block(
+                        [
+                            self.mm_value_serializer.save(value)
+                            for value in values[start : start + self.block_size]
+                        ]
+                    )
+                )
+
+        ct_labels = self.hashing_scheme.hash_batch(label_inputs)
+        ct_blocks = self.encryption_scheme.encrypt_batch(
+            symmetric_key, blocks, labels=ct_labels
+        )
+        for position, masked_count in first_blocks:
+            ct_blocks[position] = masked_count + ct_blocks[position]
+        return list(zip(ct_labels, ct_blocks))
+
+    def query(self, token: bytes, eds: Mapping[bytes, bytes]) -> bytes:
+        first_label = self.hashing_scheme.hash(token + BLOCK_INDEX.pack(0))
+        first_entry = eds.get(first_label)
+        if first_entry is None:
+            return pickle.dumps([])
+
+        mask = self.hashing_scheme.hash(token + BLOCK_COUNT_MASK_SUFFIX)
+        num_blocks = self._unmask_block_count(first_entry[: BLOCK_COUNT.size], mask)
+
+        results = [first_entry[BLOCK_COUNT.size :]]
+        for ct_label in self.hashing_scheme.hash_batch(
+            [token + BLOCK_INDEX.pack(index) for index in range(1, num_blocks)]
+        ):
+            results.append(eds[ct_label])
+        return pickle.dumps(results)
+
+    def resolve(self, key: bytes, response: bytes) -> List[MMValueType]:
+        symmetric_key = self._derive_key_for_purpose(key, PiBaseEMMKeyPurpose.ENCRYPT)
+
+        unserialized_response: List[bytes] = pickle.loads(response)
+        pt_values: List[MMValueType] = [
+            self.mm_value_serializer.load(pt_value)
+            for block in self.encryption_scheme.decrypt_batch(
+                symmetric_key, unserialized_response
+            )
+            for pt_value in self._unpack_block(block)
+        ]
+        return pt_values
+
+    @staticmethod
+    def _pack_block(values: Sequence[bytes]) -> bytes:
+        """
+        Concatenates the given serialized values, each prefixed with its
+        length.
+
+        :param values: the serialized values of a block
+        :return: the plaintext of the block
+        """
+        return b"".join(VALUE_LENGTH.pack(len(value)) + value for value in values)
+
+    @staticmethod
+    def _unpack_block(block: bytes) -> List[bytes]:
+        """
+        Splits a block created by :func:`_pack_block` back into its values.
+
+        :param block: the plaintext of a block
+        :return: the serialized values of the block
+        """
+        values = []
+        start = 0
+        while start < len(block):
+            (length,) = VALUE_LENGTH.unpack_from(block, start)
+            start += VALUE_LENGTH.size
+            values.append(block[start : start + length])
+            start += length
+        return values
+
+    @staticmethod
+    def _mask_block_count(num_blocks: int, mask: bytes) -> bytes:
+        masked_count = BLOCK_COUNT.unpack(mask[: BLOCK_COUNT.size])[0] ^ num_blocks
+        return BLOCK_COUNT.pack(masked_count)
+
+    @staticmethod
+    def _unmask_block_count(masked_count: bytes, mask: bytes) -> int:
+        num_blocks: int = (
+            BLOCK_COUNT.unpack(masked_count)[0]
+            ^ BLOCK_COUNT.unpack(mask[: BLOCK_COUNT.size])[0]
+        )
+        return num_blocks
@@ -20,30 +20,48 @@ from ..symmetric_encryption import (
     SimpleSymmetricEncryptionScheme,
 )
 from ..hash_functions import HashFunctionScheme, SimpleHashFunctionScheme
-from ..key_derivation import KeyDerivationScheme, SimpleKeyDerivationScheme
+from ..containers import ContainerFormat
+from ..containers.container import dump_encrypted_ds, load_encrypted_ds
+from ..key_derivation import (
+    KeyDerivationScheme,
+    SimpleKeyDerivationScheme,
+    TokenKeySchedule,
+)
+from ..parallel_encryption import encrypt_in_parallel
 
 from .multimap import Multimap
 from .revealing_emm import RevealingEMM
 
-from typing import Dict, Generic, List, TypeVar
+from typing import Generic, List, Mapping, Optional, Tuple, TypeVar
+from functools import partial
 
-import pickle
 import os
+import struct
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 MMKeyType = TypeVar("MMKeyType")
 MMValueType = TypeVar("MMValueType")
 
+#: Layout of the index of a value within its keyword's list of values, as
+#: authenticated into the value's label.
+LABEL_INDEX = struct.Struct("<Q")
+
 
 @dataclass(frozen=True)
 class PiBaseRevealingEMM(
-    RevealingEMM[bytes, Dict[bytes, bytes], MMKeyType, MMValueType],
+    RevealingEMM[bytes, Mapping[bytes, bytes], MMKeyType, MMValueType],
     Generic[MMKeyType, MMValueType],
 ):
     """
     Implements the Pi_bas scheme from [CJJJKRS14].
+
+    The label key and value key of each keyword are derived from its search
+    token once by a :class:`TokenKeySchedule`, rather than once per value.
+    The label of the i-th value is the HMAC of i under the label key. The
+    keys of the :attr:`token_cache_size` most recently queried tokens are
+    cached, so repeated queries skip the key derivation.
     """
 
     mm_key_serializer: Serializer[MMKeyType] = PickleSerializer()
@@ -52,6 +70,26 @@ class PiBaseRevealingEMM(
     hashing_scheme: HashFunctionScheme = SimpleHashFunctionScheme()
     key_length: int = 16
     key_derivation_scheme: KeyDerivationScheme = SimpleKeyDerivationScheme()
+    container_format: Optional[ContainerFormat] = None
+    #: Number of keywords encrypted together in each chunk.
+    batch_size: int = 4096
+    #: Number of processes to encrypt with; see :func:`encrypt_in_parallel`.
+    num_processes: int = 1
+    #: Number of recently queried tokens whose derived keys are cached.
+    token_cache_size: int = 1024
+    key_schedule: TokenKeySchedule = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "key_schedule",
+            TokenKeySchedule(
+                self.key_derivation_scheme,
+                label_purpose="label".encode(),
+                value_purpose="value".encode(),
+                cache_size=self.token_cache_size,
+            ),
+        )
 
     def generate_key(self) -> bytes:
         return bytes(os.urandom(self.key_length))
@@ -59,22 +97,45 @@ class PiBaseRevealingEMM(
     def encrypt(
         self, key: bytes, plaintext_mm: Multimap[MMKeyType, MMValueType]
     ) -> bytes:
-        encrypted_ds = {}
-        for keyword, values in plaintext_mm:
-            token = self.token(key, keyword)
-            for index, value in enumerate(values):
-                ct_label = self.key_derivation_scheme.hkdf(token, bytes(index))
-                symmetric_key = self.key_derivation_scheme.hkdf(token, "value".encode())
-                ct_value = self.encryption_scheme.encrypt(
-                    symmetric_key, self.mm_value_serializer.save(value)
-                )
-                encrypted_ds[ct_label] = ct_value
-
-        return pickle.dumps(encrypted_ds)
-
-    def load_eds(self, eds_bytes: bytes) -> Dict[bytes, bytes]:
-        eds: Dict[bytes, bytes] = pickle.loads(eds_bytes)
-        return eds
+        encrypted_ds = dict(
+            encrypt_in_parallel(
+                partial(self._encrypt_chunk, key),
+                plaintext_mm,
+                num_processes=self.num_processes,
+                batch_size=self.batch_size,
+                num_entries=len(plaintext_mm),
+            )
+        )
+        return dump_encrypted_ds(encrypted_ds, self.container_format)
+
+    def _encrypt_chunk(
+        self, key: bytes, chunk: List[Tuple[MMKeyType, List[MMValueType]]]
+    ) -> List[Tuple[bytes, bytes]]:
+        """
+        Encrypts a chunk of the plaintext multimap. Used internally by
+        :func:`encrypt`, possibly in a worker process.
+
+        :param key: the key generated in :func:`generate_key`
+        :param chunk: the (keyword, values) pairs to encrypt
+        :return: the (label, ciphertext) pair of each value
+        """
+        encrypted_pairs: List[Tuple[bytes, bytes]] = []
+        for keyword, values in chunk:
+            token_keys = self.key_schedule.derive(self.token(key, keyword))
+            ct_labels = self.hashing_scheme.hmac_batch(
+                token_keys.label_key,
+                [LABEL_INDEX.pack(index) for index in range(len(values))],
+            )
+            ct_values = self.encryption_scheme.encrypt_batch(
+                token_keys.value_key,
+                [self.mm_value_serializer.save(value) for value in values],
+                labels=ct_labels,
+            )
+            encrypted_pairs.extend(zip(ct_labels, ct_values))
+        return encrypted_pairs
+
+    def load_eds(self, eds_bytes: bytes) -> Mapping[bytes, bytes]:
+        return load_encrypted_ds(eds_bytes, self.container_format)
 
     def token(self, key: bytes, keyword: MMKeyType) -> bytes:
         return self.key_derivation_scheme.hkdf(
@@ -82,22 +143,26 @@ class PiBaseRevealingEMM(
             self.mm_key_serializer.save(keyword),
         )
 
-    def query(self, token: bytes, eds: Dict[bytes, bytes]) -> List[MMValueType]:
+    def query(self, token: bytes, eds: Mapping[bytes, bytes]) -> List[MMValueType]:
+        token_keys = self.key_schedule.get(token)
         results: List[bytes] = []
 
         # Iterate until we can't find any more records:
         index = 0
         while True:
-            ct_label = self.key_derivation_scheme.hkdf(token, bytes(index))
-            if ct_label not in eds:
+            ct_label = self.hashing_scheme.hmac(
+                token_keys.label_key, LABEL_INDEX.pack(index)
+            )
+            ct_value = eds.get(ct_label)
+            if ct_value is None:
                 break
-            symmetric_key = self.key_derivation_scheme.hkdf(token, "value".encode())
-            print(eds[ct_label])
-            results.append(self.encryption_scheme.decrypt(symmetric_key, eds[ct_label]))
+            results.append(ct_value)
             index += 1
 
         pt_values: List[MMValueType] = []
-        for pt_value in results:
+        for pt_value in self.encryption_scheme.decrypt_batch(
+            token_keys.value_key, results
+        ):
             unserialized_value: MMValueType = self.mm_value_serializer.load(pt_value)
             pt_values.append(unserialized_value)
 
@@ -19,7 +19,7 @@ from ..revealing_eds import RevealingEDS
 from .multimap import Multimap
 
 from abc import abstractmethod
-from typing import Generic, List, TypeVar
+from typing import Generic, Iterable, List, Tuple, TypeVar
 
 
 KeyType = TypeVar("KeyType")
@@ -61,6 +61,15 @@ class RevealingEMM(
         """
         ...
 
+    def build_plaintext_ds(
+        self, entries: Iterable[Tuple[MMKeyType, List[MMValueType]]]
+    ) -> Multimap[MMKeyType, MMValueType]:
+        plaintext_mm: Multimap[MMKeyType, MMValueType] = Multimap()
+        for keyword, values in entries:
+            for value in values:
+                plaintext_mm.set(keyword, value)
+        return plaintext_mm
+
     @abstractmethod
     def load_eds(self, eds_bytes: bytes) -> EdsType:
         """
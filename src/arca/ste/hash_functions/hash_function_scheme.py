@@ -16,6 +16,8 @@
 
 from abc import ABC, abstractmethod
 
+from typing import List, Sequence
+
 
 class HashFunctionScheme(ABC):
     """
@@ -44,3 +46,24 @@ class HashFunctionScheme(ABC):
         :return: an HMAC
         """
         ...
+
+    def hash_batch(self, plaintexts: Sequence[bytes]) -> List[bytes]:
+        """
+        Computes a hash over each of the given plaintexts.
+
+        :param plaintexts: the plaintexts to hash
+        :return: the hash of each plaintext, in order
+        """
+        return [self.hash(plaintext) for plaintext in plaintexts]
+
+    def hmac_batch(self, key: bytes, plaintexts: Sequence[bytes]) -> List[bytes]:
+        """
+        Computes an HMAC over each of the given plaintexts with the given
+        key. Schemes should override this method if they can reuse the keyed
+        state across a batch.
+
+        :param key: the key to use
+        :param plaintexts: the plaintexts to compute an HMAC over
+        :return: the HMAC of each plaintext, in order
+        """
+        return [self.hmac(key, plaintext) for plaintext in plaintexts]
@@ -17,6 +17,8 @@
 from .hash_function_scheme import HashFunctionScheme
 from ... import crypto
 
+from typing import List, Sequence
+
 
 class SimpleHashFunctionScheme(HashFunctionScheme):
     """
@@ -29,3 +31,9 @@ class SimpleHashFunctionScheme(HashFunctionScheme):
 
     def hmac(self, key: bytes, plaintext: bytes) -> bytes:
         return crypto.HMAC(key, plaintext)
+
+    def hash_batch(self, plaintexts: Sequence[bytes]) -> List[bytes]:
+        return crypto.HashBatch(plaintexts)
+
+    def hmac_batch(self, key: bytes, plaintexts: Sequence[bytes]) -> List[bytes]:
+        return crypto.HMACBatch(key, plaintexts)
@@ -14,7 +14,13 @@
 ## limitations under the License.
 ##
 
-__all__ = ["KeyDerivationScheme", "SimpleKeyDerivationScheme"]
+__all__ = [
+    "KeyDerivationScheme",
+    "SimpleKeyDerivationScheme",
+    "TokenKeySchedule",
+    "TokenKeys",
+]
 
 from .key_derivation_scheme import KeyDerivationScheme
 from .simple_key_derivation_scheme import SimpleKeyDerivationScheme
+from .token_key_schedule import TokenKeySchedule, TokenKeys
@@ -0,0 +1,82 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from .key_derivation_scheme import KeyDerivationScheme
+
+from ...util.lru import LRUCache
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TokenKeys:
+    """
+    The keys derived from a search token by a :class:`TokenKeySchedule`.
+    """
+
+    __slots__ = ["label_key", "value_key"]
+    #: Key from which the labels of the token's entries are derived.
+    label_key: bytes
+    #: Key with which the token's values are encrypted.
+    value_key: bytes
+
+
+class TokenKeySchedule:
+    """
+    Derives the label key and value key of a search token in response-
+    revealing schemes, where the server derives both from the token itself.
+
+    Each derivation costs two calls to the key derivation scheme, so the
+    keys of recently seen tokens are kept in a bounded LRU cache. This
+    avoids repeating the derivation when the same token is queried again.
+    """
+
+    def __init__(
+        self,
+        key_derivation_scheme: KeyDerivationScheme,
+        *,
+        label_purpose: bytes,
+        value_purpose: bytes,
+        cache_size: int,
+    ):
+        self.key_derivation_scheme = key_derivation_scheme
+        self.label_purpose = label_purpose
+        self.value_purpose = value_purpose
+        #: Cache of the keys of recently seen tokens.
+        self.cache: LRUCache[bytes, TokenKeys] = LRUCache(cache_size)
+
+    def derive(self, token: bytes) -> TokenKeys:
+        """
+        Derives the keys of the given token without consulting the cache.
+
+        :param token: the search token
+        :return: the token's keys
+        """
+        return TokenKeys(
+            label_key=self.key_derivation_scheme.hkdf(token, self.label_purpose),
+            value_key=self.key_derivation_scheme.hkdf(token, self.value_purpose),
+        )
+
+    def get(self, token: bytes) -> TokenKeys:
+        """
+        Returns the keys of the given token, from the cache if possible.
+
+        :param token: the search token
+        :return: the token's keys
+        """
+        return self.cache.get_or_compute(token, self.derive)
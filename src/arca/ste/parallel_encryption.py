@@ -0,0 +1,211 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from ..util.iterators import chunked
+from ..util.processes import get_multiprocessing_context
+
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Sized,
+    Tuple,
+    TypeVar,
+)
+from tqdm import tqdm
+
+import math
+import multiprocessing.pool
+import struct
+
+
+T = TypeVar("T")
+
+#: Encrypts a chunk of plaintext entries into (label, ciphertext) pairs.
+EncryptChunk = Callable[[List[T]], List[Tuple[bytes, bytes]]]
+
+#: Layout of the lengths of the label and ciphertext preceding each entry
+#: of a shard.
+SHARD_ENTRY_HEADER = struct.Struct("<II")
+
+#: Number of tasks queued per worker process; larger values reduce the
+#: number of round trips to the pool at the cost of coarser load balancing.
+TASKS_PER_PROCESS = 4
+
+
+def pack_shard(pairs: Iterable[Tuple[bytes, bytes]]) -> bytes:
+    """
+    Serializes the given (label, ciphertext) pairs into a single buffer,
+    which is much cheaper to send between processes than the pairs
+    themselves.
+
+    :param pairs: the (label, ciphertext) pairs to serialize
+    :return: the shard
+    """
+    return b"".join(
+        SHARD_ENTRY_HEADER.pack(len(label), len(ciphertext)) + label + ciphertext
+        for label, ciphertext in pairs
+    )
+
+
+def unpack_shard(shard: bytes) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Iterates over the (label, ciphertext) pairs in one or more concatenated
+    shards created by :func:`pack_shard`.
+
+    :param shard: the shard (or concatenated shards) to read
+    :return: an iterator over the (label, ciphertext) pairs
+    """
+    start = 0
+    while start < len(shard):
+        label_length, ciphertext_length = SHARD_ENTRY_HEADER.unpack_from(shard, start)
+        label_start = start + SHARD_ENTRY_HEADER.size
+        ciphertext_start = label_start + label_length
+        start = ciphertext_start + ciphertext_length
+        yield shard[label_start:ciphertext_start], shard[ciphertext_start:start]
+
+
+#: State installed in each worker process by :func:`_initialize_worker`.
+_worker_encrypt_chunk: Optional[EncryptChunk[Any]] = None
+_worker_entries: Optional[Sequence[Any]] = None
+
+
+def _initialize_worker(
+    encrypt_chunk: EncryptChunk[T], entries: Optional[Sequence[T]]
+) -> None:
+    global _worker_encrypt_chunk, _worker_entries
+    _worker_encrypt_chunk = encrypt_chunk
+    _worker_entries = entries
+
+
+def _encrypt_range(entry_range: Tuple[int, int]) -> bytes:
+    assert _worker_encrypt_chunk is not None and _worker_entries is not None
+    start, end = entry_range
+    return pack_shard(_worker_encrypt_chunk(list(_worker_entries[start:end])))
+
+
+def _encrypt_chunk(chunk: List[Any]) -> bytes:
+    assert _worker_encrypt_chunk is not None
+    return pack_shard(_worker_encrypt_chunk(chunk))
+
+
+def _encrypt_in_windows(
+    pool: multiprocessing.pool.Pool, chunks: Iterable[List[Any]], window_size: int
+) -> Iterator[bytes]:
+    """
+    Encrypts the given chunks in the pool, reading :paramref:`window_size`
+    chunks at a time. The next window is sent to the pool while the shards
+    of the previous one are consumed, so at most two windows of entries are
+    held in memory at once.
+
+    :param pool: the pool to encrypt in
+    :param chunks: the chunks of entries to encrypt
+    :param window_size: the number of chunks in each window
+    :return: an iterator over the shard of each chunk, in order
+    """
+    previous_window: Optional[multiprocessing.pool.AsyncResult[List[bytes]]] = None
+    for window in chunked(chunks, window_size):
+        current_window = pool.map_async(_encrypt_chunk, window)
+        if previous_window is not None:
+            yield from previous_window.get()
+        previous_window = current_window
+    if previous_window is not None:
+        yield from previous_window.get()
+
+
+def encrypt_in_parallel(
+    encrypt_chunk: EncryptChunk[T],
+    entries: Iterable[T],
+    *,
+    num_processes: int,
+    batch_size: int,
+    num_entries: Optional[int] = None,
+) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Encrypts the given plaintext entries in chunks of :paramref:`batch_size`
+    entries, fanning the chunks out to a pool of :paramref:`num_processes`
+    worker processes. With a single process, the chunks are encrypted in
+    this process without starting a pool.
+
+    Work is distributed so that as little as possible is sent between
+    processes:
+
+    - :paramref:`encrypt_chunk` (along with the keys and schemes it binds)
+      is installed once in each worker by the pool's initializer, rather
+      than being sent with every task.
+    - When workers are forked and the entries are already in memory (i.e.
+      :paramref:`entries` is sized), workers inherit the entries, so each
+      task is just the index range of a chunk. Otherwise, each chunk of
+      entries is sent to a worker exactly once, reading a bounded window of
+      chunks at a time so that streamed entries are never all held in
+      memory.
+    - Each worker returns its (label, ciphertext) pairs as a single packed
+      shard rather than as Python objects.
+
+    :param encrypt_chunk: encrypts a chunk of entries into (label,
+        ciphertext) pairs; must be picklable if :paramref:`num_processes` is
+        greater than 1 and workers are not forked
+    :param entries: the plaintext entries to encrypt
+    :param num_processes: the number of worker processes to use
+    :param batch_size: the number of entries in each chunk
+    :param num_entries: the number of entries, if known, used for progress
+        reporting and for sizing the tasks sent to each worker
+    :return: an iterator over the (label, ciphertext) pairs of every entry
+    """
+    num_chunks = None
+    if num_entries is not None:
+        num_chunks = math.ceil(num_entries / batch_size)
+
+    if num_processes <= 1:
+        for chunk in tqdm(chunked(entries, batch_size), total=num_chunks, leave=False):
+            yield from encrypt_chunk(chunk)
+        return
+
+    context = get_multiprocessing_context()
+    shared_entries: Optional[Sequence[T]] = None
+    if context.get_start_method() == "fork" and isinstance(entries, Sized):
+        shared_entries = entries if isinstance(entries, Sequence) else list(entries)
+
+    with context.Pool(
+        num_processes,
+        initializer=_initialize_worker,
+        initargs=(encrypt_chunk, shared_entries),
+    ) as pool:
+        shards: Iterator[bytes]
+        if shared_entries is not None:
+            num_chunks = math.ceil(len(shared_entries) / batch_size)
+            chunksize = max(
+                math.ceil(num_chunks / (num_processes * TASKS_PER_PROCESS)), 1
+            )
+            entry_ranges = (
+                (start, min(start + batch_size, len(shared_entries)))
+                for start in range(0, len(shared_entries), batch_size)
+            )
+            shards = pool.imap(_encrypt_range, entry_ranges, chunksize)
+        else:
+            shards = _encrypt_in_windows(
+                pool,
+                chunked(entries, batch_size),
+                num_processes * TASKS_PER_PROCESS,
+            )
+        for shard in tqdm(shards, total=num_chunks, leave=False):
+            yield from unpack_shard(shard)
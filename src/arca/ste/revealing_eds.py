@@ -17,7 +17,7 @@
 from abc import ABC, abstractmethod
 
 
-from typing import Generic, TypeVar
+from typing import Any, BinaryIO, Generic, Iterable, TypeVar
 
 
 KeyType = TypeVar("KeyType")
@@ -60,6 +60,30 @@ class RevealingEDS(
         """
         ...
 
+    @abstractmethod
+    def build_plaintext_ds(self, entries: Iterable[Any]) -> PlaintextInputType:
+        """
+        Builds the plaintext data structure with the given entries (e.g. the
+        (key, value) pairs of a dictionary), as accepted by :func:`encrypt`.
+
+        :param entries: the entries of the plaintext structure
+        :return: the plaintext structure
+        """
+        ...
+
+    def encrypt_to(self, key: KeyType, entries: Iterable[Any], sink: BinaryIO) -> None:
+        """
+        Encrypts the plaintext data structure with the given entries with
+        the given key, writing the serialized encrypted data structure to
+        :paramref:`sink`. The bytes written can be passed to
+        :func:`load_eds` just like the output of :func:`encrypt`.
+
+        :param key: the key to encrypt with, as generated from :func:`generate_key`
+        :param entries: the entries of the plaintext structure to encrypt
+        :param sink: the binary file-like object to write to
+        """
+        sink.write(self.encrypt(key, self.build_plaintext_ds(entries)))
+
     @abstractmethod
     def load_eds(self, eds_bytes: bytes) -> EdsType:
         """
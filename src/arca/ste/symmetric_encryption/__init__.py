@@ -18,8 +18,10 @@ __all__ = [
     "SymmetricEncryptionScheme",
     "SimpleSymmetricEncryptionScheme",
     "AesSymmetricEncryptionScheme",
+    "AesGcmSymmetricEncryptionScheme",
 ]
 
 from .symmetric_encryption_scheme import SymmetricEncryptionScheme
 from .simple_symmetric_encryption_scheme import SimpleSymmetricEncryptionScheme
 from .aes_symmetric_encryption_scheme import AesSymmetricEncryptionScheme
+from .aes_gcm_symmetric_encryption_scheme import AesGcmSymmetricEncryptionScheme
@@ -0,0 +1,100 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from .symmetric_encryption_scheme import SymmetricEncryptionScheme
+
+from ... import crypto
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from typing import List, Optional, Sequence
+
+import hmac
+import os
+import struct
+
+
+NONCE_LENGTH = 12
+TAG_LENGTH = 16
+
+#: Purpose used to derive the key for deterministic nonces.
+NONCE_KEY_PURPOSE = b"AesGcmSymmetricEncryptionScheme.nonce"
+
+
+class AesGcmSymmetricEncryptionScheme(SymmetricEncryptionScheme):
+    """
+    A symmetric encryption scheme based on AES-GCM. Implements the
+    :class:`SymmetricEncryptionScheme` interface.
+
+    Plaintexts are not padded, so a ciphertext is always exactly
+    :code:`NONCE_LENGTH + TAG_LENGTH` bytes longer than its plaintext.
+    Encrypted dictionaries whose values serialize to a fixed width (such as
+    those using an :class:`IntSerializer`) therefore produce fixed-width
+    ciphertexts, which containers store without an offsets table.
+
+    When :func:`encrypt_batch` is given the label of each plaintext, the
+    nonce is derived from a PRF of the label and the plaintext instead of
+    being sampled at random. This saves a call to the system's random number
+    generator per entry while keeping nonces distinct, since labels within
+    an encrypted dictionary are distinct.
+    """
+
+    def encrypt(self, key: bytes, plaintext: bytes) -> bytes:
+        return self.encrypt_batch(key, [plaintext])[0]
+
+    def decrypt(self, key: bytes, ciphertext: bytes) -> bytes:
+        return self.decrypt_batch(key, [ciphertext])[0]
+
+    def encrypt_batch(
+        self,
+        key: bytes,
+        plaintexts: Sequence[bytes],
+        labels: Optional[Sequence[bytes]] = None,
+    ) -> List[bytes]:
+        if labels is None:
+            nonces = [os.urandom(NONCE_LENGTH) for _ in plaintexts]
+        else:
+            if len(labels) != len(plaintexts):
+                raise ValueError("expected one label per plaintext")
+            nonce_mac = hmac.new(
+                crypto.HashKDFBytes(key, NONCE_KEY_PURPOSE), digestmod="sha256"
+            )
+            nonces = []
+            for label, plaintext in zip(labels, plaintexts):
+                mac = nonce_mac.copy()
+                mac.update(struct.pack("<Q", len(label)))
+                mac.update(label)
+                mac.update(plaintext)
+                nonces.append(mac.digest()[:NONCE_LENGTH])
+
+        aesgcm = AESGCM(key)
+        return [
+            nonce + aesgcm.encrypt(nonce, plaintext, None)
+            for nonce, plaintext in zip(nonces, plaintexts)
+        ]
+
+    def decrypt_batch(self, key: bytes, ciphertexts: Sequence[bytes]) -> List[bytes]:
+        aesgcm = AESGCM(key)
+        plaintexts = []
+        for ciphertext in ciphertexts:
+            if len(ciphertext) < NONCE_LENGTH + TAG_LENGTH:
+                raise ValueError("ciphertext is too short")
+            plaintexts.append(
+                aesgcm.decrypt(
+                    ciphertext[:NONCE_LENGTH], ciphertext[NONCE_LENGTH:], None
+                )
+            )
+        return plaintexts
@@ -16,11 +16,16 @@
 
 from .symmetric_encryption_scheme import SymmetricEncryptionScheme
 
+from ... import crypto
+
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
+from typing import List, Optional, Sequence
+
 import os
 
+
 IV_LENGTH = 16
 
 
@@ -32,8 +37,7 @@ class AesSymmetricEncryptionScheme(SymmetricEncryptionScheme):
 
     def encrypt(self, key: bytes, plaintext: bytes) -> bytes:
         padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(plaintext)
-        padded_data = padder.finalize()
+        padded_data = padder.update(plaintext) + padder.finalize()
 
         iv = os.urandom(IV_LENGTH)
         cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
@@ -52,3 +56,14 @@ class AesSymmetricEncryptionScheme(SymmetricEncryptionScheme):
         unpadder = padding.PKCS7(128).unpadder()
         plaintext = unpadder.update(plaintext) + unpadder.finalize()
         return plaintext
+
+    def encrypt_batch(
+        self,
+        key: bytes,
+        plaintexts: Sequence[bytes],
+        labels: Optional[Sequence[bytes]] = None,
+    ) -> List[bytes]:
+        return crypto.SymmetricEncryptBatch(key, plaintexts)
+
+    def decrypt_batch(self, key: bytes, ciphertexts: Sequence[bytes]) -> List[bytes]:
+        return crypto.SymmetricDecryptBatch(key, ciphertexts)
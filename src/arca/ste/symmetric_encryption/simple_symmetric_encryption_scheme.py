@@ -18,6 +18,8 @@ from .symmetric_encryption_scheme import SymmetricEncryptionScheme
 
 from ... import crypto
 
+from typing import List, Optional, Sequence
+
 
 class SimpleSymmetricEncryptionScheme(SymmetricEncryptionScheme):
     """
@@ -31,3 +33,14 @@ class SimpleSymmetricEncryptionScheme(SymmetricEncryptionScheme):
 
     def decrypt(self, key: bytes, ciphertext: bytes) -> bytes:
         return crypto.SymmetricDecrypt(key, ciphertext)
+
+    def encrypt_batch(
+        self,
+        key: bytes,
+        plaintexts: Sequence[bytes],
+        labels: Optional[Sequence[bytes]] = None,
+    ) -> List[bytes]:
+        return crypto.SymmetricEncryptBatch(key, plaintexts)
+
+    def decrypt_batch(self, key: bytes, ciphertexts: Sequence[bytes]) -> List[bytes]:
+        return crypto.SymmetricDecryptBatch(key, ciphertexts)
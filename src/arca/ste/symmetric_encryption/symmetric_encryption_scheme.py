@@ -16,6 +16,8 @@
 
 from abc import ABC, abstractmethod
 
+from typing import List, Optional, Sequence
+
 
 class SymmetricEncryptionScheme(ABC):
     """
@@ -46,3 +48,38 @@ class SymmetricEncryptionScheme(ABC):
         :return: bytes representing a key
         """
         ...
+
+    def encrypt_batch(
+        self,
+        key: bytes,
+        plaintexts: Sequence[bytes],
+        labels: Optional[Sequence[bytes]] = None,
+    ) -> List[bytes]:
+        """
+        Encrypts each of the given plaintexts with the given key. Schemes
+        should override this method if they can share work (such as cipher
+        setup) across a batch.
+
+        Callers that store each ciphertext under a distinct label (such as
+        an encrypted dictionary) may pass those labels, which schemes can
+        use to derive nonces deterministically. Schemes are free to ignore
+        them.
+
+        :param key: the key to encrypt with
+        :param plaintexts: the plaintexts to encrypt
+        :param labels: the distinct label of each plaintext, if any
+        :return: the ciphertext of each plaintext, in order
+        """
+        return [self.encrypt(key, plaintext) for plaintext in plaintexts]
+
+    def decrypt_batch(self, key: bytes, ciphertexts: Sequence[bytes]) -> List[bytes]:
+        """
+        Decrypts each of the given ciphertexts with the given key. Schemes
+        should override this method if they can share work (such as cipher
+        setup) across a batch.
+
+        :param key: the key to decrypt with
+        :param ciphertexts: the ciphertexts to decrypt
+        :return: the plaintext of each ciphertext, in order
+        """
+        return [self.decrypt(key, ciphertext) for ciphertext in ciphertexts]
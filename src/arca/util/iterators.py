@@ -0,0 +1,41 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from typing import Iterable, Iterator, List, TypeVar
+
+import itertools
+
+
+T = TypeVar("T")
+
+
+def chunked(iterable: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    """
+    Splits the given iterable into consecutive lists of (at most)
+    :paramref:`chunk_size` elements.
+
+    :param iterable: the iterable to split
+    :param chunk_size: the maximum size of each chunk
+    :return: an iterator over the chunks, in order
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if len(chunk) <= 0:
+            return
+        yield chunk
@@ -0,0 +1,112 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+from __future__ import annotations
+
+from typing import Callable, Generic, Hashable, Optional, OrderedDict, TypeVar
+
+import collections
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A mapping that holds at most :attr:`capacity` entries, evicting the
+    least recently used entry when full.
+    """
+
+    __slots__ = ["capacity", "entries", "hits", "misses"]
+
+    def __init__(self, capacity: int):
+        if capacity < 0:
+            raise ValueError("capacity must be non-negative")
+        #: The maximum number of entries; a capacity of 0 disables caching.
+        self.capacity = capacity
+        self.entries: OrderedDict[K, V] = collections.OrderedDict()
+        #: The number of lookups that found an entry.
+        self.hits = 0
+        #: The number of lookups that did not find an entry.
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Returns the entry for the given key and marks it as the most
+        recently used, or returns :py:const:`None` if there is no entry.
+
+        :param key: the key to look up
+        :return: the entry for :paramref:`key`, if any
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Adds (or replaces) the entry for the given key, evicting the least
+        recently used entry if the cache is full.
+
+        :param key: the key of the entry
+        :param value: the value of the entry
+        """
+        if self.capacity <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def get_or_compute(self, key: K, compute: Callable[[K], V]) -> V:
+        """
+        Returns the entry for the given key, computing and adding it first
+        if there is no entry.
+
+        :param key: the key to look up
+        :param compute: computes the value of :paramref:`key` on a miss
+        :return: the entry for :paramref:`key`
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute(key)
+            self.put(key, value)
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups that found an entry, or 0 if there have been
+        no lookups.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.entries
@@ -0,0 +1,36 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+from __future__ import annotations
+
+import multiprocessing
+import multiprocessing.context
+
+
+def get_multiprocessing_context() -> multiprocessing.context.BaseContext:
+    """
+    Returns the context for the start method that :mod:`multiprocessing` is
+    configured with, or for the platform's default start method if none has
+    been set. Unlike :func:`multiprocessing.get_start_method`, this does not
+    fix the global start method as a side effect.
+
+    :return: the context to start worker processes with
+    """
+    method = multiprocessing.get_start_method(allow_none=True)
+    if method is None:
+        method = multiprocessing.get_all_start_methods()[0]
+    return multiprocessing.get_context(method)
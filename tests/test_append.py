@@ -0,0 +1,228 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+import unittest
+
+from collections import ChainMap
+
+from typing import Any, Dict, List, Tuple
+
+from hypothesis import given
+from hypothesis.strategies import tuples, integers, lists
+from parameterized import parameterized
+
+from arca.arq import AppendableRangeAggregateScheme
+from arca.arq.plaintext_schemes.minimum import (
+    MinimumASTable,
+    MinimumLinearEMT,
+    MinimumSparseTable,
+)
+from arca.arq.plaintext_schemes.sum import SumPrefix
+from arca.arq.arq import ARQ
+from arca.arq.table import Table
+from arca.arq.domain import Domain
+from arca.arq.range_query import RangeQuery
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer, Serializer, StructSerializer
+
+
+APPENDABLE_SCHEMES = [
+    ("SumPrefix", SumPrefix(), IntSerializer()),
+    ("MinimumSparseTable", MinimumSparseTable(), StructSerializer(format_string="ii")),
+    ("MinimumLinearEMT", MinimumLinearEMT(), StructSerializer(format_string="iii")),
+]
+
+
+def append_entries(
+    scheme: AppendableRangeAggregateScheme[Any, Any, Any],
+    table: Table,
+    extended_table: Table,
+) -> Tuple[Dict[Any, Any], Dict[Any, Any]]:
+    """
+    Appends to the plaintext data structure of :paramref:`table` and returns
+    the resulting entries along with the entries it read.
+    """
+    entries = dict(scheme.setup(table).items())
+    subqueries = scheme.append_subqueries(table.domain, extended_table.domain)
+    responses = {subquery: entries[subquery] for subquery in subqueries}
+    entries.update(scheme.append(table.domain, extended_table, responses))
+    return entries, responses
+
+
+class TestTableExtend(unittest.TestCase):
+    def test_extend(self) -> None:
+        table = Table.make([(0, 5), (2, 3), (2, 4)])
+        extended_table = table.extend([(3, 1), (6, 2), (6, 0)])
+
+        self.assertEqual(extended_table.domain, Domain(start=0, end=7))
+        self.assertEqual(extended_table.filter(2), [3, 4])
+        self.assertEqual(extended_table.filter(6), [2, 0])
+        self.assertEqual(extended_table.filter(4), [])
+        self.assertEqual(extended_table.number_of_records(), 6)
+
+        # The original table is unchanged:
+        self.assertEqual(table.domain, Domain(start=0, end=3))
+        self.assertEqual(table.filter(6), [])
+
+        self.assertIs(table.extend([]), table)
+
+    def test_extend_repeatedly(self) -> None:
+        """
+        Test that repeatedly extending a table shares the existing records
+        instead of copying them, while keeping the number of layers small.
+        """
+        base_table = Table.make_from_list(list(range(1000)))
+        tables = [base_table]
+        for domain_value in range(1000, 2000):
+            tables.append(tables[-1].extend([(domain_value, -domain_value)]))
+        table = tables[-1]
+
+        assert isinstance(table.entries, ChainMap)
+        self.assertIs(table.entries.maps[-1], base_table.entries)
+        self.assertLessEqual(len(table.entries.maps), 11)
+
+        self.assertEqual(table.domain, Domain(start=0, end=2000))
+        self.assertEqual(table.number_of_records(), 2000)
+        self.assertEqual(table.number_of_filled_domain_points(), 2000)
+        for domain_value in range(2000):
+            expected = domain_value if domain_value < 1000 else -domain_value
+            self.assertEqual(table.filter(domain_value), [expected])
+        self.assertEqual(table.filter(2000), [])
+
+        # Earlier tables are unchanged:
+        self.assertEqual(tables[500].domain, Domain(start=0, end=1500))
+        self.assertEqual(tables[500].number_of_records(), 1500)
+        self.assertEqual(tables[500].filter(1500), [])
+
+    def test_extend_before_end(self) -> None:
+        table = Table.make([(0, 5), (2, 3)])
+        with self.assertRaises(ValueError):
+            table.extend([(2, 1)])
+        with self.assertRaises(ValueError):
+            table.extend([(4, 1), (-1, 1)])
+
+
+class TestAppend(unittest.TestCase):
+    @parameterized.expand(APPENDABLE_SCHEMES)
+    def test_append_matches_setup(
+        self,
+        _: str,
+        scheme: AppendableRangeAggregateScheme[Any, Any, Any],
+        __: Serializer[Any],
+    ) -> None:
+        """
+        Test that appending to a data structure gives the same entries as
+        setting up the data structure of the extended table, over every
+        pair of domain sizes (so both appends that rebuild and appends that
+        do not are covered).
+        """
+        for size in range(1, 24):
+            table = Table.make([(index, (index * 37) % 11) for index in range(size)])
+            for extended_size in range(size, 40):
+                extended_table = table.extend(
+                    (index, (index * 53) % 13) for index in range(size, extended_size)
+                )
+                entries, responses = append_entries(scheme, table, extended_table)
+                expected_entries = dict(scheme.setup(extended_table).items())
+                for key, value in expected_entries.items():
+                    self.assertEqual(entries[key], value, (size, extended_size, key))
+                if not isinstance(scheme, MinimumLinearEMT):
+                    self.assertEqual(len(entries), len(expected_entries))
+                self.assertLessEqual(len(responses), 2 * size)
+
+    @given(
+        lists(tuples(integers(min_value=-20, max_value=20), integers()), min_size=1),
+        lists(tuples(integers(min_value=0, max_value=20), integers())),
+    )
+    def test_append_with_records(
+        self, entries: List[Tuple[int, int]], appended_entries: List[Tuple[int, int]]
+    ) -> None:
+        """
+        Test appending tables with any number of records at each domain
+        value.
+        """
+        table = Table.make(entries)
+        extended_table = table.extend(
+            (table.domain.end + offset, value) for offset, value in appended_entries
+        )
+        for scheme in [SumPrefix(), MinimumSparseTable()]:
+            entries_after_append, _ = append_entries(scheme, table, extended_table)
+            self.assertEqual(
+                entries_after_append, dict(scheme.setup(extended_table).items())
+            )
+
+    def test_append_to_smaller_domain(self) -> None:
+        domain = Domain(start=0, end=10)
+        for scheme in [SumPrefix(), MinimumSparseTable(), MinimumLinearEMT()]:
+            with self.assertRaises(ValueError):
+                scheme.append_subqueries(domain, Domain(start=0, end=9))
+            with self.assertRaises(ValueError):
+                scheme.append_subqueries(domain, Domain(start=1, end=12))
+
+
+class TestARQAppend(unittest.TestCase):
+    @parameterized.expand(APPENDABLE_SCHEMES)
+    def test_arq_append(
+        self,
+        _: str,
+        scheme: AppendableRangeAggregateScheme[Any, Any, Any],
+        key_serializer: Serializer[Any],
+    ) -> None:
+        """
+        Test that :func:`ARQ.append` keeps the encrypted index consistent
+        with the table as records are appended to it.
+        """
+        arq_scheme = ARQ(
+            eds_scheme=SimpleEDX(
+                dx_key_serializer=key_serializer, dx_value_serializer=IntSerializer()
+            ),
+            aggregate_scheme=scheme,
+        )
+        table = Table.make([(index, (index * 37) % 11) for index in range(5)])
+        key = arq_scheme.generate_key()
+        eds = arq_scheme.load_eds(arq_scheme.setup(key, table))
+
+        for num_records in [1, 3, 7, 1, 12]:
+            extended_table = table.extend(
+                (index, (index * 53) % 13 - 6)
+                for index in range(table.domain.end, table.domain.end + num_records)
+            )
+            arq_scheme.append(key, table, extended_table, eds)
+            table = extended_table
+
+            # MinimumLinearEMT does not support queries within a single block:
+            query_starts = range(table.domain.start, table.domain.end)
+            if isinstance(scheme, MinimumLinearEMT):
+                query_starts = range(table.domain.start, table.domain.start + 1)
+            for query_start in query_starts:
+                range_query = RangeQuery(start=query_start, end=table.domain.end)
+                aggregate = sum if isinstance(scheme, SumPrefix) else min
+                self.assertEqual(
+                    arq_scheme.query(key, table.domain, range_query, eds),
+                    aggregate(table.filter_range(range_query)),
+                )
+
+    def test_arq_append_errors(self) -> None:
+        table = Table.make([(0, 1), (1, 2)])
+        eds_scheme = SimpleEDX(
+            dx_key_serializer=StructSerializer(format_string="ii"),
+            dx_value_serializer=IntSerializer(),
+        )
+        arq_scheme = ARQ(eds_scheme=eds_scheme, aggregate_scheme=MinimumASTable())
+        key = arq_scheme.generate_key()
+        eds = arq_scheme.load_eds(arq_scheme.setup(key, table))
+        with self.assertRaises(TypeError):
+            arq_scheme.append(key, table, table.extend([(2, 1)]), eds)
@@ -0,0 +1,190 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+import io
+import tempfile
+import unittest
+
+from typing import List
+from unittest import mock
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists
+
+from arca.arq.plaintext_schemes.minimum import MinimumLinearEMT, MinimumSparseTable
+from arca.arq.plaintext_schemes.sum import SumPrefix
+from arca.arq.arq import ARQ
+from arca.arq.table import Table
+from arca.arq.range_query import RangeQuery
+from arca.ste.containers import HashContainerFormat
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer, StructSerializer
+
+
+class TestARQQueryMany(unittest.TestCase):
+    def setUp(self):
+        self.eds_scheme = SimpleEDX(
+            dx_key_serializer=StructSerializer(format_string="ii"),
+            dx_value_serializer=IntSerializer(),
+        )
+        self.arq_scheme = ARQ(
+            eds_scheme=self.eds_scheme, aggregate_scheme=MinimumSparseTable()
+        )
+
+    @settings(deadline=None)
+    @given(lists(integers(min_value=-1 * (2**16), max_value=2**16), min_size=2))
+    def test_query_many_matches_query(self, entries: List[int]) -> None:
+        """
+        Test that :func:`ARQ.query_many` returns the same results as
+        :func:`ARQ.query`, in the same order as the input queries.
+        """
+        table = Table.make_from_list(entries)
+        key = self.arq_scheme.generate_key()
+        eds = self.arq_scheme.load_eds(self.arq_scheme.setup(key, table))
+
+        range_queries = [
+            RangeQuery(start=query_start, end=query_end)
+            for query_start in range(table.domain.start, table.domain.end - 1)
+            for query_end in range(query_start + 1, table.domain.end)
+        ]
+        actual_results = self.arq_scheme.query_many(
+            key, table.domain, range_queries, eds
+        )
+
+        self.assertEqual(len(actual_results), len(range_queries))
+        for range_query, actual_result in zip(range_queries, actual_results):
+            self.assertEqual(
+                self.arq_scheme.query(key, table.domain, range_query, eds),
+                actual_result,
+            )
+            self.assertEqual(min(table.filter_range(range_query)), actual_result)
+
+    def test_query_many_deduplicates_work(self) -> None:
+        """
+        Test that overlapping queries only tokenize, look up and resolve
+        each distinct subquery once.
+        """
+        eds_scheme = SimpleEDX(
+            dx_key_serializer=IntSerializer(), dx_value_serializer=IntSerializer()
+        )
+        arq_scheme = ARQ(eds_scheme=eds_scheme, aggregate_scheme=SumPrefix())
+        table = Table.make_from_list([3, 1, 4, 1, 5, 9, 2, 6])
+        key = arq_scheme.generate_key()
+        eds = arq_scheme.load_eds(arq_scheme.setup(key, table))
+
+        # Every query shares the subquery for the prefix ending at index 3:
+        range_queries = [RangeQuery(start=4, end=end) for end in range(5, 9)]
+        range_queries += [RangeQuery(start=start, end=4) for start in range(1, 4)]
+
+        with mock.patch.object(
+            SimpleEDX, "token", autospec=True, side_effect=SimpleEDX.token
+        ) as token, mock.patch.object(
+            SimpleEDX, "resolve", autospec=True, side_effect=SimpleEDX.resolve
+        ) as resolve:
+            actual_results = arq_scheme.query_many(
+                key, table.domain, range_queries, eds
+            )
+
+        expected_results = [sum(table.filter_range(query)) for query in range_queries]
+        self.assertEqual(expected_results, actual_results)
+
+        # 1 shared prefix, 4 right endpoints and 3 left endpoints:
+        self.assertEqual(token.call_count, 8)
+        self.assertEqual(resolve.call_count, 8)
+
+    def test_resolve_queriers_without_subqueries(self) -> None:
+        """
+        Test that a querier that asks for no subqueries without finishing
+        raises a :class:`ValueError` naming it.
+        """
+        table = Table.make_from_list([3, 1, 4])
+        key = self.arq_scheme.generate_key()
+        eds = self.arq_scheme.load_eds(self.arq_scheme.setup(key, table))
+
+        finished_querier = self.arq_scheme.aggregate_scheme.generate_querier(
+            table.domain, RangeQuery(start=0, end=2)
+        )
+        stuck_querier = mock.Mock()
+        stuck_querier.query.return_value = []
+        with self.assertRaisesRegex(ValueError, "querier 1"):
+            self.arq_scheme.resolve_queriers(
+                key, [finished_querier, stuck_querier], eds
+            )
+
+
+class TestARQSetupStream(unittest.TestCase):
+    def test_setup_stream_matches_setup(self) -> None:
+        """
+        Test that an index written by :func:`ARQ.setup_stream` answers
+        queries like the one returned by :func:`ARQ.setup`.
+        """
+        table = Table.make_from_list([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5])
+        arq_schemes = [
+            ARQ(
+                eds_scheme=SimpleEDX(
+                    dx_key_serializer=IntSerializer(),
+                    dx_value_serializer=IntSerializer(),
+                    batch_size=4,
+                ),
+                aggregate_scheme=SumPrefix(),
+            ),
+            ARQ(
+                eds_scheme=SimpleEDX(
+                    dx_key_serializer=StructSerializer(format_string="iii"),
+                    dx_value_serializer=IntSerializer(),
+                    container_format=HashContainerFormat(),
+                ),
+                aggregate_scheme=MinimumLinearEMT(),
+            ),
+        ]
+        for arq_scheme in arq_schemes:
+            key = arq_scheme.generate_key()
+            eds = arq_scheme.load_eds(arq_scheme.setup(key, table))
+
+            sink = io.BytesIO()
+            arq_scheme.setup_stream(key, table, sink)
+            streamed_eds = arq_scheme.load_eds(sink.getvalue())
+            self.assertCountEqual(streamed_eds.keys(), eds.keys())
+
+            for range_query in [
+                RangeQuery(start=table.domain.start, end=table.domain.end),
+                RangeQuery(start=table.domain.start + 1, end=table.domain.end),
+            ]:
+                self.assertEqual(
+                    arq_scheme.query(key, table.domain, range_query, streamed_eds),
+                    arq_scheme.query(key, table.domain, range_query, eds),
+                )
+
+    def test_setup_stream_to_file(self) -> None:
+        arq_scheme = ARQ(
+            eds_scheme=SimpleEDX(
+                dx_key_serializer=IntSerializer(), dx_value_serializer=IntSerializer()
+            ),
+            aggregate_scheme=SumPrefix(),
+        )
+        table = Table.make_from_list(list(range(5000)))
+        key = arq_scheme.generate_key()
+        with tempfile.TemporaryFile() as sink:
+            arq_scheme.setup_stream(key, table, sink)
+            sink.seek(0)
+            eds = arq_scheme.load_eds(sink.read())
+
+        self.assertEqual(len(eds), table.domain.size())
+        range_query = RangeQuery(start=100, end=4000)
+        self.assertEqual(
+            arq_scheme.query(key, table.domain, range_query, eds),
+            sum(table.filter_range(range_query)),
+        )
@@ -0,0 +1,110 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import json
+import os
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from arca.bench import (
+    AGGREGATE_SCHEMES,
+    EDS_SCHEMES,
+    BenchmarkCase,
+    QuerySpec,
+    TableSpec,
+    generate_table,
+    main,
+    run_benchmark,
+    run_case,
+)
+
+
+SMALL_TABLE = TableSpec(domain_size=64, density=0.5, records_per_point=3)
+SMALL_QUERIES = QuerySpec(bucket_size=25, num_samples_per_bucket=2)
+
+
+class TestBench(unittest.TestCase):
+    @parameterized.expand([("uniform",), ("zipf",), ("normal",)])
+    def test_generate_table(self, distribution: str) -> None:
+        spec = TableSpec(
+            domain_size=1000, density=0.25, distribution=distribution, max_value=50
+        )
+        table = generate_table(spec)
+
+        self.assertEqual((table.domain.start, table.domain.end), (0, 1000))
+        self.assertLess(abs(table.number_of_filled_domain_points() - 250), 75)
+        for values in table.entries.values():
+            self.assertEqual(len(values), 1)
+            self.assertTrue(all(0 <= value < 50 for value in values))
+        self.assertEqual(generate_table(spec).entries, table.entries)
+
+        with self.assertRaises(ValueError):
+            TableSpec(distribution="bimodal")
+
+    @parameterized.expand([(aggregate,) for aggregate in AGGREGATE_SCHEMES])
+    def test_run_case(self, aggregate: str) -> None:
+        for eds in EDS_SCHEMES:
+            result = run_case(
+                BenchmarkCase(
+                    aggregate=aggregate,
+                    eds=eds,
+                    table=SMALL_TABLE,
+                    queries=SMALL_QUERIES,
+                )
+            )
+            self.assertEqual(result["aggregate"], aggregate)
+            self.assertEqual(result["eds"], eds)
+            self.assertGreater(result["index_bytes"], 0)
+            self.assertEqual(result["queries"]["count"], 8)
+            latencies = result["queries"]["latency_seconds"]
+            self.assertLessEqual(latencies["p50"], latencies["p99"])
+            self.assertLessEqual(latencies["p99"], latencies["max"])
+
+    def test_run_benchmark_rejects_unknown_schemes(self) -> None:
+        with self.assertRaises(ValueError):
+            run_benchmark(SMALL_TABLE, SMALL_QUERIES, aggregates=["SumTree"])
+        with self.assertRaises(ValueError):
+            run_benchmark(SMALL_TABLE, SMALL_QUERIES, eds_schemes=["FancyEDX"])
+
+    def test_main(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.json")
+            status = main(
+                [
+                    "--aggregate=SumPrefix",
+                    "--eds=SimpleEDX",
+                    "--eds=SimpleEDX+HashContainer",
+                    "--domain-size=32",
+                    "--query-batch-size=4",
+                    f"--output={path}",
+                ]
+            )
+            self.assertEqual(status, 0)
+            with open(path) as f:
+                report = json.load(f)
+
+        self.assertTrue(report["isolated"])
+        self.assertEqual(report["table"]["domain_size"], 32)
+        self.assertEqual(
+            [result["eds"] for result in report["results"]],
+            ["SimpleEDX", "SimpleEDX+HashContainer"],
+        )
+        for result in report["results"]:
+            self.assertGreater(result["peak_rss_bytes"], 0)
+            self.assertEqual(result["queries"]["batch_size"], 4)
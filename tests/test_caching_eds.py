@@ -0,0 +1,135 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import unittest
+
+from unittest import mock
+
+from arca.arq import ARQ, RangeQuery, Table
+from arca.arq.plaintext_schemes.minimum import MinimumSparseTable
+from arca.arq.plaintext_schemes.sum import SumFenwick, SumPrefix
+from arca.ste.caching_eds import CachingEDS, UpdatableCachingEDS
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer, StructSerializer
+
+
+class TestCachingEDS(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = Table.make_from_list([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5])
+        self.range_queries = [
+            RangeQuery(start=query_start, end=query_end)
+            for query_start in range(self.table.domain.start, self.table.domain.end)
+            for query_end in range(query_start + 1, self.table.domain.end + 1)
+        ]
+
+    def test_repeated_queries_skip_token_and_resolve(self) -> None:
+        eds_scheme = CachingEDS(
+            SimpleEDX(
+                dx_key_serializer=IntSerializer(), dx_value_serializer=IntSerializer()
+            )
+        )
+        arq_scheme = ARQ(eds_scheme=eds_scheme, aggregate_scheme=SumPrefix())
+        key = arq_scheme.generate_key()
+        eds = arq_scheme.load_eds(arq_scheme.setup(key, self.table))
+        expected_results = [
+            sum(self.table.filter_range(range_query))
+            for range_query in self.range_queries
+        ]
+
+        self.assertEqual(
+            [
+                arq_scheme.query(key, self.table.domain, range_query, eds)
+                for range_query in self.range_queries
+            ],
+            expected_results,
+        )
+        # Only the distinct prefixes are tokenized and decrypted:
+        self.assertEqual(eds_scheme.token_cache.misses, self.table.domain.size())
+        self.assertEqual(len(eds_scheme.token_cache), self.table.domain.size())
+        self.assertGreater(eds_scheme.token_cache.hit_rate, 0.5)
+
+        with mock.patch.object(
+            SimpleEDX, "token", autospec=True, side_effect=SimpleEDX.token
+        ) as token, mock.patch.object(
+            SimpleEDX, "resolve", autospec=True, side_effect=SimpleEDX.resolve
+        ) as resolve:
+            actual_results = arq_scheme.query_many(
+                key, self.table.domain, self.range_queries, eds
+            )
+        self.assertEqual(actual_results, expected_results)
+        self.assertEqual(token.call_count, 0)
+        self.assertEqual(resolve.call_count, 0)
+
+        eds_scheme.clear_caches()
+        self.assertEqual(len(eds_scheme.token_cache), 0)
+        self.assertEqual(len(eds_scheme.response_cache), 0)
+
+    def test_bounded_caches(self) -> None:
+        eds_scheme = CachingEDS(
+            SimpleEDX(
+                dx_key_serializer=StructSerializer(format_string="ii"),
+                dx_value_serializer=IntSerializer(),
+            ),
+            token_cache_size=4,
+            response_cache_size=2,
+        )
+        arq_scheme = ARQ(eds_scheme=eds_scheme, aggregate_scheme=MinimumSparseTable())
+        key = arq_scheme.generate_key()
+        eds = arq_scheme.load_eds(arq_scheme.setup(key, self.table))
+
+        for range_query in self.range_queries:
+            self.assertEqual(
+                arq_scheme.query(key, self.table.domain, range_query, eds),
+                min(self.table.filter_range(range_query)),
+            )
+        self.assertEqual(len(eds_scheme.token_cache), 4)
+        self.assertEqual(len(eds_scheme.response_cache), 2)
+
+        # Tokens are cached per key:
+        other_key = arq_scheme.generate_key()
+        self.assertNotEqual(
+            eds_scheme.token(key, (0, 0)), eds_scheme.token(other_key, (0, 0))
+        )
+
+    def test_updates(self) -> None:
+        eds_scheme = UpdatableCachingEDS(
+            SimpleEDX(
+                dx_key_serializer=IntSerializer(), dx_value_serializer=IntSerializer()
+            )
+        )
+        arq_scheme = ARQ(eds_scheme=eds_scheme, aggregate_scheme=SumFenwick())
+        key = arq_scheme.generate_key()
+        eds = arq_scheme.load_eds(arq_scheme.setup(key, self.table))
+        range_query = RangeQuery(
+            start=self.table.domain.start, end=self.table.domain.end
+        )
+        total = sum(self.table.filter_range(range_query))
+        self.assertEqual(
+            arq_scheme.query(key, self.table.domain, range_query, eds), total
+        )
+
+        arq_scheme.update(key, self.table.domain, self.table.domain.start, 10, eds)
+        self.assertEqual(
+            arq_scheme.query(key, self.table.domain, range_query, eds), total + 10
+        )
+
+        # A plain CachingEDS does not pass updates through:
+        arq_scheme = ARQ(
+            eds_scheme=CachingEDS(eds_scheme.eds_scheme), aggregate_scheme=SumFenwick()
+        )
+        with self.assertRaises(TypeError):
+            arq_scheme.update(key, self.table.domain, self.table.domain.start, 1, eds)
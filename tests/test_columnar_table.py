@@ -0,0 +1,92 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+import unittest
+
+from typing import List, Tuple
+
+from hypothesis import given
+from hypothesis.strategies import tuples, integers, lists
+
+from arca.arq import ColumnarTable, Table, RangeQuery
+from arca.arq.plaintext_schemes.median import MedianAlphaApprox
+from arca.arq.plaintext_schemes.minimum import MinimumLinearEMT
+from arca.arq.plaintext_schemes.sum import SumPrefix
+
+import numpy as np
+
+
+class TestColumnarTable(unittest.TestCase):
+    @given(lists(tuples(integers(min_value=-16, max_value=16), integers()), min_size=1))
+    def test_columnar_table_matches_table(self, records: List[Tuple[int, int]]) -> None:
+        """
+        Test that a :class:`ColumnarTable` returns the same records as a
+        :class:`Table` made from the same records.
+        """
+        table = Table.make(records)
+        columnar_table = ColumnarTable.make(records)
+
+        self.assertEqual(columnar_table.domain, table.domain)
+        self.assertEqual(columnar_table.number_of_records(), table.number_of_records())
+        self.assertEqual(
+            columnar_table.number_of_filled_domain_points(),
+            table.number_of_filled_domain_points(),
+        )
+        self.assertEqual(dict(columnar_table.entries), dict(table.entries))
+
+        for domain_value in range(table.domain.start - 1, table.domain.end + 1):
+            self.assertEqual(
+                columnar_table.filter(domain_value), table.filter(domain_value)
+            )
+
+        for range_query in RangeQuery.enumerate_all(table.domain):
+            self.assertEqual(
+                columnar_table.filter_range(range_query),
+                table.filter_range(range_query),
+            )
+
+        self.assertEqual(
+            list(columnar_table.iterate_over_unique_domain_points(len)),
+            list(table.iterate_over_unique_domain_points(len)),
+        )
+        self.assertEqual(ColumnarTable.from_table(table), columnar_table)
+
+    def test_columnar_table_range_is_a_view(self) -> None:
+        columnar_table = ColumnarTable.make([(0, 5), (2, 7), (1, 6), (2, 8), (4, 9)])
+        view = columnar_table.filter_range_view(RangeQuery(start=1, end=3))
+
+        self.assertEqual(view.tolist(), [6, 7, 8])
+        self.assertTrue(np.shares_memory(view, columnar_table.values))
+        self.assertFalse(view.flags.writeable)
+        self.assertEqual(columnar_table.filter(3), [])
+
+    @given(lists(integers(min_value=-1 * (2**16), max_value=2**16), min_size=1))
+    def test_columnar_table_with_schemes(self, entries: List[int]) -> None:
+        """
+        Test that plaintext schemes produce the same structures when built
+        over a :class:`ColumnarTable`.
+        """
+        table = Table.make_from_list(entries)
+        columnar_table = ColumnarTable.make_from_list(entries)
+
+        for aggregate_scheme in [
+            SumPrefix(),
+            MinimumLinearEMT(),
+            MedianAlphaApprox(alpha=0.5),
+        ]:
+            self.assertEqual(
+                aggregate_scheme.setup(columnar_table), aggregate_scheme.setup(table)
+            )
@@ -0,0 +1,238 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+import io
+import os
+import pickle
+import tempfile
+import unittest
+
+from typing import Dict, Optional
+
+from hypothesis import given
+from hypothesis.strategies import binary, dictionaries
+from parameterized import parameterized
+
+from arca.arq import ARQ, RangeQuery, Table
+from arca.arq.plaintext_schemes.sum import SumPrefix
+from arca.ste.containers import (
+    ContainerFormat,
+    HashContainerFormat,
+    SortedContainerFormat,
+)
+from arca.ste.containers.container import CONTAINER_HEADER, dump_pickled_pairs
+from arca.ste.containers.hash_container import HASH_HEADER
+from arca.ste.edx import SimpleEDX
+from arca.ste.emm import Multimap, PiBaseEMM
+from arca.ste.serializers import IntSerializer
+from arca.ste.symmetric_encryption import (
+    AesGcmSymmetricEncryptionScheme,
+    SimpleSymmetricEncryptionScheme,
+)
+
+
+CONTAINER_FORMATS = [
+    (SortedContainerFormat(),),
+    (HashContainerFormat(),),
+    (HashContainerFormat(load_factor=0.9),),
+]
+
+
+class TestContainers(unittest.TestCase):
+    @parameterized.expand(CONTAINER_FORMATS)
+    def test_container_round_trip(self, container_format: ContainerFormat) -> None:
+        @given(
+            dictionaries(binary(min_size=16, max_size=16), binary()),
+            binary(min_size=16, max_size=16),
+        )
+        def check(entries: Dict[bytes, bytes], missing_label: bytes) -> None:
+            container = container_format.loads(container_format.dumps(entries.items()))
+
+            self.assertEqual(len(container), len(entries))
+            self.assertEqual(dict(container.items()), entries)
+            for label, ciphertext in entries.items():
+                self.assertIn(label, container)
+                self.assertEqual(container[label], ciphertext)
+            if missing_label not in entries:
+                self.assertNotIn(missing_label, container)
+                self.assertIsNone(container.get(missing_label))
+            self.assertNotIn(b"too short", container)
+
+        check()
+
+    @parameterized.expand(CONTAINER_FORMATS)
+    def test_container_open_from_file(self, container_format: ContainerFormat) -> None:
+        entries = {os.urandom(32): os.urandom(index) for index in range(100)}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "eds.bin")
+            with open(path, "wb") as f:
+                f.write(container_format.dumps(entries.items()))
+
+            container = container_format.open(path)
+            self.assertEqual(len(container), len(entries))
+            for label, ciphertext in entries.items():
+                self.assertEqual(container[label], ciphertext)
+
+    @parameterized.expand(CONTAINER_FORMATS)
+    def test_container_fixed_width_ciphertexts(
+        self, container_format: ContainerFormat
+    ) -> None:
+        entries = {os.urandom(32): os.urandom(40) for _ in range(100)}
+        variable_entries = {**entries, os.urandom(32): os.urandom(41)}
+
+        buffer = container_format.dumps(entries.items())
+        variable_buffer = container_format.dumps(variable_entries.items())
+        self.assertGreater(len(variable_buffer) - len(buffer), 8 * len(entries))
+
+        for container, expected in [
+            (container_format.loads(buffer), entries),
+            (container_format.loads(variable_buffer), variable_entries),
+        ]:
+            self.assertEqual(len(container), len(expected))
+            for label, ciphertext in expected.items():
+                self.assertEqual(container[label], ciphertext)
+
+    @parameterized.expand(CONTAINER_FORMATS)
+    def test_container_rejects_invalid_input(
+        self, container_format: ContainerFormat
+    ) -> None:
+        with self.assertRaises(ValueError):
+            container_format.dumps([(b"a", b"1"), (b"bb", b"2")])
+        with self.assertRaises(ValueError):
+            container_format.dumps([(b"a", b"1"), (b"a", b"2")])
+        with self.assertRaises(ValueError):
+            container_format.loads(b"not a container at all")
+
+    def test_hash_container_prefixes(self) -> None:
+        container_format = HashContainerFormat(load_factor=0.75, prefix_length=8)
+        entries = {os.urandom(64): os.urandom(16) for _ in range(1000)}
+
+        container = container_format.loads(container_format.dumps(entries.items()))
+        self.assertEqual(container.label_width, 8)
+        self.assertLessEqual(container.load_factor, 0.75)
+        self.assertGreater(container.load_factor, 0.7)
+        self.assertEqual(
+            dict(container.items()),
+            {label[:8]: ciphertext for label, ciphertext in entries.items()},
+        )
+        for label, ciphertext in entries.items():
+            self.assertEqual(container[label], ciphertext)
+
+        with self.assertRaises(ValueError):
+            container_format.dumps([(b"\x00" * 16, b"1"), (b"\x00" * 15 + b"1", b"2")])
+        with self.assertRaises(ValueError):
+            HashContainerFormat(load_factor=1.5)
+        with self.assertRaises(ValueError):
+            HashContainerFormat(load_factor=1.0)
+
+    def test_hash_container_missing_labels(self) -> None:
+        container_format = HashContainerFormat(load_factor=0.99, prefix_length=8)
+        for count in [1, 2, 100]:
+            entries = {os.urandom(8): os.urandom(16) for _ in range(count)}
+            buffer = container_format.dumps(entries.items())
+            container = container_format.loads(buffer)
+            self.assertGreater(container.num_slots, count)
+            for _ in range(100):
+                label = os.urandom(8)
+                self.assertNotIn(label, container)
+                with self.assertRaises(KeyError):
+                    container[label]
+
+            # A table without an empty slot is rejected rather than probed:
+            full_buffer = bytearray(buffer)
+            HASH_HEADER.pack_into(full_buffer, CONTAINER_HEADER.size, count)
+            with self.assertRaises(ValueError):
+                container_format.loads(full_buffer)
+
+    @parameterized.expand(CONTAINER_FORMATS)
+    def test_simple_edx_with_container(self, container_format: ContainerFormat) -> None:
+        for encryption_scheme in [
+            SimpleSymmetricEncryptionScheme(),
+            AesGcmSymmetricEncryptionScheme(),
+        ]:
+            eds_scheme = SimpleEDX(
+                dx_key_serializer=IntSerializer(),
+                dx_value_serializer=IntSerializer(),
+                encryption_scheme=encryption_scheme,
+                container_format=container_format,
+            )
+            self.__check_sum_arq(eds_scheme)
+
+    def __check_sum_arq(self, eds_scheme: SimpleEDX[int, int]) -> None:
+        arq_scheme = ARQ(eds_scheme=eds_scheme, aggregate_scheme=SumPrefix())
+        table = Table.make_from_list([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5])
+        key = arq_scheme.generate_key()
+        eds = arq_scheme.load_eds(arq_scheme.setup(key, table))
+
+        for query_start in range(table.domain.start, table.domain.end - 1):
+            for query_end in range(query_start + 1, table.domain.end):
+                range_query = RangeQuery(start=query_start, end=query_end)
+                self.assertEqual(
+                    arq_scheme.query(key, table.domain, range_query, eds),
+                    sum(table.filter_range(range_query)),
+                )
+
+    @parameterized.expand(CONTAINER_FORMATS)
+    def test_pi_base_emm_with_container(
+        self, container_format: ContainerFormat
+    ) -> None:
+        plaintext_mm: Multimap[str, int] = Multimap()
+        plaintext_mm.set("a", 1)
+        plaintext_mm.set("a", 2)
+        plaintext_mm.set("b", 3)
+
+        pi_base: PiBaseEMM[str, int] = PiBaseEMM(container_format=container_format)
+        key = pi_base.generate_key()
+        eds = pi_base.load_eds(pi_base.encrypt(key, plaintext_mm))
+
+        for keyword in ["a", "b"]:
+            response = pi_base.query(pi_base.token(key, keyword), eds)
+            self.assertCountEqual(
+                pi_base.resolve(key, response), plaintext_mm.get(keyword)
+            )
+        response = pi_base.query(pi_base.token(key, "c"), eds)
+        self.assertEqual(pi_base.resolve(key, response), [])
+
+    @parameterized.expand([(None,), *CONTAINER_FORMATS])
+    def test_pi_base_emm_encrypt_to(
+        self, container_format: Optional[ContainerFormat]
+    ) -> None:
+        plaintext_mm: Multimap[int, int] = Multimap()
+        for keyword in range(50):
+            for value in range(keyword % 5):
+                plaintext_mm.set(keyword, value)
+
+        pi_base: PiBaseEMM[int, int] = PiBaseEMM(
+            container_format=container_format, batch_size=8
+        )
+        key = pi_base.generate_key()
+        sink = io.BytesIO()
+        pi_base.encrypt_to(key, iter(plaintext_mm), sink)
+        eds = pi_base.load_eds(sink.getvalue())
+
+        self.assertEqual(len(eds), sum(len(values) for _, values in plaintext_mm))
+        for keyword, values in plaintext_mm:
+            response = pi_base.query(pi_base.token(key, keyword), eds)
+            self.assertEqual(pi_base.resolve(key, response), values)
+
+
+class TestDumpPickledPairs(unittest.TestCase):
+    @given(dictionaries(binary(min_size=1), binary(max_size=600), max_size=2500))
+    def test_dump_pickled_pairs(self, entries: Dict[bytes, bytes]) -> None:
+        sink = io.BytesIO()
+        dump_pickled_pairs(entries.items(), sink)
+        self.assertEqual(pickle.loads(sink.getvalue()), entries)
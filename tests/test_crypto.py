@@ -0,0 +1,131 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+import os
+import unittest
+
+from typing import List
+
+from hypothesis import given
+from cryptography.exceptions import InvalidTag
+from hypothesis.strategies import binary, lists
+from parameterized import parameterized
+
+from arca import crypto
+from arca.ste.hash_functions import SimpleHashFunctionScheme
+from arca.ste.symmetric_encryption import (
+    SymmetricEncryptionScheme,
+    AesSymmetricEncryptionScheme,
+    AesGcmSymmetricEncryptionScheme,
+    SimpleSymmetricEncryptionScheme,
+)
+
+
+KEY = os.urandom(16)
+
+
+class TestCryptoBatch(unittest.TestCase):
+    @given(lists(binary()))
+    def test_hash_batch(self, data: List[bytes]) -> None:
+        self.assertEqual(crypto.HashBatch(data), [crypto.Hash(d) for d in data])
+
+    @given(lists(binary()))
+    def test_hmac_batch(self, data: List[bytes]) -> None:
+        self.assertEqual(
+            crypto.HMACBatch(KEY, data), [crypto.HMAC(KEY, d) for d in data]
+        )
+
+    @given(lists(binary(max_size=80)))
+    def test_symmetric_batch_matches_single(self, plaintexts: List[bytes]) -> None:
+        """
+        Test that batch ciphertexts decrypt one at a time, and vice versa.
+        """
+        ciphertexts = crypto.SymmetricEncryptBatch(KEY, plaintexts)
+        self.assertEqual(len(set(ciphertexts)), len(ciphertexts))
+        self.assertEqual(
+            [crypto.SymmetricDecrypt(KEY, ct) for ct in ciphertexts], plaintexts
+        )
+
+        ciphertexts = [crypto.SymmetricEncrypt(KEY, pt) for pt in plaintexts]
+        self.assertEqual(crypto.SymmetricDecryptBatch(KEY, ciphertexts), plaintexts)
+
+    def test_symmetric_decrypt_batch_with_wrong_key(self) -> None:
+        ciphertexts = crypto.SymmetricEncryptBatch(KEY, [b"a" * 20] * 8)
+        with self.assertRaises(ValueError):
+            crypto.SymmetricDecryptBatch(os.urandom(16), ciphertexts)
+
+    @parameterized.expand(
+        [
+            (SimpleSymmetricEncryptionScheme(),),
+            (AesSymmetricEncryptionScheme(),),
+            (AesGcmSymmetricEncryptionScheme(),),
+        ]
+    )
+    def test_encryption_scheme_batch(
+        self, encryption_scheme: SymmetricEncryptionScheme
+    ) -> None:
+        plaintexts = [os.urandom(length) for length in range(50)]
+        ciphertexts = encryption_scheme.encrypt_batch(KEY, plaintexts)
+        self.assertEqual(
+            [encryption_scheme.decrypt(KEY, ct) for ct in ciphertexts], plaintexts
+        )
+        self.assertEqual(encryption_scheme.decrypt_batch(KEY, ciphertexts), plaintexts)
+
+        labels = [os.urandom(32) for _ in plaintexts]
+        ciphertexts = encryption_scheme.encrypt_batch(KEY, plaintexts, labels=labels)
+        self.assertEqual(encryption_scheme.decrypt_batch(KEY, ciphertexts), plaintexts)
+
+    def test_aes_gcm_deterministic_nonces(self) -> None:
+        encryption_scheme = AesGcmSymmetricEncryptionScheme()
+        plaintexts = [b"\x00" * 8] * 100
+        labels = [os.urandom(32) for _ in plaintexts]
+
+        ciphertexts = encryption_scheme.encrypt_batch(KEY, plaintexts, labels=labels)
+        self.assertEqual(
+            encryption_scheme.encrypt_batch(KEY, plaintexts, labels=labels),
+            ciphertexts,
+        )
+        self.assertEqual(len(set(ciphertexts)), len(ciphertexts))
+        self.assertEqual({len(ct) for ct in ciphertexts}, {8 + 28})
+        self.assertNotEqual(
+            encryption_scheme.encrypt_batch(KEY, [b"\x01" * 8], labels=labels[:1]),
+            ciphertexts[:1],
+        )
+        with self.assertRaises(ValueError):
+            encryption_scheme.encrypt_batch(KEY, plaintexts, labels=labels[1:])
+
+    def test_aes_gcm_rejects_tampering(self) -> None:
+        encryption_scheme = AesGcmSymmetricEncryptionScheme()
+        ciphertext = encryption_scheme.encrypt(KEY, b"attack at dawn")
+
+        tampered = ciphertext[:-1] + bytes([ciphertext[-1] ^ 1])
+        with self.assertRaises(InvalidTag):
+            encryption_scheme.decrypt(KEY, tampered)
+        with self.assertRaises(InvalidTag):
+            encryption_scheme.decrypt(os.urandom(16), ciphertext)
+        with self.assertRaises(ValueError):
+            encryption_scheme.decrypt(KEY, ciphertext[:20])
+
+    def test_hash_function_scheme_batch(self) -> None:
+        hashing_scheme = SimpleHashFunctionScheme()
+        data = [os.urandom(length) for length in range(50)]
+        self.assertEqual(
+            hashing_scheme.hmac_batch(KEY, data),
+            [hashing_scheme.hmac(KEY, d) for d in data],
+        )
+        self.assertEqual(
+            hashing_scheme.hash_batch(data), [hashing_scheme.hash(d) for d in data]
+        )
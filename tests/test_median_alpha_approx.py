@@ -16,11 +16,13 @@
 
 import unittest
 import math
+import multiprocessing
 
 from typing import List, Tuple, Union, Dict
+from unittest import mock
 
-from hypothesis import given
-from hypothesis.strategies import integers, lists
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists, tuples
 from parameterized import parameterized
 
 from arca.arq.plaintext_schemes.median import MedianAlphaApprox
@@ -35,9 +37,35 @@ from arca.ste.serializers import IntSerializer, StructSerializer, PickleSerializ
 from decimal import Decimal
 from fractions import Fraction
 
+
 DEFAULT_ALPHA = Fraction("1/2")
 
 
+def naive_median_alpha_approx_setup(
+    table: Table, alpha: Fraction
+) -> Dict[Tuple[int, int], List[int]]:
+    """
+    Computes the :class:`MedianAlphaApprox` data structure by sorting the
+    records of every window from scratch.
+    """
+    k = math.ceil(math.log2(table.domain.size())) if table.domain.size() > 1 else 0
+    max_p = math.ceil((2 * (1 + alpha)) / (1 - alpha))
+    plaintext_ds = {}
+    for level in range(1, k + 1):
+        block_size = 2 ** (k - level)
+        for j in range(1, math.ceil(table.domain.size() / block_size) + 1):
+            medians = []
+            for p in range(1, max_p + 1):
+                start = min((j - 1) * block_size, table.domain.end - 1)
+                end = min(start + (p * block_size), table.domain.end)
+                entries = sorted(table.filter_range(RangeQuery(start=start, end=end)))
+                medians.append(
+                    entries[math.ceil(len(entries) / 2) - 1] if entries else 0
+                )
+            plaintext_ds[(level, j)] = medians
+    return plaintext_ds
+
+
 def is_alpha_approximate_median(
     alpha: Union[float, Decimal, Fraction],
     median_candidate: int,
@@ -400,6 +428,51 @@ class TestMedianAlphaApprox(unittest.TestCase):
             expected_ds,
         )
 
+    @given(
+        lists(
+            tuples(integers(min_value=-20, max_value=40), integers(-100, 100)),
+            min_size=1,
+        )
+    )
+    def test_median_alpha_approx_setup_matches_naive(
+        self, entries: List[Tuple[int, int]]
+    ) -> None:
+        """
+        Test that the incremental setup matches sorting every window from
+        scratch, including on domains that do not start at 0.
+        """
+        table = Table.make(entries)
+        for alpha in [DEFAULT_ALPHA, Fraction("3/4")]:
+            self.assertEqual(
+                MedianAlphaApprox(alpha=alpha).setup(table),
+                naive_median_alpha_approx_setup(table, alpha),
+            )
+
+    @settings(deadline=None, max_examples=5)
+    @given(lists(integers(min_value=-1 * (2**16), max_value=2**16), min_size=1))
+    def test_median_alpha_approx_setup_multiprocess(self, entries: List[int]) -> None:
+        table = Table.make_from_list(entries)
+        self.assertEqual(
+            MedianAlphaApprox(alpha=DEFAULT_ALPHA, num_processes=2).setup(table),
+            self.aggregate_scheme.setup(table),
+        )
+
+    def test_median_alpha_approx_setup_spawn(self) -> None:
+        """
+        Test that the setup also runs on workers that are spawned rather
+        than forked, which must receive the table by pickling it.
+        """
+        table = Table.make([(index, (index * 37) % 101) for index in range(-50, 450)])
+        with mock.patch(
+            "arca.arq.plaintext_schemes.median.median_alpha_approx"
+            ".get_multiprocessing_context",
+            return_value=multiprocessing.get_context("spawn"),
+        ):
+            entries = MedianAlphaApprox(alpha=DEFAULT_ALPHA, num_processes=2).setup(
+                table
+            )
+        self.assertEqual(entries, self.aggregate_scheme.setup(table))
+
     @parameterized.expand(
         [
             (
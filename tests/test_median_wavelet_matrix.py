@@ -0,0 +1,143 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import unittest
+import math
+
+from typing import List, Tuple
+
+from hypothesis import given, settings
+from hypothesis.strategies import tuples, integers, lists
+from parameterized import parameterized
+
+from arca.arq.plaintext_schemes.median import MedianWaveletMatrix
+from arca.arq.range_aggregate_querier import ResolveContinue, ResolveDone
+from arca.arq import ARQ, Table, RangeQuery
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer, StructSerializer
+
+
+def exact_median(table: Table, range_query: RangeQuery) -> int:
+    entries = sorted(table.filter_range(range_query))
+    if len(entries) <= 0:
+        return 0
+    return entries[math.ceil(len(entries) / 2) - 1]
+
+
+class TestMedianWaveletMatrix(unittest.TestCase):
+    def setUp(self):
+        self.eds_scheme = SimpleEDX(
+            dx_key_serializer=StructSerializer(format_string="iii"),
+            dx_value_serializer=IntSerializer(),
+        )
+        self.aggregate_scheme = MedianWaveletMatrix()
+        self.arq_scheme = ARQ(
+            eds_scheme=self.eds_scheme, aggregate_scheme=self.aggregate_scheme
+        )
+
+    def run_plaintext_query(
+        self, table: Table, range_query: RangeQuery
+    ) -> Tuple[int, int]:
+        """
+        Runs the querier for the given query against the plaintext data
+        structure and returns the median with the number of rounds.
+        """
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        querier = self.aggregate_scheme.generate_querier(table.domain, range_query)
+        subqueries = querier.query()
+        num_rounds = 1
+        while True:
+            result = querier.resolve([plaintext_ds[query] for query in subqueries])
+            if isinstance(result, ResolveDone):
+                return int(result.aggregate), num_rounds
+            self.assertIsInstance(result, ResolveContinue)
+            subqueries = result.subqueries
+            num_rounds += 1
+
+    @given(
+        lists(
+            tuples(integers(min_value=-10, max_value=10), integers(-50, 50)),
+            min_size=1,
+        )
+    )
+    def test_median_wavelet_matrix(self, entries: List[Tuple[int, int]]) -> None:
+        """
+        Test for plaintext MedianWaveletMatrix scheme correctness.
+        """
+        table = Table.make(entries)
+        num_values = len({value for _, value in entries})
+        max_num_rounds = max(num_values - 1, 0).bit_length() + 2
+        for query_start in range(table.domain.start, table.domain.end):
+            for query_end in range(query_start + 1, table.domain.end + 1):
+                range_query = RangeQuery(start=query_start, end=query_end)
+                median, num_rounds = self.run_plaintext_query(table, range_query)
+                self.assertEqual(median, exact_median(table, range_query))
+                self.assertLessEqual(num_rounds, max_num_rounds)
+
+    @parameterized.expand(
+        [
+            (Table.make_from_list([5]), RangeQuery(start=0, end=1), 5),
+            (Table.make_from_list([3, 1, 2]), RangeQuery(start=0, end=3), 2),
+            (Table.make_from_list([4, 1, 3, 2]), RangeQuery(start=0, end=4), 2),
+            (Table.make_from_list([7, 7, 7, 7]), RangeQuery(start=1, end=3), 7),
+            (Table.make([(0, 1), (3, 2)]), RangeQuery(start=1, end=3), 0),
+            (Table.make([(0, 9), (0, -4), (0, 2)]), RangeQuery(start=0, end=1), 2),
+        ]
+    )
+    def test_median_wavelet_matrix_examples(
+        self, table: Table, range_query: RangeQuery, expected_median: int
+    ) -> None:
+        median, _ = self.run_plaintext_query(table, range_query)
+        self.assertEqual(median, expected_median)
+
+    def test_index_size(self) -> None:
+        table = Table.make_from_list([value % 8 for value in range(100)])
+        # One rank per record and level, plus the number of levels, the
+        # offsets, the number of zeros per level and the distinct values:
+        expected_size = 3 * 101 + 1 + 101 + 3 + 8
+        self.assertEqual(len(self.aggregate_scheme.setup(table)), expected_size)
+
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(
+                integers(min_value=-8, max_value=8),
+                integers(min_value=-1 * (2**20), max_value=2**20),
+            ),
+            min_size=1,
+        )
+    )
+    def test_median_wavelet_matrix_with_arq(
+        self, entries: List[Tuple[int, int]]
+    ) -> None:
+        """
+        Test for correctness of the ARQ instantiation with the
+        MedianWaveletMatrix scheme.
+        """
+        table = Table.make(entries)
+        key = self.arq_scheme.generate_key()
+        eds_serialized = self.arq_scheme.setup(key, table)
+        eds = self.arq_scheme.load_eds(eds_serialized)
+
+        range_queries = [
+            RangeQuery(start=query_start, end=query_end)
+            for query_start in range(table.domain.start, table.domain.end)
+            for query_end in range(query_start + 1, table.domain.end + 1)
+        ]
+        medians = self.arq_scheme.query_many(key, table.domain, range_queries, eds)
+        for range_query, median in zip(range_queries, medians):
+            self.assertEqual(median, exact_median(table, range_query))
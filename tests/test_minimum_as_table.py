@@ -28,6 +28,7 @@ from arca.arq.table import Table
 from arca.arq.range_query import RangeQuery
 from arca.ste.edx import SimpleEDX
 from arca.ste.serializers import PickleSerializer, IntSerializer
+from arca.util.math import log2_ceil
 
 
 class TestMinimumASTable(unittest.TestCase):
@@ -62,6 +63,33 @@ class TestMinimumASTable(unittest.TestCase):
                 expected_result = min(table.filter_range(range_query))
                 self.assertEqual(expected_result, resolve_output.aggregate)
 
+    @given(lists(integers(), min_size=1, max_size=70))
+    def test_minimum_as_table_setup_matches_reference(self, entries: List[int]) -> None:
+        """
+        Test that the MinimumASTable setup matches a direct scan of every
+        half-segment at every level.
+        """
+        table = Table.make_from_list(entries)
+
+        expected_ds = {}
+        for level in range(log2_ceil(len(entries)) + 1):
+            half_size = max(2 ** (level - 1), 1)
+            for half_start in range(0, len(entries), half_size):
+                half_end = min(half_start + half_size, len(entries))
+                indices = range(half_start, half_end)
+                if (half_start // half_size) % 2 == 0:
+                    indices = reversed(indices)
+
+                current_minimum = None
+                for i in indices:
+                    if current_minimum is None or entries[i] < current_minimum:
+                        current_minimum = entries[i]
+                    expected_ds[(level, i)] = current_minimum
+
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        self.assertEqual(dict(plaintext_ds.items()), expected_ds)
+        self.assertEqual(dict(plaintext_ds), expected_ds)
+
     @settings(deadline=None)
     @given(lists(integers(min_value=-1 * (2**31), max_value=2**31), min_size=1))
     def test_minimum_as_table_with_arq(self, entries: List[Tuple[str, str]]) -> None:
@@ -28,6 +28,7 @@ from arca.arq.table import Table
 from arca.arq.range_query import RangeQuery
 from arca.ste.edx import SimpleEDX
 from arca.ste.serializers import StructSerializer, IntSerializer
+from arca.util.math import log2_floor
 
 
 class TestMinimumSparseTable(unittest.TestCase):
@@ -50,8 +51,8 @@ class TestMinimumSparseTable(unittest.TestCase):
 
         plaintext_ds = self.aggregate_scheme.setup(table)
 
-        for query_start in range(table.domain.start, table.domain.end - 1):
-            for query_end in range(query_start + 1, table.domain.end):
+        for query_start in range(table.domain.start, table.domain.end):
+            for query_end in range(query_start + 1, table.domain.end + 1):
                 range_query = RangeQuery(start=query_start, end=query_end)
                 querier = self.aggregate_scheme.generate_querier(
                     table.domain, range_query
@@ -63,6 +64,26 @@ class TestMinimumSparseTable(unittest.TestCase):
                 expected_result = min(table.filter_range(range_query))
                 self.assertEqual(expected_result, resolve_output.aggregate)
 
+    @given(lists(integers(), min_size=1, max_size=70))
+    def test_minimum_sparse_table_setup_matches_reference(
+        self, entries: List[int]
+    ) -> None:
+        """
+        Test that every level of the sparse table holds the minimum of the
+        window of size 2**power ending at each index.
+        """
+        table = Table.make_from_list(entries)
+
+        expected_ds = {}
+        for power in range(log2_floor(len(entries)) + 1):
+            for index in range(len(entries)):
+                window_start = max(index - 2**power + 1, 0)
+                expected_ds[(power, index)] = min(entries[window_start : index + 1])
+
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        self.assertEqual(dict(plaintext_ds.items()), expected_ds)
+        self.assertEqual(dict(plaintext_ds), expected_ds)
+
     @given(lists(integers(min_value=-1 * (2**31), max_value=2**31), min_size=1))
     def test_minimum_sparse_table_with_arq(
         self, entries: List[Tuple[str, str]]
@@ -0,0 +1,116 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import unittest
+
+from typing import List, Tuple
+
+from hypothesis import given, settings
+from hypothesis.strategies import tuples, integers, lists
+
+from arca.arq import ARQ, Domain, RangeQuery, RangeQuery2D, Table2D
+from arca.arq.plaintext_schemes.minimum import MinimumSparseTable2D
+from arca.arq.range_aggregate_querier import ResolveDone
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer, StructSerializer
+
+
+class TestMinimumSparseTable2D(unittest.TestCase):
+    def setUp(self):
+        self.eds_scheme = SimpleEDX(
+            dx_key_serializer=StructSerializer(format_string="iiii"),
+            dx_value_serializer=IntSerializer(),
+        )
+        self.aggregate_scheme = MinimumSparseTable2D()
+        self.arq_scheme = ARQ(
+            eds_scheme=self.eds_scheme, aggregate_scheme=self.aggregate_scheme
+        )
+
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(
+                integers(min_value=2, max_value=10),
+                integers(min_value=-3, max_value=3),
+                integers(),
+            ),
+            min_size=1,
+        )
+    )
+    def test_minimum_sparse_table_2d(self, records: List[Tuple[int, int, int]]) -> None:
+        """
+        Test for plaintext MinimumSparseTable2D scheme correctness.
+        """
+        table = Table2D.make(records)
+        plaintext_ds = self.aggregate_scheme.setup(table)
+
+        for range_query in RangeQuery2D.enumerate_all(table.domain):
+            querier = self.aggregate_scheme.generate_querier(table.domain, range_query)
+
+            subqueries = querier.query()
+            self.assertLessEqual(len(subqueries), 4)
+            responses = [plaintext_ds[query] for query in subqueries]
+            resolve_output = querier.resolve(responses)
+            self.assertTrue(isinstance(resolve_output, ResolveDone))
+
+            # Points without records count as 0, as in MinimumSparseTable:
+            expected_minimum = min(
+                min(table.filter(x, y), default=0)
+                for x in range(range_query.x.start, range_query.x.end)
+                for y in range(range_query.y.start, range_query.y.end)
+            )
+            self.assertEqual(resolve_output.aggregate, expected_minimum)
+
+    def test_minimum_sparse_table_2d_querier(self) -> None:
+        table = Table2D.make_from_grid([[0] * 8] * 6)
+        querier = self.aggregate_scheme.generate_querier(
+            table.domain,
+            RangeQuery2D(x=RangeQuery(start=1, end=6), y=RangeQuery(start=2, end=3)),
+        )
+        self.assertEqual(querier.query(), [(2, 0, 4, 2), (2, 0, 5, 2)])
+
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(
+                integers(min_value=0, max_value=4),
+                integers(min_value=0, max_value=4),
+                integers(min_value=-1 * (2**20), max_value=2**20),
+            ),
+            min_size=1,
+        )
+    )
+    def test_minimum_sparse_table_2d_with_arq(
+        self, records: List[Tuple[int, int, int]]
+    ) -> None:
+        """
+        Test for correctness of the ARQ instantiation with the
+        MinimumSparseTable2D scheme.
+        """
+        table = Table2D.make(records)
+        key = self.arq_scheme.generate_key()
+        eds = self.arq_scheme.load_eds(self.arq_scheme.setup(key, table))
+
+        range_queries = list(RangeQuery2D.enumerate_all(table.domain))
+        minimums = self.arq_scheme.query_many(key, table.domain, range_queries, eds)
+        for range_query, actual_minimum in zip(range_queries, minimums):
+            expected_minimum = min(
+                min(table.filter(x, y), default=0)
+                for x in range(range_query.x.start, range_query.x.end)
+                for y in range(range_query.y.start, range_query.y.end)
+            )
+            self.assertEqual(actual_minimum, expected_minimum)
@@ -21,7 +21,7 @@ from statistics import mode
 from collections import Counter
 
 from hypothesis import given
-from hypothesis.strategies import integers, lists
+from hypothesis.strategies import integers, lists, tuples
 from parameterized import parameterized
 
 from arca.arq.plaintext_schemes.mode import ModeASTable
@@ -29,6 +29,7 @@ from arca.arq.range_aggregate_querier import ResolveDone
 from arca.arq import ARQ, Domain, Table, Table, RangeQuery
 from arca.ste.edx import SimpleEDX
 from arca.ste.serializers import StructSerializer
+from arca.util.math import log2_ceil
 
 ALPHA = 0.5
 
@@ -323,3 +324,102 @@ class TestMinimumSparseTable(unittest.TestCase):
             self.aggregate_scheme.setup(table),
             expected_ds,
         )
+
+    @given(lists(integers(min_value=-4, max_value=4), min_size=1, max_size=70))
+    def test_mode_as_table_setup_matches_reference(self, entries: List[int]) -> None:
+        """
+        Test that the ModeASTable setup matches a direct scan of every
+        half-segment at every level.
+        """
+        table = Table.make_from_list(entries)
+
+        expected_ds = {}
+        for level in range(log2_ceil(len(entries)) + 1):
+            half_size = max(2 ** (level - 1), 1)
+            for half_start in range(0, len(entries), half_size):
+                half_end = min(half_start + half_size, len(entries))
+                indices = range(half_start, half_end)
+                if (half_start // half_size) % 2 == 0:
+                    indices = reversed(indices)
+
+                counts: Dict[int, int] = Counter()
+                current_mode, current_count = 0, 0
+                for i in indices:
+                    counts[entries[i]] += 1
+                    if counts[entries[i]] > current_count:
+                        current_mode, current_count = entries[i], counts[entries[i]]
+                    expected_ds[(level, i)] = (current_mode, current_count)
+
+        self.assertEqual(dict(self.aggregate_scheme.setup(table).items()), expected_ds)
+
+    @given(
+        lists(
+            tuples(integers(min_value=0, max_value=20), integers(-3, 3)),
+            min_size=1,
+            max_size=70,
+        )
+    )
+    def test_mode_as_table_setup_counts_every_record(
+        self, entries: List[Tuple[int, int]]
+    ) -> None:
+        """
+        Test that the ModeASTable setup counts every record of every point
+        (including points with several records or none) in each
+        half-segment.
+        """
+        table = Table.make(entries)
+        plaintext_ds = self.aggregate_scheme.setup(table)
+
+        size = table.domain.size()
+        for level in range(log2_ceil(size) + 1):
+            half_size = max(2 ** (level - 1), 1)
+            for index in range(size):
+                half_start = index - index % half_size
+                if (index // half_size) % 2 == 0:
+                    scanned = range(index, min(half_start + half_size, size))
+                else:
+                    scanned = range(half_start, index + 1)
+                counts = Counter(
+                    record
+                    for i in scanned
+                    for record in table.filter(table.domain.start + i)
+                )
+
+                mode_candidate, count = plaintext_ds[(level, index)]
+                self.assertEqual(count, max(counts.values(), default=0))
+                if count > 0:
+                    self.assertEqual(counts[mode_candidate], count)
+
+    def test_mode_as_table_resolve_adds_counts(self) -> None:
+        querier = self.aggregate_scheme.generate_querier(
+            Domain(start=0, end=4), RangeQuery(start=0, end=4)
+        )
+        self.assertEqual(querier.resolve([(1, 3), (2, 2), (2, 2)]).aggregate, 2)
+        self.assertEqual(querier.resolve([(1, 3), (2, 2)]).aggregate, 1)
+
+    @given(
+        lists(
+            tuples(integers(min_value=0, max_value=12), integers(-3, 3)),
+            min_size=1,
+        )
+    )
+    def test_mode_as_table_with_arq_and_repeated_points(
+        self, entries: List[Tuple[int, int]]
+    ) -> None:
+        # The querier indexes the table by domain value, so the domain
+        # starts at 0:
+        table = Table.make([(0, 0)] + entries)
+        key = self.arq_scheme.generate_key()
+        eds = self.arq_scheme.load_eds(self.arq_scheme.setup(key, table))
+
+        for query_start in range(table.domain.start, table.domain.end):
+            for query_end in range(query_start + 1, table.domain.end + 1):
+                range_query = RangeQuery(start=query_start, end=query_end)
+                if len(table.filter_range(range_query)) <= 0:
+                    continue
+                actual_result = self.arq_scheme.query(
+                    key, table.domain, range_query, eds
+                )
+                self.assertTrue(
+                    is_alpha_approximate_mode(ALPHA, actual_result, table, range_query)
+                )
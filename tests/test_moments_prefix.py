@@ -0,0 +1,157 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import unittest
+
+from typing import List, Tuple
+from fractions import Fraction
+
+from hypothesis import given, settings
+from hypothesis.strategies import tuples, integers, lists
+
+from arca.arq import Moments
+from arca.arq.plaintext_schemes.sum import MomentsPrefix, SumPrefix
+from arca.arq.range_aggregate_querier import ResolveDone
+from arca.arq.arq import ARQ
+from arca.arq.table import Table
+from arca.arq.range_query import RangeQuery
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer, StructSerializer
+
+
+def expected_moments(table: Table, range_query: RangeQuery) -> Moments:
+    records = table.filter_range(range_query)
+    return Moments(
+        count=len(records),
+        total=sum(records),
+        sum_of_squares=sum(record * record for record in records),
+    )
+
+
+class TestMomentsPrefix(unittest.TestCase):
+    def setUp(self):
+        self.eds_scheme = SimpleEDX(
+            dx_key_serializer=IntSerializer(),
+            dx_value_serializer=StructSerializer(format_string="qqq"),
+        )
+        self.aggregate_scheme = MomentsPrefix()
+        self.arq_scheme = ARQ(
+            eds_scheme=self.eds_scheme, aggregate_scheme=self.aggregate_scheme
+        )
+
+    @given(lists(tuples(integers(min_value=-20, max_value=20), integers()), min_size=1))
+    def test_moments_prefix(self, entries: List[Tuple[int, int]]) -> None:
+        """
+        Test for plaintext MomentsPrefix scheme correctness.
+        """
+        table = Table.make(entries)
+
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        self.assertEqual(len(plaintext_ds), table.domain.size())
+        sum_ds = SumPrefix().setup(table)
+        for domain_value, (_, total, _) in plaintext_ds.items():
+            self.assertEqual(total, sum_ds[domain_value])
+
+        for query_start in range(table.domain.start, table.domain.end):
+            for query_end in range(query_start + 1, table.domain.end + 1):
+                range_query = RangeQuery(start=query_start, end=query_end)
+                querier = self.aggregate_scheme.generate_querier(
+                    table.domain, range_query
+                )
+
+                subqueries = querier.query()
+                self.assertLessEqual(len(subqueries), 2)
+                responses = [plaintext_ds[query] for query in subqueries]
+                resolve_output = querier.resolve(responses)
+                self.assertTrue(isinstance(resolve_output, ResolveDone))
+                self.assertEqual(
+                    resolve_output.aggregate, expected_moments(table, range_query)
+                )
+
+    def test_moments(self) -> None:
+        moments = Moments(count=4, total=10, sum_of_squares=30)
+        self.assertEqual(moments.mean, Fraction(5, 2))
+        self.assertEqual(moments.variance, Fraction(5, 4))
+        self.assertEqual(
+            moments - Moments(count=1, total=1, sum_of_squares=1),
+            Moments(count=3, total=9, sum_of_squares=29),
+        )
+
+        empty_moments = Moments(count=0, total=0, sum_of_squares=0)
+        with self.assertRaises(ValueError):
+            empty_moments.mean
+        with self.assertRaises(ValueError):
+            empty_moments.variance
+
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(
+                integers(min_value=-16, max_value=16),
+                integers(min_value=-1 * (2**20), max_value=2**20),
+            ),
+            min_size=1,
+        )
+    )
+    def test_moments_prefix_with_arq(self, entries: List[Tuple[int, int]]) -> None:
+        """
+        Test for correctness of the ARQ instantiation with the MomentsPrefix
+        scheme, including the mean and variance of every range.
+        """
+        table = Table.make(entries)
+        key = self.arq_scheme.generate_key()
+        eds_serialized = self.arq_scheme.setup(key, table)
+        eds = self.arq_scheme.load_eds(eds_serialized)
+
+        for query_start in range(table.domain.start, table.domain.end):
+            for query_end in range(query_start + 1, table.domain.end + 1):
+                range_query = RangeQuery(start=query_start, end=query_end)
+                moments = self.arq_scheme.query(key, table.domain, range_query, eds)
+                self.assertEqual(moments, expected_moments(table, range_query))
+
+                records = table.filter_range(range_query)
+                if len(records) > 0:
+                    mean = Fraction(sum(records), len(records))
+                    self.assertEqual(moments.mean, mean)
+                    self.assertEqual(
+                        moments.variance,
+                        sum((record - mean) ** 2 for record in records) / len(records),
+                    )
+
+    def test_moments_prefix_with_large_records(self) -> None:
+        table = Table.make([(0, 2**40), (1, -(2**40)), (2, 3)])
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        self.assertEqual(plaintext_ds[2], (3, 3, 2 * 2**80 + 9))
+
+    def test_moments_prefix_append(self) -> None:
+        table = Table.make([(0, 3), (1, -2), (1, 5)])
+        extended_table = table.extend([(2, 4), (4, 1), (4, 1)])
+
+        entries = dict(self.aggregate_scheme.setup(table).items())
+        subqueries = self.aggregate_scheme.append_subqueries(
+            table.domain, extended_table.domain
+        )
+        entries.update(
+            self.aggregate_scheme.append(
+                table.domain,
+                extended_table,
+                {subquery: entries[subquery] for subquery in subqueries},
+            )
+        )
+        self.assertEqual(
+            entries, dict(self.aggregate_scheme.setup(extended_table).items())
+        )
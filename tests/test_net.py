@@ -0,0 +1,255 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from typing import Callable, List, Optional, Tuple, Union
+
+from hypothesis import given
+from hypothesis.strategies import binary, lists, none, one_of
+
+from arca.arq import ARQ, RangeQuery, Table
+from arca.arq.plaintext_schemes.minimum import MinimumSparseTable
+from arca.arq.plaintext_schemes.sum import SumPrefix
+from arca.net import ARQClient, ARQClientPool, ARQServer, RemoteError
+from arca.net.protocol import MessageKind, pack_frame, pack_items, unpack_items
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer, StructSerializer
+
+
+class TestProtocol(unittest.TestCase):
+    @given(lists(one_of(none(), binary())))
+    def test_items_round_trip(self, items: List[Optional[bytes]]) -> None:
+        self.assertEqual(unpack_items(pack_items(items)), items)
+
+    def test_items_rejects_truncated_payload(self) -> None:
+        payload = pack_items([b"abc", b"def"])
+        with self.assertRaises(ValueError):
+            unpack_items(payload[:-1])
+        with self.assertRaises(ValueError):
+            unpack_items(payload + b"\x00")
+
+
+class TestClientServer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.table = Table.make_from_list([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, 8, 9, 7])
+        self.arq_schemes: List[Tuple[ARQ, Callable[[List[int]], int]]] = [
+            (
+                ARQ(
+                    eds_scheme=SimpleEDX(
+                        dx_key_serializer=IntSerializer(),
+                        dx_value_serializer=IntSerializer(),
+                    ),
+                    aggregate_scheme=SumPrefix(),
+                ),
+                sum,
+            ),
+            (
+                ARQ(
+                    eds_scheme=SimpleEDX(
+                        dx_key_serializer=StructSerializer(format_string="ii"),
+                        dx_value_serializer=IntSerializer(),
+                    ),
+                    aggregate_scheme=MinimumSparseTable(),
+                ),
+                min,
+            ),
+        ]
+        self.range_queries = [
+            RangeQuery(start=query_start, end=query_end)
+            for query_start in range(self.table.domain.start, self.table.domain.end)
+            for query_end in range(query_start + 1, self.table.domain.end + 1)
+        ]
+
+    async def test_tcp(self) -> None:
+        for arq_scheme, aggregate in self.arq_schemes:
+            key = arq_scheme.generate_key()
+            server = ARQServer.from_bytes(
+                arq_scheme.eds_scheme, arq_scheme.setup(key, self.table)
+            )
+            listener = await server.start_tcp("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                async with await ARQClient.connect_tcp("127.0.0.1", port) as client:
+                    await self.__check_queries(client, arq_scheme, aggregate, key)
+
+    async def test_unix(self) -> None:
+        arq_scheme, aggregate = self.arq_schemes[0]
+        key = arq_scheme.generate_key()
+        server = ARQServer.from_bytes(
+            arq_scheme.eds_scheme, arq_scheme.setup(key, self.table)
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "arca.sock")
+            async with await server.start_unix(path):
+                async with await ARQClient.connect_unix(path) as client:
+                    await self.__check_queries(client, arq_scheme, aggregate, key)
+
+    async def test_pool(self) -> None:
+        for arq_scheme, aggregate in self.arq_schemes:
+            key = arq_scheme.generate_key()
+            server = ARQServer.from_bytes(
+                arq_scheme.eds_scheme, arq_scheme.setup(key, self.table)
+            )
+            listener = await server.start_tcp("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                pool = await ARQClientPool.connect_tcp("127.0.0.1", port, size=3)
+                self.assertEqual(len(pool.clients), 3)
+                with mock.patch.object(
+                    ARQServer,
+                    "query_batch",
+                    autospec=True,
+                    side_effect=ARQServer.query_batch,
+                ) as query_batch:
+                    async with pool:
+                        await self.__check_queries(pool, arq_scheme, aggregate, key)
+
+                # The tokens of every concurrent query are sent together:
+                self.assertEqual(query_batch.call_count, 1)
+
+    async def test_pool_splits_batches(self) -> None:
+        arq_scheme, _ = self.arq_schemes[0]
+        key = arq_scheme.generate_key()
+        server = ARQServer.from_bytes(
+            arq_scheme.eds_scheme, arq_scheme.setup(key, self.table)
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "arca.sock")
+            async with await server.start_unix(path):
+                pool = await ARQClientPool.connect_unix(path, size=2, max_batch_size=4)
+                async with pool:
+                    search_tokens = [
+                        arq_scheme.eds_scheme.token(key, index) for index in range(10)
+                    ]
+                    with mock.patch.object(
+                        ARQServer,
+                        "query_batch",
+                        autospec=True,
+                        side_effect=ARQServer.query_batch,
+                    ) as query_batch:
+                        responses = await asyncio.gather(
+                            pool.query_server_batch(search_tokens),
+                            pool.query_server_batch(search_tokens[5:] + [b"missing"]),
+                        )
+
+                self.assertEqual(
+                    responses,
+                    [
+                        server.query_batch(search_tokens),
+                        server.query_batch(search_tokens[5:] + [b"missing"]),
+                    ],
+                )
+                # 11 distinct tokens, at most 4 per request:
+                self.assertEqual(query_batch.call_count, 3)
+
+    async def test_pool_close_waits_for_queries(self) -> None:
+        arq_scheme, aggregate = self.arq_schemes[0]
+        key = arq_scheme.generate_key()
+        server = ARQServer.from_bytes(
+            arq_scheme.eds_scheme, arq_scheme.setup(key, self.table)
+        )
+        listener = await server.start_tcp("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            pool = await ARQClientPool.connect_tcp("127.0.0.1", port, size=2)
+            queries = [
+                asyncio.ensure_future(
+                    pool.query(arq_scheme, key, self.table.domain, range_query)
+                )
+                for range_query in self.range_queries
+            ]
+            # Let the queries submit their tokens, then close while they are
+            # still waiting on the server:
+            await asyncio.sleep(0)
+            await pool.close()
+
+            self.assertTrue(all(query.done() for query in queries))
+            for range_query, query in zip(self.range_queries, queries):
+                self.assertEqual(
+                    query.result(), aggregate(self.table.filter_range(range_query))
+                )
+
+    async def test_server_errors(self) -> None:
+        arq_scheme, _ = self.arq_schemes[0]
+        key = arq_scheme.generate_key()
+        server = ARQServer.from_bytes(
+            arq_scheme.eds_scheme, arq_scheme.setup(key, self.table)
+        )
+        listener = await server.start_tcp("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            client = ARQClient(reader, writer)
+
+            # Malformed requests fail without closing the connection:
+            writer.write(pack_frame(1000, MessageKind.QUERY, b"\x01"))
+            writer.write(pack_frame(1001, MessageKind.RESPONSE, pack_items([])))
+            with self.assertRaises(RemoteError):
+                await client.query_server_batch([None])  # type: ignore[list-item]
+            self.assertEqual(await client.query_server_batch([b"token"]), [None])
+            self.assertFalse(client.pending)
+            await client.close()
+
+            with self.assertRaises(ConnectionError):
+                await client.query_server_batch([b"token"])
+
+    async def test_querier_without_subqueries(self) -> None:
+        arq_scheme, _ = self.arq_schemes[0]
+        key = arq_scheme.generate_key()
+        server = ARQServer.from_bytes(
+            arq_scheme.eds_scheme, arq_scheme.setup(key, self.table)
+        )
+        listener = await server.start_tcp("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            client = await ARQClient.connect_tcp("127.0.0.1", port)
+            stuck_querier = mock.Mock()
+            stuck_querier.query.return_value = []
+            with mock.patch.object(
+                ARQ, "generate_querier", return_value=stuck_querier
+            ), self.assertRaisesRegex(ValueError, "no subqueries"):
+                await client.query(
+                    arq_scheme, key, self.table.domain, self.range_queries[0]
+                )
+            self.assertFalse(client.pending)
+            await client.close()
+
+    async def __check_queries(
+        self,
+        client: Union[ARQClient, ARQClientPool],
+        arq_scheme: ARQ,
+        aggregate: Callable[[List[int]], int],
+        key: bytes,
+    ) -> None:
+        # The queries are pipelined over the single connection:
+        aggregates = await client.query_many(
+            arq_scheme, key, self.table.domain, self.range_queries
+        )
+        self.assertEqual(
+            aggregates,
+            [
+                aggregate(self.table.filter_range(range_query))
+                for range_query in self.range_queries
+            ],
+        )
+        self.assertFalse(client.pending)
@@ -0,0 +1,189 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import multiprocessing
+import unittest
+
+from typing import Iterator, List, Tuple
+from unittest import mock
+
+from hypothesis import given
+from hypothesis.strategies import binary, lists, tuples
+from parameterized import parameterized
+
+from arca.ste.edx import SimpleEDX
+from arca.ste.edx.simple_revealing_edx import SimpleRevealingEDX
+from arca.ste.emm import Multimap, PiBaseEMM, PiBasePackedEMM, PiBaseRevealingEMM
+from arca.ste.parallel_encryption import (
+    TASKS_PER_PROCESS,
+    encrypt_in_parallel,
+    pack_shard,
+    unpack_shard,
+)
+from arca.ste.serializers import IntSerializer
+
+
+def reverse_chunk(chunk: List[bytes]) -> List[Tuple[bytes, bytes]]:
+    return [(entry, entry[::-1]) for entry in chunk]
+
+
+class TestParallelEncryption(unittest.TestCase):
+    @given(lists(tuples(binary(), binary())), lists(tuples(binary(), binary())))
+    def test_shard_round_trip(
+        self, pairs: List[Tuple[bytes, bytes]], more_pairs: List[Tuple[bytes, bytes]]
+    ) -> None:
+        self.assertEqual(list(unpack_shard(pack_shard(pairs))), pairs)
+        self.assertEqual(
+            list(unpack_shard(pack_shard(pairs) + pack_shard(more_pairs))),
+            pairs + more_pairs,
+        )
+
+    @parameterized.expand([(1,), (3,)])
+    def test_encrypt_in_parallel(self, num_processes: int) -> None:
+        entries = [str(index).encode() for index in range(1000)]
+        self.assertEqual(
+            list(
+                encrypt_in_parallel(
+                    reverse_chunk,
+                    entries,
+                    num_processes=num_processes,
+                    batch_size=64,
+                    num_entries=len(entries),
+                )
+            ),
+            reverse_chunk(entries),
+        )
+
+    def test_encrypt_in_parallel_without_fork(self) -> None:
+        """
+        Test that entries are sent as chunks when workers cannot inherit
+        them from a fork.
+        """
+        entries = {str(index).encode(): None for index in range(1000)}
+        with mock.patch("multiprocessing.get_start_method", return_value="spawn"):
+            pairs = encrypt_in_parallel(
+                reverse_chunk,
+                iter(entries),
+                num_processes=2,
+                batch_size=64,
+                num_entries=len(entries),
+            )
+            self.assertEqual(list(pairs), reverse_chunk(list(entries)))
+
+    def test_encrypt_in_parallel_streams_entries(self) -> None:
+        """
+        Test that entries without a length are read from the stream a window
+        at a time rather than all at once.
+        """
+        num_read = 0
+
+        def stream_entries() -> Iterator[bytes]:
+            nonlocal num_read
+            for index in range(10000):
+                num_read += 1
+                yield str(index).encode()
+
+        pairs = encrypt_in_parallel(
+            reverse_chunk, stream_entries(), num_processes=2, batch_size=16
+        )
+        self.assertEqual(next(pairs), (b"0", b"0"))
+        # At most two windows of 2 * TASKS_PER_PROCESS chunks are read ahead:
+        self.assertLessEqual(num_read, 2 * 2 * TASKS_PER_PROCESS * 16)
+        self.assertEqual(
+            [(b"0", b"0")] + list(pairs),
+            reverse_chunk([str(index).encode() for index in range(10000)]),
+        )
+
+    def test_encrypt_in_parallel_keeps_start_method(self) -> None:
+        """
+        Test that encrypting in parallel only looks up the start method of
+        :mod:`multiprocessing` without fixing it.
+        """
+        entries = [str(index).encode() for index in range(100)]
+        with mock.patch(
+            "multiprocessing.get_start_method",
+            wraps=multiprocessing.get_start_method,
+        ) as get_start_method:
+            pairs = encrypt_in_parallel(
+                reverse_chunk, entries, num_processes=2, batch_size=16
+            )
+            self.assertEqual(list(pairs), reverse_chunk(entries))
+
+        self.assertGreater(get_start_method.call_count, 0)
+        for call in get_start_method.call_args_list:
+            self.assertEqual(call, mock.call(allow_none=True))
+
+    @parameterized.expand([(1,), (2,)])
+    def test_edx_schemes(self, num_processes: int) -> None:
+        plaintext_dx = {index: index * index for index in range(500)}
+
+        eds_scheme: SimpleEDX[int, int] = SimpleEDX(
+            dx_key_serializer=IntSerializer(),
+            dx_value_serializer=IntSerializer(),
+            batch_size=16,
+            num_processes=num_processes,
+        )
+        key = eds_scheme.generate_key()
+        eds = eds_scheme.load_eds(eds_scheme.encrypt(key, plaintext_dx))
+        self.assertEqual(len(eds), len(plaintext_dx))
+        for label, value in plaintext_dx.items():
+            response = eds_scheme.query(eds_scheme.token(key, label), eds)
+            assert response is not None
+            self.assertEqual(eds_scheme.resolve(key, response), value)
+
+        revealing_eds_scheme: SimpleRevealingEDX[int, int] = SimpleRevealingEDX(
+            dx_key_serializer=IntSerializer(),
+            dx_value_serializer=IntSerializer(),
+            batch_size=16,
+            num_processes=num_processes,
+        )
+        key = revealing_eds_scheme.generate_key()
+        eds = revealing_eds_scheme.load_eds(
+            revealing_eds_scheme.encrypt(key, plaintext_dx)
+        )
+        self.assertEqual(len(eds), len(plaintext_dx))
+        for label, value in plaintext_dx.items():
+            token = revealing_eds_scheme.token(key, label)
+            self.assertEqual(revealing_eds_scheme.query(token, eds), value)
+
+    @parameterized.expand([(1,), (2,)])
+    def test_emm_schemes(self, num_processes: int) -> None:
+        plaintext_mm: Multimap[int, int] = Multimap()
+        for keyword in range(100):
+            for value in range(keyword % 7):
+                plaintext_mm.set(keyword, value)
+
+        for emm_scheme in [
+            PiBaseEMM(batch_size=8, num_processes=num_processes),
+            PiBasePackedEMM(batch_size=8, num_processes=num_processes, block_size=4),
+        ]:
+            key = emm_scheme.generate_key()
+            eds = emm_scheme.load_eds(emm_scheme.encrypt(key, plaintext_mm))
+            for keyword, values in plaintext_mm:
+                response = emm_scheme.query(emm_scheme.token(key, keyword), eds)
+                self.assertEqual(emm_scheme.resolve(key, response), values)
+
+        revealing_emm_scheme: PiBaseRevealingEMM[int, int] = PiBaseRevealingEMM(
+            batch_size=8, num_processes=num_processes
+        )
+        key = revealing_emm_scheme.generate_key()
+        eds = revealing_emm_scheme.load_eds(
+            revealing_emm_scheme.encrypt(key, plaintext_mm)
+        )
+        for keyword, values in plaintext_mm:
+            token = revealing_emm_scheme.token(key, keyword)
+            self.assertEqual(revealing_emm_scheme.query(token, eds), values)
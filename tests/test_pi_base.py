@@ -14,11 +14,45 @@
 ## limitations under the License.
 ##
 
+import io
+import math
 import unittest
 
+from typing import Dict, Iterator, List, Mapping
 
-from arca.ste.emm import PiBaseEMM, Multimap
-from arca.ste.symmetric_encryption import AesSymmetricEncryptionScheme
+from parameterized import parameterized
+
+from arca.ste.edx.simple_revealing_edx import SimpleRevealingEDX
+from arca.ste.emm import PiBaseEMM, PiBasePackedEMM, PiBaseRevealingEMM, Multimap
+from arca.ste.serializers import IntSerializer
+from arca.ste.symmetric_encryption import (
+    AesSymmetricEncryptionScheme,
+    AesGcmSymmetricEncryptionScheme,
+)
+
+
+class CountingMapping(Mapping[bytes, bytes]):
+    """
+    Wraps a mapping and counts the number of lookups made into it.
+    """
+
+    def __init__(self, mapping: Mapping[bytes, bytes]):
+        self.mapping = mapping
+        self.lookups = 0
+
+    def __getitem__(self, key: bytes) -> bytes:
+        self.lookups += 1
+        return self.mapping[key]
+
+    def __contains__(self, key: object) -> bool:
+        self.lookups += 1
+        return key in self.mapping
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.mapping)
+
+    def __len__(self) -> int:
+        return len(self.mapping)
 
 
 class TestPiBaseEMM(unittest.TestCase):
@@ -84,3 +118,82 @@ class TestPiBaseEMM(unittest.TestCase):
             self.assertCountEqual(
                 pi_base.resolve(key, response), plaintext_mm.get(plaintext_key)
             )
+
+
+class TestPiBasePackedEMM(unittest.TestCase):
+    @parameterized.expand([(1,), (3,), (64,)])
+    def test_pi_base_packed_emm_query(self, block_size: int) -> None:
+        plaintext_mm: Multimap[str, int] = Multimap()
+        value_counts = {"a": 1, "b": 3, "c": 4, "d": 100, "e": 200}
+        for keyword, count in value_counts.items():
+            for value in range(count):
+                plaintext_mm.set(keyword, value)
+
+        pi_base: PiBasePackedEMM[str, int] = PiBasePackedEMM(block_size=block_size)
+        key = pi_base.generate_key()
+        eds_bytes = pi_base.encrypt(key, plaintext_mm)
+
+        self.assertEqual(
+            len(pi_base.load_eds(eds_bytes)),
+            sum(math.ceil(count / block_size) for count in value_counts.values()),
+        )
+        for keyword, count in value_counts.items():
+            eds = CountingMapping(pi_base.load_eds(eds_bytes))
+            response = pi_base.query(pi_base.token(key, keyword), eds)
+            self.assertEqual(pi_base.resolve(key, response), plaintext_mm.get(keyword))
+            self.assertEqual(eds.lookups, math.ceil(count / block_size))
+
+        response = pi_base.query(pi_base.token(key, "z"), pi_base.load_eds(eds_bytes))
+        self.assertEqual(pi_base.resolve(key, response), [])
+
+    def test_pi_base_packed_emm_with_different_scheme(self) -> None:
+        plaintext_mm: Multimap[str, bytes] = Multimap()
+        values: Dict[str, List[bytes]] = {
+            "a": [b"x" * length for length in range(20)],
+            "b": [b""],
+        }
+        for keyword, keyword_values in values.items():
+            for value in keyword_values:
+                plaintext_mm.set(keyword, value)
+
+        pi_base: PiBasePackedEMM[str, bytes] = PiBasePackedEMM(
+            encryption_scheme=AesGcmSymmetricEncryptionScheme(), block_size=8
+        )
+        key = pi_base.generate_key()
+        eds = pi_base.load_eds(pi_base.encrypt(key, plaintext_mm))
+
+        for keyword, keyword_values in values.items():
+            response = pi_base.query(pi_base.token(key, keyword), eds)
+            self.assertEqual(pi_base.resolve(key, response), keyword_values)
+
+        with self.assertRaises(ValueError):
+            PiBasePackedEMM(block_size=0)
+
+
+class TestEncryptTo(unittest.TestCase):
+    def test_revealing_schemes_encrypt_to(self) -> None:
+        """
+        Test that schemes without a streaming encryption write the same
+        encrypted data structure to the sink as :func:`encrypt` returns.
+        """
+        plaintext_dx = {index: index * index for index in range(50)}
+        eds_scheme: SimpleRevealingEDX[int, int] = SimpleRevealingEDX(
+            dx_key_serializer=IntSerializer(), dx_value_serializer=IntSerializer()
+        )
+        key = eds_scheme.generate_key()
+        sink = io.BytesIO()
+        eds_scheme.encrypt_to(key, plaintext_dx.items(), sink)
+        eds = eds_scheme.load_eds(sink.getvalue())
+        self.assertEqual(len(eds), len(plaintext_dx))
+        for label, value in plaintext_dx.items():
+            self.assertEqual(eds_scheme.query(eds_scheme.token(key, label), eds), value)
+
+        values = {keyword: list(range(keyword % 5 + 1)) for keyword in range(20)}
+        emm_scheme: PiBaseRevealingEMM[int, int] = PiBaseRevealingEMM()
+        key = emm_scheme.generate_key()
+        sink = io.BytesIO()
+        emm_scheme.encrypt_to(key, values.items(), sink)
+        eds = emm_scheme.load_eds(sink.getvalue())
+        for keyword, keyword_values in values.items():
+            token = emm_scheme.token(key, keyword)
+            self.assertEqual(emm_scheme.query(token, eds), keyword_values)
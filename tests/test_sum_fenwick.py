@@ -0,0 +1,192 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import unittest
+
+from typing import List, Tuple
+
+from hypothesis import given, settings
+from hypothesis.strategies import tuples, integers, lists
+
+from arca.arq.plaintext_schemes.sum import SumFenwick, SumPrefix
+from arca.arq.plaintext_schemes.sum.sum_fenwick import (
+    fenwick_prefix_nodes,
+    fenwick_update_nodes,
+)
+from arca.arq.range_aggregate_querier import ResolveDone
+from arca.arq.arq import ARQ
+from arca.arq.table import Table
+from arca.arq.domain import Domain
+from arca.arq.range_query import RangeQuery
+from arca.ste.containers import SortedContainerFormat
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer
+from arca.util.math import log2_floor
+
+
+class TestSumFenwick(unittest.TestCase):
+    def setUp(self):
+        self.eds_scheme = SimpleEDX(
+            dx_key_serializer=IntSerializer(), dx_value_serializer=IntSerializer()
+        )
+        self.aggregate_scheme = SumFenwick()
+        self.arq_scheme = ARQ(
+            eds_scheme=self.eds_scheme, aggregate_scheme=self.aggregate_scheme
+        )
+
+    @given(lists(tuples(integers(min_value=0, max_value=100), integers()), min_size=1))
+    def test_sum_fenwick(self, entries: List[Tuple[int, int]]) -> None:
+        """
+        Test for plaintext SumFenwick scheme correctness.
+        """
+        table = Table.make(entries)
+
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        self.assertEqual(len(plaintext_ds), table.domain.size())
+
+        max_num_subqueries = 2 * (log2_floor(table.domain.size()) + 1)
+        for query_start in range(table.domain.start, table.domain.end):
+            for query_end in range(query_start + 1, table.domain.end + 1):
+                range_query = RangeQuery(start=query_start, end=query_end)
+                querier = self.aggregate_scheme.generate_querier(
+                    table.domain, range_query
+                )
+
+                subqueries = querier.query()
+                self.assertLessEqual(len(subqueries), max_num_subqueries)
+                responses = [plaintext_ds[query] for query in subqueries]
+                resolve_output = querier.resolve(responses)
+                self.assertTrue(isinstance(resolve_output, ResolveDone))
+                expected_result = sum(table.filter_range(range_query))
+                self.assertEqual(expected_result, resolve_output.aggregate)
+
+    @given(
+        lists(tuples(integers(min_value=-40, max_value=40), integers()), min_size=1),
+        integers(min_value=0, max_value=4),
+    )
+    def test_sum_fenwick_matches_prefix_sums(
+        self, entries: List[Tuple[int, int]], padding: int
+    ) -> None:
+        """
+        Test that every prefix sum computed from the Fenwick tree matches
+        the corresponding prefix sum of :class:`SumPrefix`.
+        """
+        table = Table.make(entries)
+        table = Table(
+            entries=table.entries,
+            domain=Domain(start=table.domain.start, end=table.domain.end + padding),
+        )
+
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        prefix_sums = SumPrefix().setup(table)
+        for position in range(1, table.domain.size() + 1):
+            self.assertEqual(
+                sum(plaintext_ds[node] for node in fenwick_prefix_nodes(position)),
+                prefix_sums[table.domain.start + position - 1],
+            )
+        for label, value in plaintext_ds.items():
+            self.assertIs(type(label), int)
+            self.assertIs(type(value), int)
+
+    def test_fenwick_nodes(self) -> None:
+        self.assertEqual(fenwick_prefix_nodes(0), [])
+        self.assertEqual(fenwick_prefix_nodes(13), [13, 12, 8])
+        self.assertEqual(fenwick_update_nodes(5, 16), [5, 6, 8, 16])
+        self.assertEqual(fenwick_update_nodes(5, 7), [5, 6])
+
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(
+                integers(min_value=-16, max_value=16),
+                integers(min_value=-1 * (2**20), max_value=2**20),
+            ),
+            min_size=1,
+        )
+    )
+    def test_sum_fenwick_with_arq(self, entries: List[Tuple[int, int]]) -> None:
+        """
+        Test for correctness of the ARQ instantiation with the SumFenwick scheme.
+        """
+        table = Table.make(entries)
+        key = self.arq_scheme.generate_key()
+        eds_serialized = self.arq_scheme.setup(key, table)
+        eds = self.arq_scheme.load_eds(eds_serialized)
+
+        for query_start in range(table.domain.start, table.domain.end):
+            for query_end in range(query_start + 1, table.domain.end + 1):
+                range_query = RangeQuery(start=query_start, end=query_end)
+                actual_result = self.arq_scheme.query(
+                    key, table.domain, range_query, eds
+                )
+
+                expected_result = sum(table.filter_range(range_query))
+                self.assertEqual(expected_result, actual_result)
+
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(integers(min_value=0, max_value=20), integers(-1000, 1000)),
+            min_size=1,
+            max_size=10,
+        )
+    )
+    def test_sum_fenwick_update(self, updates: List[Tuple[int, int]]) -> None:
+        """
+        Test that :func:`ARQ.update` keeps the encrypted index consistent
+        with the table as records are added and removed.
+        """
+        entries = [(domain_value, domain_value * 7) for domain_value in range(21)]
+        table = Table.make(entries)
+        key = self.arq_scheme.generate_key()
+        eds = self.arq_scheme.load_eds(self.arq_scheme.setup(key, table))
+
+        for domain_value, delta in updates:
+            self.arq_scheme.update(key, table.domain, domain_value, delta, eds)
+            entries.append((domain_value, delta))
+        self.assertEqual(len(eds), table.domain.size())
+
+        updated_table = Table.make(entries)
+        for query_start in range(table.domain.start, table.domain.end):
+            range_query = RangeQuery(start=query_start, end=table.domain.end)
+            self.assertEqual(
+                self.arq_scheme.query(key, table.domain, range_query, eds),
+                sum(updated_table.filter_range(range_query)),
+            )
+
+    def test_update_errors(self) -> None:
+        table = Table.make([(0, 1), (1, 2)])
+        key = self.arq_scheme.generate_key()
+        eds = self.arq_scheme.load_eds(self.arq_scheme.setup(key, table))
+        with self.assertRaises(ValueError):
+            self.arq_scheme.update(key, table.domain, 2, 1, eds)
+
+        arq_scheme = ARQ(eds_scheme=self.eds_scheme, aggregate_scheme=SumPrefix())
+        with self.assertRaises(TypeError):
+            arq_scheme.update(key, table.domain, 0, 1, eds)
+
+        arq_scheme = ARQ(
+            eds_scheme=SimpleEDX(
+                dx_key_serializer=IntSerializer(),
+                dx_value_serializer=IntSerializer(),
+                container_format=SortedContainerFormat(),
+            ),
+            aggregate_scheme=self.aggregate_scheme,
+        )
+        eds = arq_scheme.load_eds(arq_scheme.setup(key, table))
+        with self.assertRaises(TypeError):
+            arq_scheme.update(key, table.domain, 0, 1, eds)
@@ -25,6 +25,7 @@ from arca.arq.plaintext_schemes.sum import SumPrefix
 from arca.arq.range_aggregate_querier import ResolveDone
 from arca.arq.arq import ARQ
 from arca.arq.table import Table
+from arca.arq.domain import Domain
 from arca.arq.range_query import RangeQuery
 from arca.ste.edx import SimpleEDX
 from arca.ste.serializers import IntSerializer
@@ -62,6 +63,37 @@ class TestSumPrefix(unittest.TestCase):
                 expected_result = sum(table.filter_range(range_query))
                 self.assertEqual(expected_result, resolve_output.aggregate)
 
+    @given(
+        lists(tuples(integers(min_value=-100, max_value=100), integers()), min_size=1),
+        integers(min_value=0, max_value=4),
+    )
+    def test_sum_prefix_setup_matches_dict(
+        self, entries: List[Tuple[int, int]], padding: int
+    ) -> None:
+        """
+        Test that the array-backed SumPrefix setup contains exactly the same
+        prefix sums as a plain dictionary built one domain value at a time.
+        """
+        table = Table.make(entries)
+        table = Table(
+            entries=table.entries,
+            domain=Domain(start=table.domain.start, end=table.domain.end + padding),
+        )
+
+        expected_prefix_mapping = {}
+        running_sum = 0
+        for domain_value in range(table.domain.start, table.domain.end):
+            running_sum += sum(table.filter(domain_value))
+            expected_prefix_mapping[domain_value] = running_sum
+
+        plaintext_ds = self.aggregate_scheme.setup(table)
+
+        self.assertEqual(expected_prefix_mapping, dict(plaintext_ds.items()))
+        self.assertEqual(expected_prefix_mapping, dict(plaintext_ds))
+        for label, value in plaintext_ds.items():
+            self.assertIs(type(label), int)
+            self.assertIs(type(value), int)
+
     @settings(deadline=None)
     @given(
         lists(
@@ -0,0 +1,137 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import unittest
+
+from typing import List, Tuple
+
+from hypothesis import given, settings
+from hypothesis.strategies import tuples, integers, lists
+
+from arca.arq import ARQ, Domain, Domain2D, RangeQuery, RangeQuery2D, Table, Table2D
+from arca.arq.plaintext_schemes.sum import SumPrefix, SumPrefix2D
+from arca.arq.range_aggregate_querier import ResolveDone
+from arca.ste.edx import SimpleEDX
+from arca.ste.serializers import IntSerializer, StructSerializer
+
+
+class TestSumPrefix2D(unittest.TestCase):
+    def setUp(self):
+        self.eds_scheme = SimpleEDX(
+            dx_key_serializer=StructSerializer(format_string="ii"),
+            dx_value_serializer=IntSerializer(),
+        )
+        self.aggregate_scheme = SumPrefix2D()
+        self.arq_scheme = ARQ(
+            eds_scheme=self.eds_scheme, aggregate_scheme=self.aggregate_scheme
+        )
+
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(
+                integers(min_value=-4, max_value=4),
+                integers(min_value=3, max_value=9),
+                integers(),
+            ),
+            min_size=1,
+        )
+    )
+    def test_sum_prefix_2d(self, records: List[Tuple[int, int, int]]) -> None:
+        """
+        Test for plaintext SumPrefix2D scheme correctness.
+        """
+        table = Table2D.make(records)
+
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        self.assertEqual(len(plaintext_ds), table.domain.size())
+
+        for range_query in RangeQuery2D.enumerate_all(table.domain):
+            querier = self.aggregate_scheme.generate_querier(table.domain, range_query)
+
+            subqueries = querier.query()
+            self.assertLessEqual(len(subqueries), 4)
+            responses = [plaintext_ds[query] for query in subqueries]
+            resolve_output = querier.resolve(responses)
+            self.assertTrue(isinstance(resolve_output, ResolveDone))
+            self.assertEqual(
+                resolve_output.aggregate, sum(table.filter_range(range_query))
+            )
+
+    def test_sum_prefix_2d_with_large_records(self) -> None:
+        table = Table2D.make([(0, 0, 2**62), (0, 1, 2**62), (1, 1, 2**62)])
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        self.assertEqual(plaintext_ds[(1, 1)], 3 * 2**62)
+
+        table = Table2D.make([(0, 0, 2**62), (0, 0, 2**62), (1, 0, -(2**62))])
+        plaintext_ds = self.aggregate_scheme.setup(table)
+        self.assertEqual(plaintext_ds[(0, 0)], 2**63)
+        self.assertEqual(plaintext_ds[(1, 0)], 2**62)
+
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(
+                integers(min_value=0, max_value=5),
+                integers(min_value=-3, max_value=3),
+                integers(min_value=-1 * (2**20), max_value=2**20),
+            ),
+            min_size=1,
+        )
+    )
+    def test_sum_prefix_2d_with_arq(self, records: List[Tuple[int, int, int]]) -> None:
+        """
+        Test for correctness of the ARQ instantiation with the SumPrefix2D
+        scheme.
+        """
+        table = Table2D.make(records)
+        key = self.arq_scheme.generate_key()
+        eds = self.arq_scheme.load_eds(self.arq_scheme.setup(key, table))
+
+        range_queries = list(RangeQuery2D.enumerate_all(table.domain))
+        sums = self.arq_scheme.query_many(key, table.domain, range_queries, eds)
+        for range_query, actual_sum in zip(range_queries, sums):
+            self.assertEqual(actual_sum, sum(table.filter_range(range_query)))
+
+    def test_dimension_mismatch(self) -> None:
+        table = Table2D.make_from_grid([[1, 2], [3, 4]])
+        key = self.arq_scheme.generate_key()
+        eds = self.arq_scheme.load_eds(self.arq_scheme.setup(key, table))
+        with self.assertRaises(TypeError):
+            self.arq_scheme.setup(key, Table.make_from_list([1, 2]))
+        with self.assertRaises(TypeError):
+            self.arq_scheme.query(
+                key, Domain(start=0, end=2), RangeQuery(start=0, end=1), eds
+            )
+
+        arq_scheme = ARQ(
+            eds_scheme=SimpleEDX(
+                dx_key_serializer=IntSerializer(), dx_value_serializer=IntSerializer()
+            ),
+            aggregate_scheme=SumPrefix(),
+        )
+        with self.assertRaises(TypeError):
+            arq_scheme.setup(key, table)
+        with self.assertRaises(TypeError):
+            arq_scheme.query(
+                key,
+                Domain2D(x=Domain(start=0, end=2), y=Domain(start=0, end=2)),
+                RangeQuery2D(
+                    x=RangeQuery(start=0, end=1), y=RangeQuery(start=0, end=1)
+                ),
+                eds,
+            )
@@ -0,0 +1,110 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import unittest
+
+from typing import List, Tuple
+
+from hypothesis import given, settings
+from hypothesis.strategies import tuples, integers, lists
+
+import numpy as np
+
+from arca.arq import Domain, Domain2D, RangeQuery, RangeQuery2D, Table2D
+from arca.arq.array_mapping import NDArrayMapping
+
+
+class TestTable2D(unittest.TestCase):
+    @settings(deadline=None)
+    @given(
+        lists(
+            tuples(
+                integers(min_value=-5, max_value=5),
+                integers(min_value=0, max_value=6),
+                integers(),
+            ),
+            min_size=1,
+        )
+    )
+    def test_table_2d(self, records: List[Tuple[int, int, int]]) -> None:
+        table = Table2D.make(records)
+        self.assertEqual(table.number_of_records(), len(records))
+        self.assertEqual(
+            table.domain.x,
+            Domain(
+                start=min(r[0] for r in records), end=max(r[0] for r in records) + 1
+            ),
+        )
+
+        sums = table.reduce_points(np.add, 0, dtype=object)
+        minimums = table.reduce_points(np.minimum, 0)
+        for x in range(table.domain.x.start, table.domain.x.end):
+            for y in range(table.domain.y.start, table.domain.y.end):
+                expected_records = [r[2] for r in records if r[:2] == (x, y)]
+                self.assertEqual(table.filter(x, y), expected_records)
+                point = (x - table.domain.x.start, y - table.domain.y.start)
+                self.assertEqual(sums[point], sum(expected_records))
+                self.assertEqual(minimums[point], min(expected_records, default=0))
+
+        for range_query in RangeQuery2D.enumerate_all(table.domain):
+            self.assertCountEqual(
+                table.filter_range(range_query),
+                [
+                    r[2]
+                    for r in records
+                    if range_query.x.start <= r[0] < range_query.x.end
+                    and range_query.y.start <= r[1] < range_query.y.end
+                ],
+            )
+
+    def test_make_from_grid(self) -> None:
+        table = Table2D.make_from_grid([[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(
+            table.domain, Domain2D(x=Domain(start=0, end=2), y=Domain(start=0, end=3))
+        )
+        self.assertEqual(table.domain.shape(), (2, 3))
+        self.assertEqual(table.domain.size(), 6)
+        self.assertEqual(table.filter(1, 0), [4])
+        self.assertEqual(table.filter(2, 0), [])
+        range_query = RangeQuery2D(
+            x=RangeQuery(start=0, end=2), y=RangeQuery(start=1, end=3)
+        )
+        self.assertEqual(range_query.area(), 4)
+        self.assertEqual(sorted(table.filter_range(range_query)), [2, 3, 5, 6])
+
+    def test_from_arrays_with_domain(self) -> None:
+        domain = Domain2D(x=Domain(start=0, end=2), y=Domain(start=0, end=2))
+        table = Table2D.from_arrays(
+            np.array([0, 1, 2, 1]),
+            np.array([0, 1, 0, -1]),
+            np.array([7, 8, 9, 10]),
+            domain,
+        )
+        self.assertEqual(table.domain, domain)
+        self.assertEqual(table.number_of_records(), 2)
+        self.assertEqual(table.reduce_points(np.add, 0).tolist(), [[7, 0], [0, 8]])
+
+    def test_nd_array_mapping(self) -> None:
+        mapping = NDArrayMapping(np.arange(12).reshape(2, 3, 2))
+        self.assertEqual(len(mapping), 12)
+        self.assertEqual(mapping[(1, 2, 1)], 11)
+        self.assertIs(type(mapping[(1, 2, 1)]), int)
+        self.assertNotIn((1, 3, 0), mapping)
+        self.assertNotIn((1, 2), mapping)
+        with self.assertRaises(KeyError):
+            mapping[(2, 0, 0)]
+        self.assertEqual(list(mapping.items()), list(zip(mapping, range(12))))
@@ -0,0 +1,122 @@
+##
+## Copyright 2022 Zachary Espiritu
+##
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+##
+##    http://www.apache.org/licenses/LICENSE-2.0
+##
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+##
+
+
+import unittest
+
+from parameterized import parameterized
+
+from arca.ste.edx.simple_revealing_edx import SimpleRevealingEDX
+from arca.ste.emm import Multimap, PiBaseRevealingEMM
+from arca.ste.key_derivation import SimpleKeyDerivationScheme, TokenKeySchedule
+from arca.ste.serializers import IntSerializer
+from arca.util.lru import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self) -> None:
+        cache: LRUCache[int, str] = LRUCache(2)
+        cache.put(1, "a")
+        cache.put(2, "b")
+        self.assertEqual(cache.get(1), "a")
+
+        # 2 is now the least recently used entry:
+        cache.put(3, "c")
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(2, cache)
+        self.assertEqual(cache.get(1), "a")
+        self.assertEqual(cache.get(3), "c")
+        self.assertIsNone(cache.get(2))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertEqual(cache.hit_rate, 0.75)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_get_or_compute(self) -> None:
+        computed = []
+
+        def compute(key: int) -> int:
+            computed.append(key)
+            return key * key
+
+        cache: LRUCache[int, int] = LRUCache(4)
+        for key in [1, 2, 1, 1, 3, 2]:
+            self.assertEqual(cache.get_or_compute(key, compute), key * key)
+        self.assertEqual(computed, [1, 2, 3])
+
+    def test_zero_capacity(self) -> None:
+        cache: LRUCache[int, int] = LRUCache(0)
+        cache.put(1, 1)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get(1))
+
+        with self.assertRaises(ValueError):
+            LRUCache(-1)
+
+
+class TestTokenKeySchedule(unittest.TestCase):
+    def test_cached_keys_match_derived_keys(self) -> None:
+        key_schedule = TokenKeySchedule(
+            SimpleKeyDerivationScheme(),
+            label_purpose=b"label",
+            value_purpose=b"value",
+            cache_size=8,
+        )
+        tokens = [bytes([i]) * 16 for i in range(4)]
+        for _ in range(3):
+            for token in tokens:
+                self.assertEqual(key_schedule.get(token), key_schedule.derive(token))
+        self.assertEqual(key_schedule.cache.misses, len(tokens))
+        self.assertEqual(key_schedule.cache.hits, 2 * len(tokens))
+
+        token_keys = key_schedule.derive(tokens[0])
+        self.assertNotEqual(token_keys.label_key, token_keys.value_key)
+
+    @parameterized.expand([(0,), (1,), (1024,)])
+    def test_revealing_schemes(self, token_cache_size: int) -> None:
+        eds_scheme: SimpleRevealingEDX[int, int] = SimpleRevealingEDX(
+            dx_key_serializer=IntSerializer(),
+            dx_value_serializer=IntSerializer(),
+            token_cache_size=token_cache_size,
+        )
+        plaintext_dx = {label: label * 3 for label in range(20)}
+        key = eds_scheme.generate_key()
+        eds = eds_scheme.load_eds(eds_scheme.encrypt(key, plaintext_dx))
+        for _ in range(2):
+            for label, value in plaintext_dx.items():
+                token = eds_scheme.token(key, label)
+                self.assertEqual(eds_scheme.query(token, eds), value)
+            self.assertIsNone(eds_scheme.query(eds_scheme.token(key, 100), eds))
+        self.assertLessEqual(len(eds_scheme.key_schedule.cache), token_cache_size)
+
+        emm_scheme: PiBaseRevealingEMM[int, int] = PiBaseRevealingEMM(
+            token_cache_size=token_cache_size
+        )
+        plaintext_mm: Multimap[int, int] = Multimap()
+        for keyword in range(10):
+            for value in range(keyword):
+                plaintext_mm.set(keyword, value)
+        key = emm_scheme.generate_key()
+        eds = emm_scheme.load_eds(emm_scheme.encrypt(key, plaintext_mm))
+        self.assertEqual(len(eds), sum(range(10)))
+        for _ in range(2):
+            for keyword, values in plaintext_mm:
+                token = emm_scheme.token(key, keyword)
+                self.assertEqual(emm_scheme.query(token, eds), values)
+
+        if token_cache_size >= len(plaintext_mm):
+            self.assertEqual(emm_scheme.key_schedule.cache.hits, len(plaintext_mm))